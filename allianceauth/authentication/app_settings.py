@@ -44,3 +44,15 @@ AUTHENTICATION_ADMIN_USERS_MAX_GROUPS = \
 AUTHENTICATION_ADMIN_USERS_MAX_CHARS = \
     _clean_setting('AUTHENTICATION_ADMIN_USERS_MAX_CHARS', 5)
 
+
+# Number of owner hashes verified by each task of an ownership check run
+AUTHENTICATION_OWNERSHIP_CHECK_BATCH_SIZE = \
+    _clean_setting('AUTHENTICATION_OWNERSHIP_CHECK_BATCH_SIZE', 500, min_value=1)
+
+# Number of owner hashes verified against SSO in parallel
+AUTHENTICATION_OWNERSHIP_CHECK_WORKERS = \
+    _clean_setting('AUTHENTICATION_OWNERSHIP_CHECK_WORKERS', 5, min_value=1)
+
+# Max number of SSO requests per second during an ownership check run
+AUTHENTICATION_OWNERSHIP_CHECK_RATE_LIMIT = \
+    _clean_setting('AUTHENTICATION_OWNERSHIP_CHECK_RATE_LIMIT', 20, min_value=1)
@@ -1,13 +1,21 @@
 import logging
+import re
 
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import User, Permission
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
 
 from .models import UserProfile, CharacterOwnership, OwnershipRecord
+from .signals import batched_signals
 
 
 logger = logging.getLogger(__name__)
 
+# how often to try allocating a username when racing concurrent registrations
+USERNAME_ALLOCATION_ATTEMPTS = 5
+
 
 class StateBackend(ModelBackend):
     @staticmethod
@@ -33,8 +41,15 @@ class StateBackend(ModelBackend):
     def authenticate(self, request=None, token=None, **credentials):
         if not token:
             return None
+        # resolve the account in a single transaction and run the resulting
+        # state and group checks once it has been committed
+        with batched_signals():
+            with transaction.atomic():
+                return self._authenticate_token(token)
+
+    def _authenticate_token(self, token):
         try:
-            ownership = CharacterOwnership.objects.get(character__character_id=token.character_id)
+            ownership = CharacterOwnership.objects.select_related('user').get(character__character_id=token.character_id)
             if ownership.owner_hash == token.character_owner_hash:
                 logger.debug('Authenticating {0} by ownership of character {1}'.format(ownership.user, token.character_name))
                 return ownership.user
@@ -45,7 +60,7 @@ class StateBackend(ModelBackend):
         except CharacterOwnership.DoesNotExist:
             try:
                 # insecure legacy main check for pre-sso registration auth installs
-                profile = UserProfile.objects.get(main_character__character_id=token.character_id)
+                profile = UserProfile.objects.select_related('user', 'main_character').get(main_character__character_id=token.character_id)
                 logger.debug('Authenticating {0} by their main character {1} without active ownership.'.format(profile.user, profile.main_character))
                 # attach an ownership
                 token.user = profile.user
@@ -53,14 +68,15 @@ class StateBackend(ModelBackend):
                 return profile.user
             except UserProfile.DoesNotExist:
                 # now we check historical records to see if this is a returning user
-                records = OwnershipRecord.objects.filter(owner_hash=token.character_owner_hash).filter(character__character_id=token.character_id)
-                if records.exists():
+                record = OwnershipRecord.objects.filter(owner_hash=token.character_owner_hash)\
+                    .filter(character__character_id=token.character_id).select_related('user__profile').first()
+                if record:
                     # we've seen this character owner before. Re-attach to their old user account
-                    user = records[0].user
+                    user = record.user
                     token.user = user
                     co = CharacterOwnership.objects.create_by_token(token)
                     logger.debug('Authenticating {0} by matching owner hash record of character {1}'.format(user, co.character))
-                    if not user.profile.main_character:
+                    if not user.profile.main_character_id:
                         # set this as their main by default if they have none
                         user.profile.main_character = co.character
                         user.profile.save()
@@ -69,10 +85,8 @@ class StateBackend(ModelBackend):
             return self.create_user(token)
 
     def create_user(self, token):
-        username = self.iterate_username(token.character_name)  # build unique username off character name
-        user = User.objects.create_user(username, is_active=False)  # prevent login until email set
-        user.set_unusable_password()  # prevent login via password
-        user.save()
+        # created without a password, which leaves it unusable to prevent login via password
+        user = self._create_user_with_unique_username(token.character_name)
         token.user = user
         co = CharacterOwnership.objects.create_by_token(token)  # assign ownership to this user
         user.profile.main_character = co.character  # assign main character as token character
@@ -80,17 +94,33 @@ class StateBackend(ModelBackend):
         logger.debug('Created new user {0}'.format(user))
         return user
 
+    def _create_user_with_unique_username(self, name):
+        """
+        Creates an inactive user named after the given character.
+        A concurrent registration may claim the same username between
+        allocating and inserting it, so allocation is retried on collisions.
+        """
+        for attempt in range(1, USERNAME_ALLOCATION_ATTEMPTS + 1):
+            username = self.iterate_username(name)  # build unique username off character name
+            try:
+                with transaction.atomic():
+                    return User.objects.create_user(username, is_active=False)  # prevent login until email set
+            except IntegrityError:
+                if attempt == USERNAME_ALLOCATION_ATTEMPTS:
+                    raise
+                logger.debug('Username {0} was claimed concurrently, retrying.'.format(username))
+
     @staticmethod
     def iterate_username(name):
         name = str.replace(name, "'", "")
         name = str.replace(name, ' ', '_')
-        if User.objects.filter(username__startswith=name).exists():
-            u = User.objects.filter(username__startswith=name)
-            num = len(u)
-            username = "%s_%s" % (name, num)
-            while u.filter(username=username).exists():
-                num += 1
-                username = "%s_%s" % (name, num)
-        else:
-            username = name
-        return username
+        # a single query tells us if the name is taken and the highest numeric suffix in use,
+        # the prefix match narrows it down through the username index before the regex is applied
+        suffixed = Q(username__regex=r'^%s_[0-9]+$' % re.escape(name))
+        usage = User.objects.filter(username__startswith=name).aggregate(
+            taken=Count('pk', filter=Q(username=name)),
+            suffix=Max(Cast(Substr('username', len(name) + 2), IntegerField()), filter=suffixed),
+        )
+        if not usage['taken']:
+            return name
+        return "%s_%s" % (name, (usage['suffix'] or 0) + 1)
@@ -4,6 +4,7 @@ from django.contrib.auth.models import User, Permission
 from django.db import models, transaction
 from django.utils.translation import ugettext_lazy as _
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo, EveAllianceInfo
+from allianceauth.fieldtracking import FieldTrackerMixin
 from allianceauth.notifications import notify
 
 from .managers import CharacterOwnershipManager, StateManager
@@ -57,10 +58,12 @@ def get_guest_state_pk():
     return get_guest_state().pk
 
 
-class UserProfile(models.Model):
+class UserProfile(FieldTrackerMixin, models.Model):
     class Meta:
         default_permissions = ('change',)
 
+    tracked_fields = ('main_character', 'state')
+
     user = models.OneToOneField(User, related_name='profile', on_delete=models.CASCADE)
     main_character = models.OneToOneField(EveCharacter, blank=True, null=True, on_delete=models.SET_NULL)
     state = models.ForeignKey(State, on_delete=models.SET_DEFAULT, default=get_guest_state_pk)
@@ -1,19 +1,87 @@
 import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import perf_counter
 
 from .models import CharacterOwnership, UserProfile, get_guest_state, State, OwnershipRecord
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.db.models import Q
 from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver, Signal
 from esi.models import Token
 
 from allianceauth.eveonline.models import EveCharacter
+from allianceauth.fieldtracking import loaded_values, track_fields
 
 logger = logging.getLogger(__name__)
 
+# lets pre_save receivers of all apps detect (de)activation without a re-fetch
+track_fields(User, 'is_active')
+
 state_changed = Signal(providing_args=['user', 'state'])
 
 
+class _SignalBatch(threading.local):
+    callbacks = None
+
+
+_signal_batch = _SignalBatch()
+
+
+@contextmanager
+def batched_signals():
+    """
+    Defers callbacks scheduled with run_once until the outermost batch exits,
+    running each key only once. The callbacks are handed to on_commit,
+    so inside a transaction they only run after it has been committed
+    and are dropped if it is rolled back.
+    """
+    if _signal_batch.callbacks is not None:
+        # the outermost batch runs the callbacks
+        yield
+        return
+    _signal_batch.callbacks = OrderedDict()
+    try:
+        yield
+        callbacks = _signal_batch.callbacks
+    finally:
+        _signal_batch.callbacks = None
+    if callbacks:
+        transaction.on_commit(lambda: _run_batched_callbacks(callbacks))
+
+
+def _run_batched_callbacks(callbacks):
+    if _signal_batch.callbacks is not None:
+        # committed inside another batch, which will run them when it exits
+        _signal_batch.callbacks.update(callbacks)
+        return
+    _signal_batch.callbacks = callbacks
+    try:
+        start = perf_counter()
+        count = 0
+        # callbacks may schedule further work, keep going until all is done
+        while callbacks:
+            key, callback = callbacks.popitem(last=False)
+            callback()
+            count += 1
+        logger.debug('Ran %s deferred signal callbacks in %.1f ms', count, (perf_counter() - start) * 1000)
+    finally:
+        _signal_batch.callbacks = None
+
+
+def run_once(key, callback):
+    """
+    Runs callback now or, inside batched_signals, once when the batch exits.
+    Scheduling the same key again replaces the pending callback.
+    """
+    if _signal_batch.callbacks is None:
+        callback()
+    else:
+        _signal_batch.callbacks[key] = callback
+
+
 def trigger_state_check(state):
     # evaluate all current members to ensure they still have access
     for profile in state.userprofile_set.all():
@@ -61,7 +129,7 @@ def reassess_on_profile_save(sender, instance, created, *args, **kwargs):
         update_fields = kwargs.pop('update_fields', []) or []
         if 'state' not in update_fields:
             logger.debug('Profile for {} saved without state change. Re-evaluating state.'.format(instance.user))
-            instance.assign_state()
+            run_once(('assign_state', instance.user_id), instance.assign_state)
 
 
 @receiver(post_save, sender=User)
@@ -81,22 +149,24 @@ def record_character_ownership(sender, instance, created, *args, **kwargs):
             query = Q(owner_hash=instance.character_owner_hash) & Q(user=instance.user)
         else:
             query = Q(owner_hash=instance.character_owner_hash)
-        # purge ownership records if the hash or auth user account has changed
-        CharacterOwnership.objects.filter(character__character_id=instance.character_id).exclude(query).delete()
-        # create character if needed
-        if EveCharacter.objects.filter(character_id=instance.character_id).exists() is False:
-            logger.debug('Token is for a new character. Creating model for {0} ({1})'.format(instance.character_name,
-                                                                                             instance.character_id))
-            EveCharacter.objects.create_character(instance.character_id)
-        char = EveCharacter.objects.get(character_id=instance.character_id)
-        # check if we need to create ownership
-        if instance.user and not CharacterOwnership.objects.filter(
-                character__character_id=instance.character_id).exists():
-            logger.debug("Character {0} is not yet owned. Assigning ownership to {1}".format(instance.character_name,
-                                                                                             instance.user))
-            CharacterOwnership.objects.update_or_create(character=char,
-                                                        defaults={'owner_hash': instance.character_owner_hash,
-                                                                  'user': instance.user})
+        with transaction.atomic():
+            # purge ownership records if the hash or auth user account has changed
+            CharacterOwnership.objects.filter(character__character_id=instance.character_id).exclude(query).delete()
+            # create character if needed
+            try:
+                char = EveCharacter.objects.get(character_id=instance.character_id)
+            except EveCharacter.DoesNotExist:
+                logger.debug('Token is for a new character. Creating model for {0} ({1})'.format(instance.character_name,
+                                                                                                 instance.character_id))
+                char = EveCharacter.objects.create_character(instance.character_id)
+            # check if we need to create ownership
+            if instance.user:
+                _, created = CharacterOwnership.objects.get_or_create(character=char,
+                                                                      defaults={'owner_hash': instance.character_owner_hash,
+                                                                                'user': instance.user})
+                if created:
+                    logger.debug("Character {0} was not yet owned. Assigned ownership to {1}".format(
+                        instance.character_name, instance.user))
 
 
 @receiver(pre_delete, sender=CharacterOwnership)
@@ -124,8 +194,8 @@ def validate_ownership(sender, instance, *args, **kwargs):
 def assign_state_on_active_change(sender, instance, *args, **kwargs):
     # set to guest state if inactive, assign proper state if reactivated
     if instance.pk:
-        old_instance = User.objects.get(pk=instance.pk)
-        if old_instance.is_active != instance.is_active:
+        old_values = loaded_values(instance, 'is_active')
+        if old_values and old_values['is_active'] != instance.is_active:
             if instance.is_active:
                 logger.debug("User {0} has been activated. Assigning state.".format(instance))
                 instance.profile.assign_state()
@@ -139,9 +209,13 @@ def assign_state_on_active_change(sender, instance, *args, **kwargs):
 @receiver(post_save, sender=EveCharacter)
 def check_state_on_character_update(sender, instance, *args, **kwargs):
     # if this is a main character updating, check that user's state
+    if not instance.has_changed('character_id', 'corporation_id', 'alliance_id'):
+        logger.debug("Character {0} has been saved without affiliation change. No state assessment required.".format(instance))
+        return
     try:
         logger.debug("Character {0} has been saved. Assessing owner's state for changes.".format(instance))
-        instance.userprofile.assign_state()
+        profile = instance.userprofile
+        run_once(('assign_state', profile.user_id), profile.assign_state)
     except UserProfile.DoesNotExist:
         logger.debug("Character {0} is not a main character. No state assessment required.".format(instance))
         pass
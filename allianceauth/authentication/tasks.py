@@ -1,11 +1,22 @@
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+from django.db import connection
 from esi.errors import TokenExpiredError, TokenInvalidError, IncompleteResponseError
 from esi.models import Token
 from celery import shared_task
 
 from allianceauth.authentication.models import CharacterOwnership
 
+from .app_settings import (
+    AUTHENTICATION_OWNERSHIP_CHECK_BATCH_SIZE,
+    AUTHENTICATION_OWNERSHIP_CHECK_RATE_LIMIT,
+    AUTHENTICATION_OWNERSHIP_CHECK_WORKERS,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,7 +48,117 @@ def check_character_ownership(owner_hash):
         CharacterOwnership.objects.filter(owner_hash=owner_hash).delete()
 
 
+OWNERSHIP_VERIFIED = 'verified'
+OWNERSHIP_REVOKED = 'revoked'
+OWNERSHIP_ERRORED = 'errored'
+
+
+class RateLimiter:
+    """Spaces out calls from any number of threads to at most `rate` per second"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_call = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def verify_owner_hash(owner_hash, tokens, rate_limiter):
+    """
+    Verifies the tokens of an owner hash against SSO without touching the database.
+    Mirrors check_character_ownership: the first token which can be updated decides.
+    :return: tuple of the outcome and the pks of tokens to delete
+    """
+    try:
+        expired = []
+        for t in tokens:
+            rate_limiter.wait()
+            try:
+                t.update_token_data(commit=False)
+            except (TokenExpiredError, TokenInvalidError):
+                expired.append(t.pk)
+                continue
+            except (KeyError, IncompleteResponseError):
+                # We can't validate the hash hasn't changed but also can't assume it has. Abort for now.
+                logger.warning("Failed to validate owner hash of {0} due to problems contacting SSO servers.".format(
+                    t.character_name))
+                return OWNERSHIP_ERRORED, expired
+
+            if not t.character_owner_hash == owner_hash:
+                logger.info(
+                    'Character %s has changed ownership. Revoking %s tokens.' % (t.character_name, len(tokens)))
+                return OWNERSHIP_REVOKED, [token.pk for token in tokens]
+            return OWNERSHIP_VERIFIED, expired
+
+        logger.info('No valid tokens found with owner hash %s. Revoking ownership.' % owner_hash)
+        return OWNERSHIP_REVOKED, expired
+    except Exception:
+        # an unexpected error must only affect this owner hash, not the whole batch
+        logger.exception('Failed to verify owner hash %s.', owner_hash)
+        return OWNERSHIP_ERRORED, []
+    finally:
+        # expired tokens may have been refreshed from this worker thread
+        connection.close()
+
+
+@shared_task
+def check_character_ownership_batch(after_hash='', verified=0, revoked=0, errored=0):
+    """
+    Verifies the next batch of owner hashes after the given one and queues the following batch,
+    so a run works through all ownerships one batch at a time.
+    """
+    owner_hashes = list(
+        CharacterOwnership.objects.filter(owner_hash__gt=after_hash)
+        .order_by('owner_hash').values_list('owner_hash', flat=True)
+        .distinct()[:AUTHENTICATION_OWNERSHIP_CHECK_BATCH_SIZE]
+    )
+    if not owner_hashes:
+        logger.info(
+            'Character ownership check finished: %s verified, %s revoked, %s errored owner hashes.',
+            verified, revoked, errored
+        )
+        return {'verified': verified, 'revoked': revoked, 'errored': errored}
+
+    tokens = defaultdict(list)
+    for t in Token.objects.filter(character_owner_hash__in=owner_hashes).order_by('pk'):
+        tokens[t.character_owner_hash].append(t)
+
+    rate_limiter = RateLimiter(AUTHENTICATION_OWNERSHIP_CHECK_RATE_LIMIT)
+    try:
+        with ThreadPoolExecutor(max_workers=AUTHENTICATION_OWNERSHIP_CHECK_WORKERS) as executor:
+            results = list(executor.map(
+                lambda owner_hash: verify_owner_hash(owner_hash, tokens[owner_hash], rate_limiter),
+                owner_hashes
+            ))
+
+        revoked_hashes = []
+        delete_tokens = []
+        for owner_hash, (outcome, token_pks) in zip(owner_hashes, results):
+            delete_tokens += token_pks
+            if outcome == OWNERSHIP_VERIFIED:
+                verified += 1
+            elif outcome == OWNERSHIP_REVOKED:
+                revoked_hashes.append(owner_hash)
+            else:
+                errored += 1
+        revoked += len(revoked_hashes)
+
+        if delete_tokens:
+            Token.objects.filter(pk__in=delete_tokens).delete()
+        if revoked_hashes:
+            CharacterOwnership.objects.filter(owner_hash__in=revoked_hashes).delete()
+    finally:
+        # keep the run going even if this batch failed
+        check_character_ownership_batch.delay(owner_hashes[-1], verified, revoked, errored)
+
+
 @shared_task
 def check_all_character_ownership():
-    for c in CharacterOwnership.objects.all().only('owner_hash'):
-        check_character_ownership.delay(c.owner_hash)
+    check_character_ownership_batch.delay()
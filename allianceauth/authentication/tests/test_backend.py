@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.contrib.auth.models import User, Group
 from django.test import TestCase
 
@@ -136,6 +138,14 @@ class TestAuthenticate(TestCase):
         self.assertTrue(CharacterOwnership.objects.filter(owner_hash='4', user=self.old_user).exists())
         self.assertTrue(user.profile.main_character)
 
+    @mock.patch('allianceauth.authentication.signals.transaction.on_commit', new=lambda func: func())
+    @mock.patch('allianceauth.eveonline.autogroups.models.AutogroupsConfigManager.update_groups_for_user')
+    def test_authenticate_new_user_runs_group_update_once(self, update_groups_for_user):
+        t = Token(character_id=self.unclaimed_character.character_id, character_name=self.unclaimed_character.character_name, character_owner_hash='3')
+        user = StateBackend().authenticate(token=t)
+        self.assertEqual(user.profile.main_character, self.unclaimed_character)
+        update_groups_for_user.assert_called_once_with(user)
+
     def test_iterate_username(self):
         t = Token(character_id=self.unclaimed_character.character_id,
                   character_name=self.unclaimed_character.character_name, character_owner_hash='3')
@@ -147,3 +157,25 @@ class TestAuthenticate(TestCase):
         self.assertNotEqual(username, username_1, username_2)
         self.assertTrue(username_1.endswith('_1'))
         self.assertTrue(username_2.endswith('_2'))
+
+    def test_iterate_username_uses_highest_suffix(self):
+        User.objects.create(username='Unclaimed_Character_2')
+        User.objects.create(username='Unclaimed_Character_Alt')
+        self.assertEqual(StateBackend.iterate_username('Unclaimed Character'), 'Unclaimed_Character')
+        User.objects.create(username='Unclaimed_Character')
+        with self.assertNumQueries(1):
+            username = StateBackend.iterate_username('Unclaimed Character')
+        self.assertEqual(username, 'Unclaimed_Character_3')
+
+    def test_iterate_username_escapes_name(self):
+        User.objects.create(username='A.B')
+        User.objects.create(username='AxB_7')
+        self.assertEqual(StateBackend.iterate_username('A.B'), 'A.B_1')
+
+    def test_create_user_retries_username_collision(self):
+        User.objects.create(username='Unclaimed_Character')
+        t = Token(character_id=self.unclaimed_character.character_id,
+                  character_name=self.unclaimed_character.character_name, character_owner_hash='3')
+        with mock.patch.object(StateBackend, 'iterate_username', side_effect=['Unclaimed_Character', 'Unclaimed_Character_1']):
+            user = StateBackend().authenticate(token=t)
+        self.assertEqual(user.username, 'Unclaimed_Character_1')
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from ..signals import batched_signals, run_once
+
+ON_COMMIT_PATH = 'allianceauth.authentication.signals.transaction.on_commit'
+
+
+# TestCase never commits, so run the on_commit hooks right away
+@mock.patch(ON_COMMIT_PATH, new=lambda func: func())
+class TestBatchedSignals(TestCase):
+
+    def test_run_once_runs_immediately_without_batch(self):
+        callback = mock.Mock()
+        run_once('key', callback)
+        callback.assert_called_once_with()
+
+    def test_run_once_is_deferred_and_deduplicated_in_batch(self):
+        first = mock.Mock()
+        second = mock.Mock()
+        with batched_signals():
+            run_once('key', first)
+            run_once('key', second)
+            self.assertFalse(second.called)
+        self.assertFalse(first.called)
+        second.assert_called_once_with()
+
+    def test_nested_batch_runs_callbacks_at_outermost_exit(self):
+        callback = mock.Mock()
+        with batched_signals():
+            with batched_signals():
+                run_once('key', callback)
+            self.assertFalse(callback.called)
+        callback.assert_called_once_with()
+
+    def test_callbacks_scheduled_while_running_are_run(self):
+        calls = []
+
+        def first():
+            calls.append('first')
+            run_once('second', lambda: calls.append('second'))
+
+        with batched_signals():
+            run_once('first', first)
+        self.assertEqual(calls, ['first', 'second'])
+
+    def test_callbacks_run_on_commit(self):
+        callback = mock.Mock()
+        with mock.patch(ON_COMMIT_PATH) as on_commit:
+            with batched_signals():
+                run_once('key', callback)
+            self.assertFalse(callback.called)
+            on_commit.assert_called_once()
+            on_commit.call_args[0][0]()
+        callback.assert_called_once_with()
+
+    def test_callbacks_are_dropped_on_exception(self):
+        callback = mock.Mock()
+        with self.assertRaises(ValueError):
+            with batched_signals():
+                run_once('key', callback)
+                raise ValueError()
+        self.assertFalse(callback.called)
+        run_once('key', callback)
+        callback.assert_called_once_with()
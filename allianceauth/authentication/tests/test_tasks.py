@@ -0,0 +1,121 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from allianceauth.eveonline.models import EveCharacter
+from allianceauth.tests.auth_utils import AuthUtils
+from esi.errors import IncompleteResponseError, TokenExpiredError
+from requests.exceptions import HTTPError
+from esi.models import Token
+
+from ..models import CharacterOwnership
+from ..tasks import check_character_ownership_batch, RateLimiter
+
+MODULE_PATH = 'allianceauth.authentication.tasks'
+
+
+def update_token_data(token, commit=False):
+    """fakes SSO responses based on the owner hash of the token"""
+    if token.character_owner_hash == 'changed':
+        token.character_owner_hash = 'new_owner'
+    elif token.character_name == 'Expired':
+        raise TokenExpiredError()
+    elif token.character_owner_hash == 'sso_error':
+        raise IncompleteResponseError()
+
+
+@mock.patch(MODULE_PATH + '.AUTHENTICATION_OWNERSHIP_CHECK_RATE_LIMIT', 1000)
+@mock.patch(MODULE_PATH + '.AUTHENTICATION_OWNERSHIP_CHECK_BATCH_SIZE', 2)
+@mock.patch(MODULE_PATH + '.Token.update_token_data', autospec=True, side_effect=update_token_data)
+class CheckCharacterOwnershipBatchTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = AuthUtils.create_user('test_user', disconnect_signals=True)
+        for character_id, owner_hash in enumerate(
+            ['unchanged', 'changed', 'expired', 'sso_error', 'no_tokens'], start=1
+        ):
+            character = EveCharacter.objects.create(
+                character_id=character_id,
+                character_name='Character {}'.format(character_id),
+                corporation_id=1,
+                corporation_name='Corp',
+                corporation_ticker='CORP',
+            )
+            CharacterOwnership.objects.create(
+                user=cls.user, character=character, owner_hash=owner_hash
+            )
+            if owner_hash != 'no_tokens':
+                Token.objects.create(
+                    user=cls.user,
+                    character_id=character_id,
+                    character_name='Expired' if owner_hash == 'expired' else character.character_name,
+                    character_owner_hash=owner_hash,
+                    refresh_token='refresh',
+                )
+
+    def test_revokes_changed_ownerships(self, mock_update_token_data):
+        with self.assertLogs(MODULE_PATH, level='INFO') as logs:
+            check_character_ownership_batch()
+
+        self.assertEqual(
+            set(CharacterOwnership.objects.values_list('owner_hash', flat=True)),
+            {'unchanged', 'sso_error'}
+        )
+        self.assertEqual(
+            set(Token.objects.values_list('character_owner_hash', flat=True)),
+            {'unchanged', 'sso_error'}
+        )
+        self.assertIn('1 verified, 3 revoked, 1 errored', logs.output[-1])
+
+    def test_verifies_remaining_tokens_after_expired_one(self, mock_update_token_data):
+        Token.objects.create(
+            user=self.user,
+            character_id=3,
+            character_name='Character 3',
+            character_owner_hash='expired',
+            refresh_token='refresh',
+        )
+
+        check_character_ownership_batch()
+
+        self.assertTrue(CharacterOwnership.objects.filter(owner_hash='expired').exists())
+        self.assertEqual(
+            list(Token.objects.filter(character_owner_hash='expired').values_list('character_name', flat=True)),
+            ['Character 3']
+        )
+
+    def test_continues_after_unexpected_sso_error(self, mock_update_token_data):
+        def my_update_token_data(token, commit=False):
+            if token.character_owner_hash == 'changed':
+                raise HTTPError('Test exception')
+            update_token_data(token, commit)
+
+        mock_update_token_data.side_effect = my_update_token_data
+
+        with self.assertLogs(MODULE_PATH, level='INFO') as logs:
+            check_character_ownership_batch()
+
+        self.assertEqual(
+            set(CharacterOwnership.objects.values_list('owner_hash', flat=True)),
+            {'changed', 'unchanged', 'sso_error'}
+        )
+        self.assertIn('1 verified, 2 revoked, 2 errored', logs.output[-1])
+
+    def test_sso_calls_per_owner_hash(self, mock_update_token_data):
+        check_character_ownership_batch()
+
+        self.assertEqual(mock_update_token_data.call_count, 4)
+
+
+class RateLimiterTestCase(TestCase):
+    @mock.patch(MODULE_PATH + '.time')
+    def test_spaces_out_calls(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        limiter = RateLimiter(4)
+
+        for _ in range(3):
+            limiter.wait()
+
+        self.assertEqual(
+            [c.args[0] for c in mock_time.sleep.call_args_list], [0.25, 0.5]
+        )
@@ -1,19 +1,29 @@
+from datetime import timedelta
 from math import ceil
 from unittest.mock import patch
 
 import requests_mock
+from kombu.exceptions import OperationalError
 from packaging.version import Version as Pep440Version
 
 from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 
 from allianceauth.templatetags.admin_status import (
     status_overview,
+    update_status_cache,
     _fetch_list_from_gitlab,
     _current_notifications, 
+    _current_task_queues,
     _current_version_summary, 
     _fetch_notification_issues_from_gitlab,    
-    _latests_versions
+    _latests_versions,
+    _queue_status_refresh,
+    _set_cached_status,
+    NOTIFICATIONS_CACHE_KEY,
+    TAGS_CACHE_KEY,
+    TASK_QUEUE_HISTORY_LENGTH,
 )
 
 MODULE_PATH = 'allianceauth.templatetags'
@@ -51,19 +61,31 @@ GITHUB_NOTIFICATION_ISSUES = [
     },
 ]
 TEST_VERSION = '2.6.5'
+NOTIFICATIONS_URL = (
+    'https://gitlab.com/api/v4/projects/allianceauth%2Fallianceauth/issues'
+    '?labels=announcement'
+)
+TAGS_URL = (
+    'https://gitlab.com/api/v4/projects/allianceauth%2Fallianceauth'
+    '/repository/tags'
+)
+
+
+def cached_status(data):
+    return {'data': data, 'updated': timezone.now()}
 
 
 class TestStatusOverviewTag(TestCase):
 
     @patch(MODULE_PATH + '.admin_status.__version__', TEST_VERSION)
-    @patch(MODULE_PATH + '.admin_status._fetch_celery_queue_length')
+    @patch(MODULE_PATH + '.admin_status._current_task_queues')
     @patch(MODULE_PATH + '.admin_status._current_version_summary')
     @patch(MODULE_PATH + '.admin_status._current_notifications')    
     def test_status_overview(
         self, 
         mock_current_notifications, 
         mock_current_version_info,
-        mock_fetch_celery_queue_length
+        mock_current_task_queues
     ):
         notifications = {
             'notifications': GITHUB_NOTIFICATION_ISSUES[:5]
@@ -81,7 +103,7 @@ class TestStatusOverviewTag(TestCase):
             'latest_beta_version': '2.4.4a1',
         }
         mock_current_version_info.return_value = version_info
-        mock_fetch_celery_queue_length.return_value = 3
+        mock_current_task_queues.return_value = {'task_queue_length': 3}
                 
         result = status_overview()
         expected = {
@@ -121,29 +143,58 @@ class TestNotifications(TestCase):
     @patch(MODULE_PATH + '.admin_status.cache')
     def test_current_notifications_normal(self, mock_cache):
         # given
-        mock_cache.get_or_set.return_value = GITHUB_NOTIFICATION_ISSUES
+        mock_cache.get.return_value = cached_status(GITHUB_NOTIFICATION_ISSUES)
         # when
         result = _current_notifications()
         # then
         self.assertEqual(result['notifications'], GITHUB_NOTIFICATION_ISSUES[:5])
 
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
     @requests_mock.mock()    
-    def test_current_notifications_failed(self, requests_mocker):
-        # given
-        url = (
-            'https://gitlab.com/api/v4/projects/allianceauth%2Fallianceauth/issues'
-            '?labels=announcement'
-        )        
-        requests_mocker.get(url, status_code=404)
+    def test_current_notifications_not_fetched(
+        self, mock_queue_status_refresh, requests_mocker
+    ):
         # when
         result = _current_notifications()
         # then
         self.assertEqual(result['notifications'], list())
+        self.assertIsNone(result['notifications_updated'])
+        self.assertTrue(mock_queue_status_refresh.called)
+        self.assertEqual(requests_mocker.call_count, 0)
+
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
+    @patch(MODULE_PATH + '.admin_status.cache')
+    def test_current_notifications_fresh_not_refreshed(
+        self, mock_cache, mock_queue_status_refresh
+    ):
+        # given
+        mock_cache.get.return_value = cached_status(GITHUB_NOTIFICATION_ISSUES)
+        # when
+        _current_notifications()
+        # then
+        self.assertFalse(mock_queue_status_refresh.called)
+
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
+    @patch(MODULE_PATH + '.admin_status.cache')
+    def test_current_notifications_stale_refreshed(
+        self, mock_cache, mock_queue_status_refresh
+    ):
+        # given
+        mock_cache.get.return_value = {
+            'data': GITHUB_NOTIFICATION_ISSUES,
+            'updated': timezone.now() - timedelta(hours=1)
+        }
+        # when
+        result = _current_notifications()
+        # then
+        self.assertEqual(result['notifications'], GITHUB_NOTIFICATION_ISSUES[:5])
+        self.assertTrue(mock_queue_status_refresh.called)
 
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
     @patch(MODULE_PATH + '.admin_status.cache')
-    def test_current_notifications_is_none(self, mock_cache):
+    def test_current_notifications_is_none(self, mock_cache, mock_queue_status_refresh):
         # given
-        mock_cache.get_or_set.return_value = None
+        mock_cache.get.return_value = cached_status(None)
         # when
         result = _current_notifications()
         # then
@@ -152,8 +203,119 @@ class TestNotifications(TestCase):
 
 class TestCeleryQueueLength(TestCase):
 
-    def test_get_celery_queue_length(self):
-        pass
+    def setUp(self) -> None:
+        cache.clear()
+
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
+    def test_current_task_queues(self, mock_queue_status_refresh):
+        # given
+        cache.set('admin_status_task_queue_history', [
+            {'time': timezone.now(), 'queues': {'celery': 3, 'priority': -1}},
+            {'time': timezone.now(), 'queues': {'celery': 4, 'priority': 1}},
+        ])
+        _set_cached_status('admin_status_task_queues', {'celery': 4, 'priority': 1})
+        # when
+        result = _current_task_queues()
+        # then
+        self.assertEqual(result['task_queue_length'], 5)
+        self.assertEqual(result['task_queues'], [('celery', 4), ('priority', 1)])
+        self.assertEqual([s['length'] for s in result['task_queue_history']], [3, 5])
+        self.assertEqual(result['task_queue_history_max'], 5)
+
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
+    def test_current_task_queues_error(self, mock_queue_status_refresh):
+        # given
+        _set_cached_status('admin_status_task_queues', {'celery': -1})
+        # when
+        result = _current_task_queues()
+        # then
+        self.assertEqual(result['task_queue_length'], -1)
+
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
+    def test_current_task_queues_not_fetched(self, mock_queue_status_refresh):
+        # when
+        result = _current_task_queues()
+        # then
+        self.assertEqual(result, {})
+        self.assertTrue(mock_queue_status_refresh.called)
+
+    @patch('allianceauth.tasks.update_admin_status')
+    def test_queue_status_refresh_once(self, mock_update_admin_status):
+        # when
+        _queue_status_refresh()
+        _queue_status_refresh()
+        # then
+        self.assertEqual(mock_update_admin_status.delay.call_count, 1)
+
+    @patch('allianceauth.tasks.update_admin_status')
+    def test_queue_status_refresh_broker_down(self, mock_update_admin_status):
+        # given
+        mock_update_admin_status.delay.side_effect = OperationalError
+        # when
+        _queue_status_refresh()
+        # then
+        self.assertTrue(mock_update_admin_status.delay.called)
+
+
+@patch(MODULE_PATH + '.admin_status._fetch_celery_queue_length', lambda queue: 2)
+class TestUpdateStatusCache(TestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    @requests_mock.mock()
+    def test_update_status_cache(self, requests_mocker):
+        # given
+        requests_mocker.get(NOTIFICATIONS_URL, json=GITHUB_NOTIFICATION_ISSUES)
+        requests_mocker.get(TAGS_URL, json=GITHUB_TAGS)
+        # when
+        update_status_cache()
+        # then
+        self.assertEqual(
+            _current_notifications()['notifications'], GITHUB_NOTIFICATION_ISSUES[:5]
+        )
+        self.assertEqual(_current_version_summary()['latest_patch_version'], '2.4.5')
+        self.assertEqual(_current_task_queues()['task_queue_length'], 2)
+
+    @requests_mock.mock()
+    def test_update_status_cache_keeps_stale_data(self, requests_mocker):
+        # given
+        cache.set(NOTIFICATIONS_CACHE_KEY, {
+            'data': GITHUB_NOTIFICATION_ISSUES,
+            'updated': timezone.now() - timedelta(hours=2)
+        })
+        requests_mocker.get(NOTIFICATIONS_URL, status_code=500)
+        requests_mocker.get(TAGS_URL, status_code=500)
+        # when
+        update_status_cache()
+        # then
+        result = _current_notifications()
+        self.assertEqual(result['notifications'], GITHUB_NOTIFICATION_ISSUES[:5])
+        self.assertLess(result['notifications_updated'], timezone.now() - timedelta(hours=1))
+        self.assertIsNone(cache.get(TAGS_CACHE_KEY))
+
+    @requests_mock.mock()
+    def test_update_status_cache_skips_fresh_entries(self, requests_mocker):
+        # given
+        _set_cached_status(NOTIFICATIONS_CACHE_KEY, GITHUB_NOTIFICATION_ISSUES)
+        _set_cached_status(TAGS_CACHE_KEY, GITHUB_TAGS)
+        # when
+        update_status_cache()
+        # then
+        self.assertEqual(requests_mocker.call_count, 0)
+
+    @requests_mock.mock()
+    def test_update_status_cache_limits_history(self, requests_mocker):
+        # given
+        requests_mocker.get(NOTIFICATIONS_URL, json=GITHUB_NOTIFICATION_ISSUES)
+        requests_mocker.get(TAGS_URL, json=GITHUB_TAGS)
+        # when
+        for _ in range(TASK_QUEUE_HISTORY_LENGTH + 2):
+            update_status_cache()
+        # then
+        self.assertEqual(
+            len(_current_task_queues()['task_queue_history']), TASK_QUEUE_HISTORY_LENGTH
+        )
 
 
 class TestVersionTags(TestCase):
@@ -165,7 +327,7 @@ class TestVersionTags(TestCase):
     @patch(MODULE_PATH + '.admin_status.cache')
     def test_current_version_info_normal(self, mock_cache):        
         # given
-        mock_cache.get_or_set.return_value = GITHUB_TAGS
+        mock_cache.get.return_value = cached_status(GITHUB_TAGS)
         # when
         result = _current_version_summary()
         # then
@@ -178,37 +340,23 @@ class TestVersionTags(TestCase):
         self.assertEqual(result['latest_beta_version'], '2.4.6a1')
 
     @patch(MODULE_PATH + '.admin_status.__version__', TEST_VERSION)
+    @patch(MODULE_PATH + '.admin_status._queue_status_refresh')
     @requests_mock.mock()
-    def test_current_version_info_failed(self, requests_mocker):
-        # given
-        url = (
-            'https://gitlab.com/api/v4/projects/allianceauth%2Fallianceauth'
-            '/repository/tags'
-        )        
-        requests_mocker.get(url, status_code=500)
+    def test_current_version_info_not_fetched(
+        self, mock_queue_status_refresh, requests_mocker
+    ):
         # when
         result = _current_version_summary()
         # then
         self.assertEqual(result, {})
-
-    @requests_mock.mock()
-    def test_fetch_tags_from_gitlab(self, requests_mocker):
-        # given
-        url = (
-            'https://gitlab.com/api/v4/projects/allianceauth%2Fallianceauth'
-            '/repository/tags'
-        )        
-        requests_mocker.get(url, json=GITHUB_TAGS)
-        # when
-        result = _current_version_summary()
-        # then
-        self.assertTrue(result)
+        self.assertTrue(mock_queue_status_refresh.called)
+        self.assertEqual(requests_mocker.call_count, 0)
 
     @patch(MODULE_PATH + '.admin_status.__version__', TEST_VERSION)
     @patch(MODULE_PATH + '.admin_status.cache')
     def test_current_version_info_return_no_data(self, mock_cache):
         # given
-        mock_cache.get_or_set.return_value = None                
+        mock_cache.get.return_value = cached_status(None)
         # when
         result = _current_version_summary()
         # then
@@ -1,4 +1,5 @@
 import logging
+from time import perf_counter
 
 from django.conf import settings
 from django.contrib import messages
@@ -6,6 +7,7 @@ from django.contrib.auth import login, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core import signing
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
@@ -23,6 +25,7 @@ from django_registration.backends.activation.views import (
 from django_registration.signals import user_registered
 
 from .models import CharacterOwnership
+from .signals import batched_signals
 from .forms import RegistrationForm
 
 if 'allianceauth.eveonline.autogroups' in settings.INSTALLED_APPS:
@@ -113,13 +116,28 @@ have the email address embedded much like the username. Key creation and decodin
 # Step 1
 @token_required(new=True, scopes=settings.LOGIN_TOKEN_SCOPES)
 def sso_login(request, token):
-    user = authenticate(token=token)
+    start = perf_counter()
+    with batched_signals():
+        with transaction.atomic():
+            user = authenticate(token=token)
+            authenticated = perf_counter()
+            if user:
+                token.user = user
+                if Token.objects.exclude(pk=token.pk).equivalent_to(token).require_valid().exists():
+                    token.delete()
+                else:
+                    token.save()
+        stored = perf_counter()
+    finished = perf_counter()
+    logger.debug(
+        "SSO login of character %s took %.1f ms (authenticate %.1f ms, token %.1f ms, signals %.1f ms)",
+        token.character_name,
+        (finished - start) * 1000,
+        (authenticated - start) * 1000,
+        (stored - authenticated) * 1000,
+        (finished - stored) * 1000
+    )
     if user:
-        token.user = user
-        if Token.objects.exclude(pk=token.pk).equivalent_to(token).require_valid().exists():
-            token.delete()
-        else:
-            token.save()
         if user.is_active:
             login(request, user)
             return redirect(request.POST.get('next', request.GET.get('next', 'authentication:dashboard')))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CorpUtilsConfig(AppConfig):
     name = 'allianceauth.corputils'
     label = 'corputils'
+
+    def ready(self):
+        from . import signals  # noqa: F401
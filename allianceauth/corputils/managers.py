@@ -1,16 +1,18 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 import logging
 
 logger = logging.getLogger(__name__)
 
+VISIBLE_CACHE_TIMEOUT = getattr(settings, 'CORPUTILS_VISIBLE_CACHE_TIMEOUT', 3600)
+VISIBLE_CACHE_VERSION_KEY = 'corputils_visible_corpstats_version'
 
-class CorpStatsQuerySet(models.QuerySet):
-    def visible_to(self, user):
-        # superusers get all visible
-        if user.is_superuser:
-            logger.debug('Returning all corpstats for superuser %s.' % user)
-            return self
 
+class CorpStatsQuerySet(models.QuerySet):
+    def _filter_visible_to(self, user):
         try:
             char = user.profile.main_character
             assert char
@@ -37,7 +39,15 @@ class CorpStatsQuerySet(models.QuerySet):
             return self.filter(query)
         except AssertionError:
             logger.debug('User %s has no main character. No corpstats visible.' % user)
-            return self.none()        
+            return self.none()
+
+    def visible_to(self, user):
+        # superusers get all visible
+        if user.is_superuser:
+            logger.debug('Returning all corpstats for superuser %s.' % user)
+            return self
+
+        return self.filter(pk__in=self.model.objects.visible_ids(user))
 
 
 class CorpStatsManager(models.Manager):
@@ -46,3 +56,26 @@ class CorpStatsManager(models.Manager):
 
     def visible_to(self, user):
         return self.get_queryset().visible_to(user)
+
+    @staticmethod
+    def _visible_ids_cache_key(user_pk) -> str:
+        version = cache.get(VISIBLE_CACHE_VERSION_KEY, 0)
+        return 'corputils_visible_corpstats_{}_{}'.format(version, user_pk)
+
+    def visible_ids(self, user) -> set:
+        """IDs of all corpstats visible to a user, cached per user"""
+        cache_key = self._visible_ids_cache_key(user.pk)
+        ids = cache.get(cache_key)
+        if ids is None:
+            ids = set(
+                self.get_queryset()._filter_visible_to(user).values_list('pk', flat=True)
+            )
+            cache.set(cache_key, ids, VISIBLE_CACHE_TIMEOUT)
+        return ids
+
+    def clear_visible_cache(self, user_pk=None):
+        """Invalidate cached visible corpstats for one user or for all users"""
+        if user_pk is not None:
+            cache.delete(self._visible_ids_cache_key(user_pk))
+        else:
+            cache.set(VISIBLE_CACHE_VERSION_KEY, uuid4().hex, None)
@@ -132,7 +132,7 @@ class CorpStats(models.Model):
                                                m.character_id)])
 
     def visible_to(self, user):
-        return CorpStats.objects.filter(pk=self.pk).visible_to(user).exists()
+        return user.is_superuser or self.pk in CorpStats.objects.visible_ids(user)
 
     def can_update(self, user):
         return self.token.user == user or self.visible_to(user)
@@ -0,0 +1,58 @@
+import logging
+
+from django.contrib.auth.models import User, Group
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from allianceauth.authentication.models import State, UserProfile
+from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
+
+from .models import CorpStats
+
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=CorpStats)
+@receiver(post_delete, sender=CorpStats)
+@receiver(post_save, sender=EveCorporationInfo)
+def clear_visible_cache_on_corpstats_change(sender, instance, **kwargs):
+    logger.debug("Clearing visible corpstats cache for all users")
+    CorpStats.objects.clear_visible_cache()
+
+
+@receiver(m2m_changed, sender=State.member_corporations.through)
+@receiver(m2m_changed, sender=State.member_alliances.through)
+@receiver(m2m_changed, sender=State.permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def clear_visible_cache_on_permission_change(sender, instance, action, **kwargs):
+    if action.startswith('post_'):
+        logger.debug("Clearing visible corpstats cache for all users")
+        CorpStats.objects.clear_visible_cache()
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def clear_visible_cache_on_user_permission_change(sender, instance, action, reverse, **kwargs):
+    if action.startswith('post_'):
+        if reverse:
+            CorpStats.objects.clear_visible_cache()
+        else:
+            logger.debug("Clearing visible corpstats cache for user %s" % instance)
+            CorpStats.objects.clear_visible_cache(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def clear_visible_cache_on_profile_save(sender, instance, **kwargs):
+    logger.debug("Clearing visible corpstats cache for user %s" % instance.user_id)
+    CorpStats.objects.clear_visible_cache(instance.user_id)
+
+
+@receiver(post_save, sender=EveCharacter)
+def clear_visible_cache_on_main_character_save(sender, instance, created, **kwargs):
+    if not created:
+        for user_pk in UserProfile.objects.filter(
+            main_character=instance
+        ).values_list('user_id', flat=True):
+            logger.debug("Clearing visible corpstats cache for user %s" % user_pk)
+            CorpStats.objects.clear_visible_cache(user_pk)
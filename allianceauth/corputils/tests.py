@@ -1,5 +1,6 @@
 from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase
 from allianceauth.tests.auth_utils import AuthUtils
 from .models import CorpStats, CorpMember
@@ -28,6 +29,7 @@ class CorpStatsManagerTestCase(TestCase):
         AuthUtils.assign_state(cls.user, cls.state, disconnect_signals=True)
 
     def setUp(self):
+        cache.clear()
         self.user.refresh_from_db()
         self.user.user_permissions.clear()
         self.state.refresh_from_db()
@@ -61,6 +63,56 @@ class CorpStatsManagerTestCase(TestCase):
         cs = CorpStats.objects.visible_to(self.user)
         self.assertIn(self.corpstats, cs)
 
+    def test_visible_ids_cached(self):
+        self.user.user_permissions.add(self.view_corp_permission)
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk})
+
+        with self.assertNumQueries(0):
+            self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk})
+            self.assertTrue(self.corpstats.visible_to(self.user))
+
+    def _create_other_corpstats(self):
+        other_user = AuthUtils.create_user('other')
+        AuthUtils.add_main_character(other_user, 'other character', '4', corp_id='5', corp_name='other corp', corp_ticker='OTHR')
+        token = Token.objects.create(user=other_user, access_token='b', character_id=4, character_name='other character', character_owner_hash='y')
+        corp = EveCorporationInfo.objects.create(corporation_id=5, corporation_name='other corp', corporation_ticker='OTHR', alliance=self.alliance, member_count=1)
+        # discard permissions cached on the user by previous tests
+        self.user = type(self.user).objects.get(pk=self.user.pk)
+        return CorpStats.objects.create(corp=corp, token=token)
+
+    def test_visible_cache_cleared_on_permission_change(self):
+        corpstats = self._create_other_corpstats()
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk})
+
+        self.user.user_permissions.add(self.view_alliance_permission)
+        self.user = type(self.user).objects.get(pk=self.user.pk)
+
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk, corpstats.pk})
+
+    def test_visible_cache_cleared_on_state_change(self):
+        corpstats = self._create_other_corpstats()
+        self.state.member_characters.add(self.user.profile.main_character)
+        self.user.profile.refresh_from_db()
+        self.user.user_permissions.add(self.view_state_permission)
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk})
+
+        self.state.member_corporations.add(corpstats.corp)
+
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk, corpstats.pk})
+
+    def test_visible_cache_cleared_on_main_character_change(self):
+        corpstats = self._create_other_corpstats()
+        self.user.user_permissions.add(self.view_corp_permission)
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk})
+
+        character = self.user.profile.main_character
+        character.corporation_id = 5
+        character.alliance_id = None
+        character.save()
+        self.user.profile.refresh_from_db()
+
+        self.assertSetEqual(CorpStats.objects.visible_ids(self.user), {self.corpstats.pk, corpstats.pk})
+
 
 class CorpStatsUpdateTestCase(TestCase):
     @classmethod
@@ -71,6 +123,7 @@ class CorpStatsUpdateTestCase(TestCase):
         cls.corp = EveCorporationInfo.objects.create(corporation_id=2, corporation_name='test corp', corporation_ticker='TEST', member_count=1)
 
     def setUp(self):
+        cache.clear()
         self.corpstats = CorpStats.objects.get_or_create(token=self.token, corp=self.corp)[0]
 
     def test_can_update(self):
@@ -48,7 +48,7 @@ def corpstats_add(request, token):
         except HTTPError as e:
             messages.error(request, str(e))
         assert cs.pk  # ensure update was successful
-        if CorpStats.objects.filter(pk=cs.pk).visible_to(request.user).exists():
+        if cs.visible_to(request.user):
             return redirect('corputils:view_corp', corp_id=corp.corporation_id)
     except IntegrityError:
         messages.error(request, _('Selected corp already has a statistics module.'))
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EveonlineConfig(AppConfig):
     name = 'allianceauth.eveonline'
     label = 'eveonline'
+
+    def ready(self):
+        from . import signals  # noqa: F401
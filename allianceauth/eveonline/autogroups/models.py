@@ -5,6 +5,7 @@ from django.core.exceptions import ObjectDoesNotExist
 
 from allianceauth.authentication.models import State
 from allianceauth.eveonline.models import EveCorporationInfo, EveAllianceInfo
+from allianceauth.fieldtracking import FieldTrackerMixin
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ class AutogroupsConfigManager(models.Manager):
             config.remove_user_from_corp_groups(user)
 
 
-class AutogroupsConfig(models.Model):
+class AutogroupsConfig(FieldTrackerMixin, models.Model):
     OPT_TICKER = 'ticker'
     OPT_NAME = 'name'
     NAME_OPTIONS = (
@@ -84,6 +85,8 @@ class AutogroupsConfig(models.Model):
 
     objects = AutogroupsConfigManager()
 
+    tracked_fields = ('corp_groups', 'alliance_groups')
+
     def __init__(self, *args, **kwargs):
         super(AutogroupsConfig, self).__init__(*args, **kwargs)
 
@@ -1,8 +1,13 @@
 import logging
+from functools import partial
+
 from django.dispatch import receiver
 from django.db.models.signals import pre_save, post_save, pre_delete, m2m_changed
+
 from allianceauth.authentication.models import UserProfile, State
+from allianceauth.authentication.signals import run_once
 from allianceauth.eveonline.models import EveCharacter
+from allianceauth.fieldtracking import loaded_values
 
 from .models import AutogroupsConfig
 
@@ -19,17 +24,16 @@ def pre_save_config(sender, instance, *args, **kwargs):
     if not instance.pk:
         # new model being created
         return
-    try:
-        old_instance = AutogroupsConfig.objects.get(pk=instance.pk)
+    old_values = loaded_values(instance, 'corp_groups', 'alliance_groups')
+    if not old_values:
+        return
 
-        # Check if enable was toggled, delete groups?
-        if old_instance.alliance_groups is True and instance.alliance_groups is False:
-            instance.delete_alliance_managed_groups()
+    # Check if enable was toggled, delete groups?
+    if old_values['alliance_groups'] is True and instance.alliance_groups is False:
+        instance.delete_alliance_managed_groups()
 
-        if old_instance.corp_groups is True and instance.corp_groups is False:
-            instance.delete_corp_managed_groups()
-    except AutogroupsConfig.DoesNotExist:
-        pass
+    if old_values['corp_groups'] is True and instance.corp_groups is False:
+        instance.delete_corp_managed_groups()
 
 
 @receiver(pre_delete, sender=AutogroupsConfig)
@@ -46,7 +50,10 @@ def check_groups_on_profile_update(sender, instance, created, *args, **kwargs):
     """
     Trigger check when main character or state changes.
     """
-    AutogroupsConfig.objects.update_groups_for_user(instance.user)
+    run_once(
+        ('update_groups_for_user', instance.user_id),
+        partial(AutogroupsConfig.objects.update_groups_for_user, instance.user)
+    )
 
 
 @receiver(m2m_changed, sender=AutogroupsConfig.states.through)
@@ -67,9 +74,12 @@ def autogroups_states_changed(sender, instance, action, reverse, model, pk_set,
 
 @receiver(post_save, sender=EveCharacter)
 def check_groups_on_character_update(sender, instance, created, *args, **kwargs):
-    if not created:
+    if not created and instance.has_changed('corporation_id', 'alliance_id'):
         try:
             profile = UserProfile.objects.prefetch_related('user').get(main_character_id=instance.pk)
-            AutogroupsConfig.objects.update_groups_for_user(profile.user)
+            run_once(
+                ('update_groups_for_user', profile.user_id),
+                partial(AutogroupsConfig.objects.update_groups_for_user, profile.user)
+            )
         except UserProfile.DoesNotExist:
             pass
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from allianceauth.eveonline.models import EveType
+
+
+class Command(BaseCommand):
+    help = 'Pre-loads the names of the given type IDs from ESI, e.g. all ships'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'type_ids', nargs='*', type=int, help='IDs of the types to load'
+        )
+        parser.add_argument(
+            '--file',
+            help='File with type IDs to load, one per line'
+        )
+
+    def handle(self, *args, **options):
+        type_ids = set(options['type_ids'])
+        if options['file']:
+            with open(options['file'], 'r', encoding='utf-8') as f:
+                type_ids |= {int(line) for line in f if line.strip()}
+        if not type_ids:
+            self.stdout.write(self.style.WARNING('No type IDs given.'))
+            return
+
+        missing_ids = type_ids - set(
+            EveType.objects.filter(type_id__in=type_ids).values_list('type_id', flat=True)
+        )
+        created = EveType.objects.bulk_load_types(sorted(missing_ids))
+        self.stdout.write(self.style.SUCCESS(
+            'Loaded {0} new types, {1} of {2} types were already known.'.format(
+                created, len(type_ids) - len(missing_ids), len(type_ids)
+            )
+        ))
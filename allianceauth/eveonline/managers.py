@@ -1,10 +1,22 @@
 import logging
+from collections import OrderedDict
 
 from django.db import models
 from . import providers
 
 logger = logging.getLogger(__name__)
 
+TYPE_NAMES_CHUNK_SIZE = 1000
+
+# in-process LRU cache of type names keyed by type ID,
+# cleared whenever an EveType is saved or deleted
+TYPE_NAMES_CACHE_SIZE = 1024
+_type_names = OrderedDict()
+
+
+def clear_type_names_cache():
+    _type_names.clear()
+
 
 class EveCharacterProviderManager:
     def get_character(self, character_id) -> providers.Character:
@@ -94,3 +106,135 @@ class EveCorporationManager(models.Manager):
         return self\
             .get(corporation_id=corp_id)\
             .update_corporation(self.provider.get_corporation(corp_id))
+
+
+class EveTypeManager(models.Manager):
+
+    def get_or_create_type(self, type_id):
+        """Return type by type ID, fetching it from ESI if not stored yet."""
+        try:
+            return self.get(type_id=type_id)
+        except self.model.DoesNotExist:
+            itemtype = providers.provider.get_itemtype(type_id)
+            obj, _ = self.update_or_create(
+                type_id=itemtype.id,
+                defaults={
+                    'type_name': itemtype.name,
+                    'group_id': itemtype.group_id,
+                }
+            )
+            return obj
+
+    def get_type_name(self, type_id: int) -> str:
+        """Return name of a type, served from an in-process cache."""
+        type_id = int(type_id)
+        if type_id in _type_names:
+            _type_names.move_to_end(type_id)
+            return _type_names[type_id]
+
+        type_name = self.get_or_create_type(type_id).type_name
+        _type_names[type_id] = type_name
+        if len(_type_names) > TYPE_NAMES_CACHE_SIZE:
+            _type_names.popitem(last=False)
+        return type_name
+
+    def get_type_names(self, type_ids) -> dict:
+        """Return names for many types, fetching all missing types from ESI
+        in bulk.
+
+        :return: dict of type names keyed by type ID
+        """
+        type_ids = {int(type_id) for type_id in type_ids}
+        names = dict(
+            self.filter(type_id__in=type_ids).values_list('type_id', 'type_name')
+        )
+        missing_ids = sorted(type_ids - set(names.keys()))
+        if missing_ids:
+            self.bulk_load_types(missing_ids)
+            names.update(
+                self.filter(type_id__in=missing_ids)
+                .values_list('type_id', 'type_name')
+            )
+        return names
+
+    def bulk_load_types(self, type_ids) -> int:
+        """Fetch the given types from ESI and store the ones not yet known.
+
+        :return: number of new types stored
+        """
+        type_ids = list(type_ids)
+        created = 0
+        for i in range(0, len(type_ids), TYPE_NAMES_CHUNK_SIZE):
+            itemtypes = providers.provider.get_itemtypes(
+                type_ids[i:i + TYPE_NAMES_CHUNK_SIZE]
+            )
+            existing_ids = set(
+                self.filter(type_id__in=[x.id for x in itemtypes])
+                .values_list('type_id', flat=True)
+            )
+            new_types = [
+                self.model(
+                    type_id=itemtype.id,
+                    type_name=itemtype.name,
+                    group_id=itemtype.group_id,
+                )
+                for itemtype in itemtypes if itemtype.id not in existing_ids
+            ]
+            self.bulk_create(new_types, ignore_conflicts=True)
+            created += len(new_types)
+        logger.debug('Stored %d new types' % created)
+        return created
+
+
+class EveLocationManager(models.Manager):
+
+    def get_location_names(self, location_ids) -> dict:
+        """Return names of solar systems and stations, fetching all
+        missing ones from ESI in one bulk request.
+
+        :return: dict of location names keyed by location ID
+        """
+        location_ids = {int(location_id) for location_id in location_ids}
+        names = dict(
+            self.filter(location_id__in=location_ids)
+            .values_list('location_id', 'location_name')
+        )
+        missing_ids = sorted(location_ids - set(names.keys()))
+        if missing_ids:
+            fetched = providers.provider.get_names(missing_ids)
+            self.bulk_create(
+                [
+                    self.model(
+                        location_id=location_id,
+                        location_name=name,
+                        category=category,
+                    )
+                    for location_id, (category, name) in fetched.items()
+                ],
+                ignore_conflicts=True
+            )
+            names.update(
+                {location_id: name for location_id, (_, name) in fetched.items()}
+            )
+        return names
+
+    def get_structure_name(self, structure_id: int, client) -> str:
+        """Return name of a player structure. Structure names can only be
+        fetched with a token, so `client` must be authenticated for a
+        character with docking access.
+        """
+        structure_id = int(structure_id)
+        try:
+            return self.get(location_id=structure_id).location_name
+        except self.model.DoesNotExist:
+            name = client.Universe.get_universe_structures_structure_id(
+                structure_id=structure_id
+            ).result()['name']
+            self.update_or_create(
+                location_id=structure_id,
+                defaults={
+                    'location_name': name,
+                    'category': self.model.CATEGORY_STRUCTURE,
+                }
+            )
+            return name
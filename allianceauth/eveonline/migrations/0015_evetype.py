@@ -0,0 +1,22 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eveonline', '0014_auto_20210105_1413'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EveType',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type_id', models.PositiveIntegerField(unique=True)),
+                ('type_name', models.CharField(max_length=254)),
+                ('group_id', models.PositiveIntegerField(blank=True, default=None, null=True)),
+            ],
+        ),
+    ]
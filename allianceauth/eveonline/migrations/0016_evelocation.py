@@ -0,0 +1,22 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eveonline', '0015_evetype'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EveLocation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location_id', models.BigIntegerField(unique=True)),
+                ('location_name', models.CharField(max_length=254)),
+                ('category', models.CharField(max_length=32)),
+            ],
+        ),
+    ]
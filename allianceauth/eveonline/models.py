@@ -1,9 +1,12 @@
 from django.db import models
 from typing import Union
 
+from allianceauth.fieldtracking import FieldTrackerMixin
+
 from .managers import EveCharacterManager, EveCharacterProviderManager
 from .managers import EveCorporationManager, EveCorporationProviderManager
 from .managers import EveAllianceManager, EveAllianceProviderManager
+from .managers import EveTypeManager, EveLocationManager
 from . import providers
 from .evelinks import eveimageserver
 
@@ -142,7 +145,7 @@ class EveCorporationInfo(models.Model):
         return self.logo_url(256)
 
 
-class EveCharacter(models.Model):
+class EveCharacter(FieldTrackerMixin, models.Model):
     character_id = models.PositiveIntegerField(unique=True)
     character_name = models.CharField(max_length=254, unique=True)
     corporation_id = models.PositiveIntegerField()
@@ -155,6 +158,10 @@ class EveCharacter(models.Model):
     objects = EveCharacterManager()
     provider = EveCharacterProviderManager()
 
+    tracked_fields = (
+        'character_id', 'character_name', 'corporation_id', 'corporation_name', 'alliance_id', 'alliance_name'
+    )
+
     class Meta:
         indexes = [
                     models.Index(fields=['corporation_id',]),
@@ -280,3 +287,28 @@ class EveCharacter(models.Model):
     def alliance_logo_url_256(self) -> str:
         """image URL for alliance of this character or empty string"""
         return self.alliance_logo_url(256)
+
+
+class EveType(models.Model):
+    type_id = models.PositiveIntegerField(unique=True)
+    type_name = models.CharField(max_length=254)
+    group_id = models.PositiveIntegerField(blank=True, null=True, default=None)
+
+    objects = EveTypeManager()
+
+    def __str__(self):
+        return self.type_name
+
+
+class EveLocation(models.Model):
+    """Names of solar systems, stations and structures"""
+    CATEGORY_STRUCTURE = 'structure'
+
+    location_id = models.BigIntegerField(unique=True)
+    location_name = models.CharField(max_length=254)
+    category = models.CharField(max_length=32)
+
+    objects = EveLocationManager()
+
+    def __str__(self):
+        return self.location_name
@@ -22,6 +22,7 @@ get_corporations_corporation_id
 get_characters_character_id
 get_universe_types_type_id
 post_character_affiliation
+post_universe_names
 """
 
 
@@ -128,8 +129,9 @@ class Character(Entity):
 
 
 class ItemType(Entity):
-    def __init__(self, **kwargs):
+    def __init__(self, group_id=None, **kwargs):
         super(ItemType, self).__init__(**kwargs)
+        self.group_id = group_id
 
 
 class EveProvider(object):
@@ -157,6 +159,18 @@ class EveProvider(object):
         """
         raise NotImplemented()
 
+    def get_itemtypes(self, type_ids):
+        """
+        :return: list of ItemType objects for the given IDs, without group
+        """
+        raise NotImplementedError()
+
+    def get_names(self, ids):
+        """
+        :return: dict of (category, name) tuples for the given IDs keyed by ID
+        """
+        raise NotImplementedError()
+
 
 class EveSwaggerProvider(EveProvider):
     def __init__(self, token=None, adapter=None):        
@@ -239,9 +253,41 @@ class EveSwaggerProvider(EveProvider):
     def get_itemtype(self, type_id):
         try:
             data = self.client.Universe.get_universe_types_type_id(type_id=type_id).result()
-            return ItemType(id=type_id, name=data['name'])
+            return ItemType(id=type_id, name=data['name'], group_id=data.get('group_id'))
         except (HTTPNotFound, HTTPUnprocessableEntity):
             raise ObjectNotFound(type_id, 'type')
 
+    def get_itemtypes(self, type_ids):
+        type_ids = list(type_ids)
+        try:
+            data = self.client.Universe.post_universe_names(ids=type_ids).result()
+        except HTTPNotFound:
+            # at least one ID is invalid, so resolve them one by one
+            itemtypes = []
+            for type_id in type_ids:
+                try:
+                    itemtypes.append(self.get_itemtype(type_id))
+                except ObjectNotFound:
+                    logger.debug('Skipping unknown type ID %s' % type_id)
+            return itemtypes
+        return [
+            ItemType(id=row['id'], name=row['name'])
+            for row in data if row['category'] == 'inventory_type'
+        ]
+
+    def get_names(self, ids):
+        ids = list(ids)
+        try:
+            data = self.client.Universe.post_universe_names(ids=ids).result()
+        except HTTPNotFound:
+            # at least one ID is invalid, so resolve them one by one
+            data = []
+            for id in ids:
+                try:
+                    data += self.client.Universe.post_universe_names(ids=[id]).result()
+                except HTTPNotFound:
+                    logger.debug('Skipping unknown ID %s' % id)
+        return {row['id']: (row['category'], row['name']) for row in data}
+
 
 provider = EveSwaggerProvider()
@@ -0,0 +1,17 @@
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .managers import clear_type_names_cache
+from .models import EveType
+
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=EveType)
+@receiver(post_delete, sender=EveType)
+def clear_type_names_cache_on_type_change(sender, instance, **kwargs):
+    logger.debug("Clearing type names cache")
+    clear_type_names_cache()
@@ -1,6 +1,8 @@
 import logging
 
 from celery import shared_task
+from django.db import transaction
+
 from .models import EveAllianceInfo
 from .models import EveCharacter
 from .models import EveCorporationInfo
@@ -34,7 +36,13 @@ def update_alliance(alliance_id):
 @shared_task
 def update_character(character_id):
     """Update given character from ESI"""
-    EveCharacter.objects.update_character(character_id)
+    from allianceauth.authentication.signals import batched_signals
+
+    # the resulting state, group and service updates run once per user
+    # after the transaction has been committed
+    with batched_signals():
+        with transaction.atomic():
+            EveCharacter.objects.update_character(character_id)
 
 
 @shared_task
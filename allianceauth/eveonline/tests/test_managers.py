@@ -2,8 +2,9 @@ from unittest import mock
 
 from django.test import TestCase
 
-from ..models import EveCharacter, EveCorporationInfo, EveAllianceInfo
-from ..providers import Character, Corporation, Alliance
+from ..managers import clear_type_names_cache
+from ..models import EveCharacter, EveCorporationInfo, EveAllianceInfo, EveType, EveLocation
+from ..providers import Character, Corporation, Alliance, ItemType
 
 
 class EveCharacterProviderManagerTestCase(TestCase):
@@ -292,3 +293,123 @@ class EveCorporationManagerTestCase(TestCase):
         # These are the only updated props
         self.assertEqual(result.member_count, expected.members)
         self.assertEqual(result.alliance, exp_alliance)
+
+
+class EveTypeManagerTestCase(TestCase):
+
+    def setUp(self):
+        clear_type_names_cache()
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_or_create_type(self, provider):
+        provider.get_itemtype.return_value = ItemType(
+            id=587, name='Rifter', group_id=25
+        )
+
+        result = EveType.objects.get_or_create_type(587)
+
+        self.assertEqual(result.type_name, 'Rifter')
+        self.assertEqual(result.group_id, 25)
+        self.assertEqual(EveType.objects.get_or_create_type(587), result)
+        self.assertEqual(provider.get_itemtype.call_count, 1)
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_type_name_cached(self, provider):
+        EveType.objects.create(type_id=587, type_name='Rifter')
+
+        self.assertEqual(EveType.objects.get_type_name(587), 'Rifter')
+        with self.assertNumQueries(0):
+            self.assertEqual(EveType.objects.get_type_name('587'), 'Rifter')
+        self.assertFalse(provider.get_itemtype.called)
+
+    @mock.patch('allianceauth.eveonline.managers.TYPE_NAMES_CACHE_SIZE', 2)
+    def test_get_type_name_cache_is_bounded(self):
+        for type_id, type_name in ((587, 'Rifter'), (588, 'Reaper'), (589, 'Executioner')):
+            EveType.objects.create(type_id=type_id, type_name=type_name)
+        EveType.objects.get_type_name(587)
+        EveType.objects.get_type_name(588)
+        EveType.objects.get_type_name(587)
+        EveType.objects.get_type_name(589)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(EveType.objects.get_type_name(587), 'Rifter')
+        with self.assertNumQueries(1):
+            self.assertEqual(EveType.objects.get_type_name(588), 'Reaper')
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_type_name_cache_cleared_on_change(self, provider):
+        eve_type = EveType.objects.create(type_id=587, type_name='Rifter')
+        self.assertEqual(EveType.objects.get_type_name(587), 'Rifter')
+
+        eve_type.type_name = 'Rifter Renamed'
+        eve_type.save()
+
+        self.assertEqual(EveType.objects.get_type_name(587), 'Rifter Renamed')
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_type_names(self, provider):
+        EveType.objects.create(type_id=587, type_name='Rifter')
+        provider.get_itemtypes.return_value = [
+            ItemType(id=588, name='Reaper'),
+            ItemType(id=589, name='Executioner'),
+        ]
+
+        result = EveType.objects.get_type_names([587, 588, 589])
+
+        self.assertDictEqual(
+            result, {587: 'Rifter', 588: 'Reaper', 589: 'Executioner'}
+        )
+        provider.get_itemtypes.assert_called_once_with([588, 589])
+        self.assertEqual(EveType.objects.count(), 3)
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_bulk_load_types_skips_existing(self, provider):
+        EveType.objects.create(type_id=587, type_name='Rifter', group_id=25)
+        provider.get_itemtypes.return_value = [
+            ItemType(id=587, name='Rifter'),
+            ItemType(id=588, name='Reaper'),
+        ]
+
+        result = EveType.objects.bulk_load_types([587, 588])
+
+        self.assertEqual(result, 1)
+        self.assertEqual(EveType.objects.get(type_id=587).group_id, 25)
+
+
+class EveLocationManagerTestCase(TestCase):
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_location_names(self, provider):
+        EveLocation.objects.create(location_id=30000142, location_name='Jita', category='solar_system')
+        provider.get_names.return_value = {
+            60003760: ('station', 'Jita IV - Moon 4 - Caldari Navy Assembly Plant'),
+        }
+
+        result = EveLocation.objects.get_location_names([30000142, 60003760])
+
+        self.assertDictEqual(result, {
+            30000142: 'Jita',
+            60003760: 'Jita IV - Moon 4 - Caldari Navy Assembly Plant',
+        })
+        provider.get_names.assert_called_once_with([60003760])
+        self.assertTrue(EveLocation.objects.filter(location_id=60003760).exists())
+
+    @mock.patch('allianceauth.eveonline.managers.providers.provider')
+    def test_get_location_names_cached(self, provider):
+        EveLocation.objects.create(location_id=30000142, location_name='Jita', category='solar_system')
+
+        result = EveLocation.objects.get_location_names(['30000142'])
+
+        self.assertDictEqual(result, {30000142: 'Jita'})
+        self.assertFalse(provider.get_names.called)
+
+    def test_get_structure_name(self):
+        client = mock.Mock()
+        client.Universe.get_universe_structures_structure_id.return_value.result.return_value = {
+            'name': 'Test Fortizar'
+        }
+
+        self.assertEqual(EveLocation.objects.get_structure_name(1000000000001, client), 'Test Fortizar')
+        self.assertEqual(EveLocation.objects.get_structure_name(1000000000001, client), 'Test Fortizar')
+        self.assertEqual(client.Universe.get_universe_structures_structure_id.call_count, 1)
+
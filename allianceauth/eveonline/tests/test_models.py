@@ -284,6 +284,26 @@ class EveCharacterTestCase(TestCase):
             eveimageserver._eve_entity_image_url('alliance', 987, size=256)
         )
 
+    def test_has_changed(self):
+        EveCharacter.objects.create(
+            character_id=1234,
+            character_name='character.name',
+            corporation_id=2345,
+            corporation_name='character.corp.name',
+            corporation_ticker='cc1',
+        )
+        character = EveCharacter.objects.get(character_id=1234)
+        self.assertFalse(character.has_changed('character_name', 'corporation_id'))
+        character.corporation_id = 3456
+        self.assertTrue(character.has_changed('character_name', 'corporation_id'))
+        self.assertFalse(character.has_changed('character_name'))
+        character.save()
+        self.assertFalse(character.has_changed('corporation_id'))
+
+    def test_has_changed_for_unsaved_character(self):
+        character = EveCharacter(character_id=1234, character_name='character.name')
+        self.assertTrue(character.has_changed('character_name'))
+
 
 class EveAllianceTestCase(TestCase):
             
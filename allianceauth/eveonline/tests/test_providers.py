@@ -545,6 +545,60 @@ class TestEveSwaggerProvider(TestCase):
         with self.assertRaises(ObjectNotFound):
             my_provider.get_itemtype(4999)
 
+    @patch(MODULE_PATH + '.esi_client_factory')
+    def test_get_itemtypes(self, mock_esi_client_factory):
+        mock_esi_client_factory.return_value\
+            .Universe.post_universe_names.return_value.result.return_value = [
+                {'id': 4001, 'name': 'Dummy Type 1', 'category': 'inventory_type'},
+                {'id': 4002, 'name': 'Dummy Type 2', 'category': 'inventory_type'},
+            ]
+
+        my_provider = EveSwaggerProvider()
+
+        my_types = my_provider.get_itemtypes([4001, 4002])
+        self.assertEqual([x.id for x in my_types], [4001, 4002])
+        self.assertEqual(my_types[1].name, 'Dummy Type 2')
+
+    @patch(MODULE_PATH + '.esi_client_factory')
+    def test_get_itemtypes_with_invalid_id(self, mock_esi_client_factory):
+        mock_esi_client_factory.return_value\
+            .Universe.post_universe_names.side_effect = HTTPNotFound(Mock())
+        mock_esi_client_factory.return_value\
+            .Universe.get_universe_types_type_id \
+            = TestEveSwaggerProvider.esi_get_universe_types_type_id
+
+        my_provider = EveSwaggerProvider()
+
+        my_types = my_provider.get_itemtypes([4001, 4999])
+        self.assertEqual([x.id for x in my_types], [4001])
+
+    @patch(MODULE_PATH + '.esi_client_factory')
+    def test_get_names(self, mock_esi_client_factory):
+        mock_esi_client_factory.return_value\
+            .Universe.post_universe_names.return_value.result.return_value = [
+                {'id': 30000142, 'name': 'Jita', 'category': 'solar_system'},
+            ]
+
+        my_provider = EveSwaggerProvider()
+
+        self.assertEqual(my_provider.get_names([30000142]), {30000142: ('solar_system', 'Jita')})
+
+    @patch(MODULE_PATH + '.esi_client_factory')
+    def test_get_names_with_invalid_id(self, mock_esi_client_factory):
+        def post_universe_names(ids):
+            if ids != [30000142]:
+                raise HTTPNotFound(Mock())
+            return Mock(**{'result.return_value': [
+                {'id': 30000142, 'name': 'Jita', 'category': 'solar_system'}
+            ]})
+
+        mock_esi_client_factory.return_value\
+            .Universe.post_universe_names.side_effect = post_universe_names
+
+        my_provider = EveSwaggerProvider()
+
+        self.assertEqual(my_provider.get_names([30000142, 1]), {30000142: ('solar_system', 'Jita')})
+
     @patch(MODULE_PATH + '.settings.DEBUG', False)
     @patch(MODULE_PATH + '.esi_client_factory')
     def test_create_client_on_normal_startup(self, mock_esi_client_factory):
@@ -0,0 +1,94 @@
+"""
+Snapshots of model field values taken when instances are loaded, so signal
+receivers can detect changes in memory instead of re-fetching the row.
+"""
+from django.apps import apps
+from django.db.models import DEFERRED
+from django.db.models.signals import post_init, post_save
+
+# concrete model -> attnames tracked for instances of models we don't own
+_tracked_fields = {}
+
+
+def _attnames(model, fields):
+    return tuple(model._meta.get_field(field).attname for field in fields)
+
+
+def _snapshot(instance, attnames, update_fields=None):
+    if update_fields is not None and hasattr(instance, '_loaded_values'):
+        # only the given fields have been stored
+        saved = _attnames(type(instance), update_fields)
+        attnames = [attname for attname in attnames if attname in saved]
+        values = instance._loaded_values
+    else:
+        values = instance._loaded_values = {}
+    # read from __dict__ so deferred fields are not loaded just to track them
+    for attname in attnames:
+        values[attname] = instance.__dict__.get(attname, DEFERRED)
+
+
+def _snapshot_registered(sender, instance, update_fields=None, **kwargs):
+    _snapshot(instance, _tracked_fields[sender._meta.concrete_model], update_fields)
+
+
+def track_fields(model, *fields):
+    """
+    Track fields of a model which can't use FieldTrackerMixin, e.g. User.
+    Snapshots are taken on init and refreshed after save, so only pre_save
+    receivers can rely on them. Proxy models known at registration are
+    tracked as well.
+    """
+    _tracked_fields[model] = _attnames(model, fields)
+    for candidate in apps.get_models():
+        if candidate._meta.concrete_model is model:
+            post_init.connect(_snapshot_registered, sender=candidate, dispatch_uid='fieldtracking')
+            post_save.connect(_snapshot_registered, sender=candidate, dispatch_uid='fieldtracking')
+
+
+class FieldTrackerMixin:
+    """
+    Remembers the values of tracked_fields as loaded from the database. The
+    snapshot is refreshed once save() returns, so pre_save and post_save
+    receivers both compare against the previously stored values.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        _snapshot(instance, _attnames(cls, cls.tracked_fields))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        _snapshot(self, _attnames(type(self), self.tracked_fields), kwargs.get('update_fields'))
+
+    def has_changed(self, *fields) -> bool:
+        """
+        Whether any of the given tracked fields differs from its stored value.
+        Instances without a snapshot, e.g. new ones, always have changed.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return True
+        for attname in _attnames(type(self), fields):
+            value = loaded.get(attname, DEFERRED)
+            if value is DEFERRED or value != getattr(self, attname):
+                return True
+        return False
+
+
+def loaded_values(instance, *fields):
+    """
+    Returns the stored values of the given fields keyed by attname, taken from
+    the instance's snapshot when available and from the database otherwise.
+    Returns None if the instance hasn't been stored.
+    """
+    if instance.pk is None:
+        return None
+    attnames = _attnames(type(instance), fields)
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    values = {attname: loaded.get(attname, DEFERRED) for attname in attnames}
+    if DEFERRED not in values.values():
+        return values
+    return type(instance)._base_manager.filter(pk=instance.pk).values(*attnames).first()
@@ -0,0 +1,226 @@
+import datetime
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bravado.exception import (
+    BravadoConnectionError, BravadoTimeoutError, HTTPClientError, HTTPNotFound, HTTPServerError
+)
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from esi.errors import TokenError
+from esi.models import Token
+
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.models import EveLocation, EveType
+
+from .models import Fat, Fatlink
+
+logger = logging.getLogger(__name__)
+
+SWAGGER_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'swagger.json')
+"""
+Swagger spec operations:
+
+get_characters_character_id_fleet
+get_characters_character_id_location
+get_characters_character_id_ship
+get_fleets_fleet_id_members
+get_universe_structures_structure_id
+"""
+
+RETRY_COUNTDOWN = 10
+# status code of ESI when the error limit is exceeded
+ESI_ERROR_LIMITED = 420
+# seconds between two snapshots of a fleet during a capture
+FLEET_CAPTURE_INTERVAL = getattr(settings, 'FAT_FLEET_CAPTURE_INTERVAL', 300)
+# stored for a Fat whose location or ship could not be resolved
+UNKNOWN = 'Unknown'
+
+
+def _fat_values(**values):
+    """Truncate values to the max length of their Fat fields, as update() and bulk_create() don't validate"""
+    return {
+        field: value[:Fat._meta.get_field(field).max_length]
+        for field, value in values.items()
+    }
+
+
+@shared_task(bind=True, max_retries=3)
+def resolve_fat(self, fat_id, token_id):
+    """Fill in location and ship of a Fat registered through a FAT link"""
+    try:
+        token = Token.objects.get(pk=token_id)
+    except Token.DoesNotExist:
+        logger.warning("Token id %s for Fat id %s no longer exists" % (token_id, fat_id))
+        return
+    if not Fat.objects.filter(pk=fat_id).exists():
+        logger.debug("Fat id %s no longer exists" % fat_id)
+        return
+
+    try:
+        c = token.get_esi_client(spec_file=SWAGGER_SPEC_PATH)
+        # both lookups only depend on the character, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            location = executor.submit(
+                lambda: c.Location.get_characters_character_id_location(character_id=token.character_id).result()
+            )
+            ship = executor.submit(
+                lambda: c.Location.get_characters_character_id_ship(character_id=token.character_id).result()
+            )
+            location = location.result()
+            ship = ship.result()
+
+        names = EveLocation.objects.get_location_names(
+            [location['solar_system_id']] + ([location['station_id']] if location['station_id'] else [])
+        )
+        if location['station_id']:
+            station_name = names[location['station_id']]
+        elif location['structure_id']:
+            station_name = EveLocation.objects.get_structure_name(location['structure_id'], c)
+        else:
+            station_name = "No Station"
+        ship_type_name = EveType.objects.get_type_name(ship['ship_type_id'])
+    except (
+        requests.RequestException,
+        BravadoConnectionError,
+        BravadoTimeoutError,
+        HTTPServerError
+    ) as ex:
+        if self.request.retries < self.max_retries:
+            logger.info("Failed to resolve Fat id %s, retrying: %s" % (fat_id, ex))
+            raise self.retry(countdown=RETRY_COUNTDOWN * 2 ** self.request.retries)
+        logger.warning("Giving up resolving Fat id %s" % fat_id)
+        _set_fat_unknown(fat_id)
+        return
+    except Exception:
+        # e.g. a missing scope, the Fat must not stay unresolved
+        logger.exception("Failed to resolve Fat id %s" % fat_id)
+        _set_fat_unknown(fat_id)
+        return
+
+    Fat.objects.filter(pk=fat_id).update(**_fat_values(
+        system=names[location['solar_system_id']],
+        station=station_name,
+        shiptype=ship_type_name,
+    ))
+    logger.debug("Resolved Fat id %s" % fat_id)
+
+
+def _set_fat_unknown(fat_id):
+    Fat.objects.filter(pk=fat_id).update(system=UNKNOWN, station=UNKNOWN, shiptype=UNKNOWN)
+
+
+def _fleet_capture_cache_key(fatlink_id):
+    return 'fat_fleet_capture_{}'.format(fatlink_id)
+
+
+def start_fleet_capture(fatlink, token):
+    """
+    Start taking snapshots of the fleet of the token's character for a fatlink
+    until it expires. Replaces any capture already running for the fatlink.
+    """
+    capture_id = uuid.uuid4().hex
+    cache.set(
+        _fleet_capture_cache_key(fatlink.pk), capture_id, fatlink.duration * 60 + FLEET_CAPTURE_INTERVAL
+    )
+    capture_fleet.delay(fatlink.pk, token.pk, capture_id)
+
+
+def record_fleet_members(fatlink, members) -> int:
+    """
+    Register Fats for all fleet members with a known owner.
+    Names are resolved in bulk and existing Fats are left untouched.
+    :return: number of members with a known owner
+    """
+    ownerships = CharacterOwnership.objects.filter(
+        character__character_id__in=[m['character_id'] for m in members]
+    ).select_related('character', 'user')
+    ownerships = {o.character.character_id: o for o in ownerships}
+    members = [m for m in members if m['character_id'] in ownerships]
+    locations = EveLocation.objects.get_location_names(
+        {m['solar_system_id'] for m in members} | {m['station_id'] for m in members if m.get('station_id')}
+    )
+    ship_types = EveType.objects.get_type_names({m['ship_type_id'] for m in members})
+
+    Fat.objects.bulk_create(
+        [
+            Fat(
+                fatlink=fatlink,
+                character=ownerships[m['character_id']].character,
+                user=ownerships[m['character_id']].user,
+                **_fat_values(
+                    system=locations.get(m['solar_system_id'], UNKNOWN),
+                    station=(
+                        locations.get(m['station_id'], 'Unknown Station') if m.get('station_id') else 'No Station'
+                    ),
+                    shiptype=ship_types.get(m['ship_type_id'], UNKNOWN),
+                )
+            )
+            for m in members
+        ],
+        ignore_conflicts=True
+    )
+    return len(members)
+
+
+@shared_task(bind=True, max_retries=3)
+def capture_fleet(self, fatlink_id, token_id, capture_id):
+    """Register Fats for the current members of a fleet and schedule the next snapshot"""
+    if cache.get(_fleet_capture_cache_key(fatlink_id)) != capture_id:
+        logger.debug("Fleet capture %s for fatlink id %s has been stopped" % (capture_id, fatlink_id))
+        return
+    try:
+        fatlink = Fatlink.objects.get(pk=fatlink_id)
+        token = Token.objects.get(pk=token_id)
+    except (Fatlink.DoesNotExist, Token.DoesNotExist):
+        logger.debug("Fatlink id %s or token id %s no longer exists" % (fatlink_id, token_id))
+        return
+
+    try:
+        c = token.get_esi_client(spec_file=SWAGGER_SPEC_PATH)
+        fleet_id = c.Fleets.get_characters_character_id_fleet(character_id=token.character_id).result()['fleet_id']
+        members = c.Fleets.get_fleets_fleet_id_members(fleet_id=fleet_id).result()
+    except HTTPNotFound:
+        # not in a fleet or not its boss (yet), try again with the next snapshot
+        logger.info("Character %s is not boss of a fleet for fatlink %s" % (token.character_name, fatlink))
+        members = None
+    except TokenError as ex:
+        # later snapshots would fail the same way
+        logger.warning("Stopping fleet capture for fatlink %s, token id %s is invalid: %s" % (fatlink, token_id, ex))
+        return
+    except (
+        requests.RequestException,
+        BravadoConnectionError,
+        BravadoTimeoutError,
+        HTTPServerError,
+        HTTPClientError,
+    ) as ex:
+        retryable = not isinstance(ex, HTTPClientError) or ex.status_code == ESI_ERROR_LIMITED
+        if retryable and self.request.retries < self.max_retries:
+            logger.info("Failed to fetch fleet for fatlink %s, retrying: %s" % (fatlink, ex))
+            raise self.retry(countdown=RETRY_COUNTDOWN * 2 ** self.request.retries)
+        logger.warning("Skipping fleet snapshot for fatlink %s: %s" % (fatlink, ex))
+        members = None
+    except Exception:
+        logger.exception("Skipping fleet snapshot for fatlink %s" % fatlink)
+        members = None
+
+    if members is not None:
+        try:
+            recorded = record_fleet_members(fatlink, members)
+        except Exception:
+            logger.exception("Failed to register members of fleet snapshot for fatlink %s" % fatlink)
+        else:
+            logger.info(
+                "Fleet snapshot for fatlink %s: %d of %d members registered" % (fatlink, recorded, len(members))
+            )
+
+    expires = fatlink.fatdatetime + datetime.timedelta(minutes=fatlink.duration)
+    if timezone.now() + datetime.timedelta(seconds=FLEET_CAPTURE_INTERVAL) < expires:
+        capture_fleet.apply_async(args=(fatlink_id, token_id, capture_id), countdown=FLEET_CAPTURE_INTERVAL)
+
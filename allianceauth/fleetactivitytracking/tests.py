@@ -0,0 +1,265 @@
+from unittest import mock
+
+from bravado.exception import HTTPBadGateway, HTTPForbidden, HTTPNotFound, make_http_exception
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from esi.errors import TokenExpiredError
+from esi.models import Token
+
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.managers import clear_type_names_cache
+from allianceauth.eveonline.models import EveCharacter, EveLocation, EveType
+from allianceauth.tests.auth_utils import AuthUtils
+
+from .models import Fat, Fatlink
+from .tasks import capture_fleet, record_fleet_members, resolve_fat, start_fleet_capture
+
+MODULE_PATH = 'allianceauth.fleetactivitytracking.tasks'
+
+
+class ResolveFatTestCase(TestCase):
+    def setUp(self):
+        self.user = AuthUtils.create_user('test_user', disconnect_signals=True)
+        self.character = EveCharacter.objects.create(
+            character_id=1001,
+            character_name='Test Character',
+            corporation_id=2001,
+            corporation_name='Test Corp',
+            corporation_ticker='TEST',
+        )
+        self.token = Token.objects.create(
+            user=self.user,
+            character_id=1001,
+            character_name='Test Character',
+            character_owner_hash='abc',
+        )
+        fatlink = Fatlink.objects.create(
+            fleet='Test Fleet', duration=30, hash='abc123', creator=self.user, fatdatetime=timezone.now()
+        )
+        self.fat = Fat.objects.create(character=self.character, fatlink=fatlink, user=self.user)
+        EveLocation.objects.create(location_id=30000142, location_name='Jita', category='solar_system')
+        EveLocation.objects.create(location_id=60003760, location_name='Jita 4-4', category='station')
+        EveType.objects.create(type_id=587, type_name='Rifter')
+        clear_type_names_cache()
+
+    def _mock_client(self, client, location):
+        client.return_value.Location.get_characters_character_id_location.return_value\
+            .result.return_value = location
+        client.return_value.Location.get_characters_character_id_ship.return_value\
+            .result.return_value = {'ship_type_id': 587}
+        return client.return_value
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_docked(self, client):
+        self._mock_client(client, {'solar_system_id': 30000142, 'station_id': 60003760, 'structure_id': None})
+
+        resolve_fat(self.fat.pk, self.token.pk)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.system, 'Jita')
+        self.assertEqual(self.fat.station, 'Jita 4-4')
+        self.assertEqual(self.fat.shiptype, 'Rifter')
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_in_space(self, client):
+        self._mock_client(client, {'solar_system_id': 30000142, 'station_id': None, 'structure_id': None})
+
+        resolve_fat(self.fat.pk, self.token.pk)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.system, 'Jita')
+        self.assertEqual(self.fat.station, 'No Station')
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_retries_on_esi_errors(self, client):
+        client.return_value.Location.get_characters_character_id_location.return_value\
+            .result.side_effect = HTTPBadGateway(mock.Mock(text=""))
+
+        with self.assertRaises(Retry):
+            resolve_fat.apply(args=(self.fat.pk, self.token.pk), throw=True)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.system, '')
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_gives_up_after_retries(self, client):
+        client.return_value.Location.get_characters_character_id_location.return_value\
+            .result.side_effect = HTTPBadGateway(mock.Mock(text=""))
+
+        resolve_fat.apply(args=(self.fat.pk, self.token.pk), retries=resolve_fat.max_retries)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.system, 'Unknown')
+        self.assertEqual(self.fat.shiptype, 'Unknown')
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_unknown_on_missing_scope(self, client):
+        client.return_value.Location.get_characters_character_id_location.return_value\
+            .result.side_effect = HTTPForbidden(mock.Mock(text=""))
+
+        resolve_fat(self.fat.pk, self.token.pk)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.system, 'Unknown')
+        self.assertEqual(self.fat.station, 'Unknown')
+
+    @mock.patch(MODULE_PATH + '.EveLocation.objects.get_structure_name')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_resolve_truncates_long_names(self, client, get_structure_name):
+        self._mock_client(client, {'solar_system_id': 30000142, 'station_id': None, 'structure_id': 1234})
+        get_structure_name.return_value = 'x' * 200
+
+        resolve_fat(self.fat.pk, self.token.pk)
+
+        self.fat.refresh_from_db()
+        self.assertEqual(self.fat.station, 'x' * 125)
+
+
+class FleetCaptureTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = AuthUtils.create_user('test_user', disconnect_signals=True)
+        self.characters = []
+        for character_id in (1001, 1002, 1003):
+            character = EveCharacter.objects.create(
+                character_id=character_id,
+                character_name='Character {}'.format(character_id),
+                corporation_id=2001,
+                corporation_name='Test Corp',
+                corporation_ticker='TEST',
+            )
+            if character_id != 1003:
+                CharacterOwnership.objects.create(
+                    user=self.user, character=character, owner_hash=str(character_id)
+                )
+            self.characters.append(character)
+        self.token = Token.objects.create(
+            user=self.user,
+            character_id=1001,
+            character_name='Character 1001',
+            character_owner_hash='1001',
+        )
+        self.fatlink = Fatlink.objects.create(
+            fleet='Test Fleet', duration=30, hash='abc123', creator=self.user, fatdatetime=timezone.now()
+        )
+        EveLocation.objects.create(location_id=30000142, location_name='Jita', category='solar_system')
+        EveLocation.objects.create(location_id=60003760, location_name='Jita 4-4', category='station')
+        EveType.objects.create(type_id=587, type_name='Rifter')
+        self.members = [
+            {'character_id': 1001, 'solar_system_id': 30000142, 'station_id': 60003760, 'ship_type_id': 587},
+            {'character_id': 1002, 'solar_system_id': 30000142, 'ship_type_id': 587},
+            {'character_id': 1003, 'solar_system_id': 30000142, 'ship_type_id': 587},
+        ]
+
+    def test_record_fleet_members(self):
+        Fat.objects.create(
+            fatlink=self.fatlink, character=self.characters[0], user=self.user,
+            system='Amarr', station='No Station', shiptype='Punisher'
+        )
+
+        with self.assertNumQueries(4):
+            recorded = record_fleet_members(self.fatlink, self.members)
+
+        self.assertEqual(recorded, 2)
+        fats = {fat.character.character_id: fat for fat in Fat.objects.filter(fatlink=self.fatlink)}
+        self.assertEqual(set(fats.keys()), {1001, 1002})
+        self.assertEqual(fats[1001].system, 'Amarr')
+        self.assertEqual(fats[1002].system, 'Jita')
+        self.assertEqual(fats[1002].station, 'No Station')
+        self.assertEqual(fats[1002].shiptype, 'Rifter')
+
+    @mock.patch(MODULE_PATH + '.capture_fleet.apply_async')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet(self, client, apply_async):
+        client.return_value.Fleets.get_characters_character_id_fleet.return_value\
+            .result.return_value = {'fleet_id': 42}
+        client.return_value.Fleets.get_fleets_fleet_id_members.return_value\
+            .result.return_value = self.members
+        start_fleet_capture(self.fatlink, self.token)
+        args = apply_async.call_args[0][0]
+
+        capture_fleet(*args)
+
+        client.return_value.Fleets.get_fleets_fleet_id_members.assert_called_once_with(fleet_id=42)
+        self.assertEqual(Fat.objects.filter(fatlink=self.fatlink).count(), 2)
+        apply_async.assert_called_with(args=args, countdown=300)
+
+    @mock.patch(MODULE_PATH + '.capture_fleet.apply_async')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_stops_with_fatlink(self, client, apply_async):
+        client.return_value.Fleets.get_characters_character_id_fleet.return_value\
+            .result.side_effect = HTTPNotFound(mock.Mock(text=''))
+        self.fatlink.duration = 1
+        self.fatlink.save()
+        start_fleet_capture(self.fatlink, self.token)
+        args = apply_async.call_args[0][0]
+        apply_async.reset_mock()
+
+        capture_fleet(*args)
+
+        self.assertFalse(Fat.objects.filter(fatlink=self.fatlink).exists())
+        self.assertFalse(apply_async.called)
+
+    @mock.patch(MODULE_PATH + '.capture_fleet.apply_async')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_continues_after_forbidden(self, client, apply_async):
+        client.return_value.Fleets.get_characters_character_id_fleet.return_value\
+            .result.side_effect = HTTPForbidden(mock.Mock(text=''))
+        start_fleet_capture(self.fatlink, self.token)
+        args = apply_async.call_args[0][0]
+        apply_async.reset_mock()
+
+        capture_fleet(*args)
+
+        self.assertFalse(Fat.objects.filter(fatlink=self.fatlink).exists())
+        apply_async.assert_called_once_with(args=args, countdown=300)
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_retries_when_error_limited(self, client):
+        client.return_value.Fleets.get_characters_character_id_fleet.return_value\
+            .result.side_effect = make_http_exception(mock.Mock(status_code=420, text=''))
+        cache.set('fat_fleet_capture_{}'.format(self.fatlink.pk), 'abc')
+
+        with self.assertRaises(Retry):
+            capture_fleet.apply(args=(self.fatlink.pk, self.token.pk, 'abc'), throw=True)
+
+    @mock.patch(MODULE_PATH + '.capture_fleet.apply_async')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_stops_with_invalid_token(self, client, apply_async):
+        client.side_effect = TokenExpiredError
+        start_fleet_capture(self.fatlink, self.token)
+        args = apply_async.call_args[0][0]
+        apply_async.reset_mock()
+
+        capture_fleet(*args)
+
+        self.assertFalse(apply_async.called)
+
+    @mock.patch(MODULE_PATH + '.EveType.objects.get_type_names')
+    @mock.patch(MODULE_PATH + '.capture_fleet.apply_async')
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_continues_after_failing_snapshot(self, client, apply_async, get_type_names):
+        client.return_value.Fleets.get_characters_character_id_fleet.return_value\
+            .result.return_value = {'fleet_id': 42}
+        client.return_value.Fleets.get_fleets_fleet_id_members.return_value\
+            .result.return_value = self.members
+        get_type_names.side_effect = HTTPBadGateway(mock.Mock(text=''))
+        start_fleet_capture(self.fatlink, self.token)
+        args = apply_async.call_args[0][0]
+        apply_async.reset_mock()
+
+        capture_fleet(*args)
+
+        self.assertFalse(Fat.objects.filter(fatlink=self.fatlink).exists())
+        apply_async.assert_called_once_with(args=args, countdown=300)
+
+    @mock.patch(MODULE_PATH + '.Token.get_esi_client')
+    def test_capture_fleet_replaced(self, client):
+        cache.set('fat_fleet_capture_{}'.format(self.fatlink.pk), 'newer')
+
+        capture_fleet(self.fatlink.pk, self.token.pk, 'older')
+
+        self.assertFalse(client.called)
+
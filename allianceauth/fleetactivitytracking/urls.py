@@ -26,5 +26,6 @@ urlpatterns = [
         name='user_statistics_month'),
     url(r'^create/$', views.create_fatlink_view, name='create'),
     url(r'^modify/(?P<fat_hash>[a-zA-Z0-9_-]+)/$', views.modify_fatlink_view, name='modify'),
+    url(r'^modify/(?P<fat_hash>[a-zA-Z0-9_-]+)/capture/$', views.capture_fleet_view, name='capture'),
     url(r'^link/(?P<fat_hash>[a-zA-Z0-9]+)/$', views.click_fatlink_view, name='click'),
 ]
@@ -1,6 +1,5 @@
 import datetime
 import logging
-import os
 
 from allianceauth.authentication.models import CharacterOwnership
 from django.contrib import messages
@@ -8,31 +7,20 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from django.db import transaction
 from django.shortcuts import render, redirect, get_object_or_404, Http404
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from esi.decorators import token_required
-from allianceauth.eveonline.providers import provider
 from .forms import FatlinkForm
 from .models import Fatlink, Fat
+from .tasks import resolve_fat, start_fleet_capture
 from django.utils.crypto import get_random_string
 
 from allianceauth.eveonline.models import EveAllianceInfo
 from allianceauth.eveonline.models import EveCharacter
 from allianceauth.eveonline.models import EveCorporationInfo
 
-SWAGGER_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'swagger.json')
-"""
-Swagger spec operations:
-
-get_characters_character_id_location
-get_characters_character_id_ship
-get_universe_systems_system_id
-get_universe_stations_station_id
-get_universe_structures_structure_id
-"""
-
-
 logger = logging.getLogger(__name__)
 
 
@@ -252,34 +240,15 @@ def click_fatlink_view(request, token, fat_hash=None):
         character = EveCharacter.objects.get_character_by_id(token.character_id)
 
         if character:
-            # get data
-            c = token.get_esi_client(spec_file=SWAGGER_SPEC_PATH)
-            location = c.Location.get_characters_character_id_location(character_id=token.character_id).result()
-            ship = c.Location.get_characters_character_id_ship(character_id=token.character_id).result()
-            location['solar_system_name'] = \
-                c.Universe.get_universe_systems_system_id(system_id=location['solar_system_id']).result()[
-                    'name']
-            if location['station_id']:
-                location['station_name'] = \
-                    c.Universe.get_universe_stations_station_id(station_id=location['station_id']).result()['name']
-            elif location['structure_id']:
-                location['station_name'] = \
-                    c.Universe.get_universe_structures_structure_id(structure_id=location['structure_id']).result()[
-                        'name']
-            else:
-                location['station_name'] = "No Station"
-            ship['ship_type_name'] = provider.get_itemtype(ship['ship_type_id']).name
-
+            # location and ship are filled in by a task, so the click is not held up by ESI
             fat = Fat()
-            fat.system = location['solar_system_name']
-            fat.station = location['station_name']
-            fat.shiptype = ship['ship_type_name']
             fat.fatlink = fatlink
             fat.character = character
             fat.user = request.user
             try:
-                fat.full_clean()
+                fat.full_clean(exclude=['system', 'station', 'shiptype'])
                 fat.save()
+                transaction.on_commit(lambda: resolve_fat.delay(fat.pk, token.pk))
                 messages.success(request, _('Fleet participation registered.'))
             except ValidationError as e:
                 err_messages = []
@@ -365,3 +334,22 @@ def modify_fatlink_view(request, fat_hash=None):
     context = {'fatlink': fatlink, 'registered_fats': registered_fats}
 
     return render(request, 'fleetactivitytracking/fatlinkmodify.html', context=context)
+
+
+@login_required
+@permission_required('auth.fleetactivitytracking')
+@token_required(scopes=['esi-fleets.read_fleet.v1'])
+def capture_fleet_view(request, token, fat_hash=None):
+    logger.debug("capture_fleet_view called by user %s" % request.user)
+    fatlink = get_object_or_404(Fatlink, hash=fat_hash)
+
+    if (timezone.now() - fatlink.fatdatetime) < datetime.timedelta(seconds=(fatlink.duration * 60)):
+        start_fleet_capture(fatlink, token)
+        logger.info("User %s started capturing the fleet of %s for fatlink %s" % (
+            request.user, token.character_name, fatlink))
+        messages.success(request, _('Capturing fleet members of %(character)s until the FAT link expires.') % {
+            'character': token.character_name})
+    else:
+        messages.error(request, _('FAT link has expired.'))
+    return redirect('fatlink:modify', fat_hash=fatlink.hash)
+
@@ -57,13 +57,51 @@ class GroupManager:
         :param state: allianceauth.authentication.State object
         :return: bool True if its joinable, False otherwise
         """
-        if (len(group.authgroup.states.all()) != 0 
-            and state not in group.authgroup.states.all()
-        ):
+        states = group.authgroup.states.all()
+        if len(states) != 0 and state not in states:
             return False
         else:
             return not group.authgroup.internal
 
+    @classmethod
+    def get_groups_status_for_user(
+        cls, user: User, groups_qs: QuerySet = None
+    ) -> list:
+        """
+        Compute joinability flags for many groups for a user in bulk.
+        Uses a constant number of queries regardless of the number of groups.
+        :param user: django.contrib.auth.models.User to check the groups for
+        :param groups_qs: Group queryset to check, defaults to all non internal groups
+        :return: list of dicts with the keys group, joinable, hidden, open,
+        is_member, requested and request (the pending GroupRequest or None)
+        """
+        if groups_qs is None:
+            groups_qs = cls.get_all_non_internal_groups()
+
+        groups_qs = groups_qs\
+            .select_related('authgroup')\
+            .prefetch_related('authgroup__states')
+        state = user.profile.state
+        user_group_ids = set(user.groups.values_list('pk', flat=True))
+        group_requests = {
+            group_request.group_id: group_request
+            for group_request in GroupRequest.objects.filter(user=user)
+        }
+        groups = []
+        for group in groups_qs:
+            group_request = group_requests.get(group.pk)
+            groups.append({
+                'group': group,
+                'joinable': cls.joinable_group(group, state),
+                'hidden': group.authgroup.hidden,
+                'open': group.authgroup.open,
+                'is_member': group.pk in user_group_ids,
+                'requested': group_request is not None,
+                'request': group_request,
+            })
+
+        return groups
+
     @staticmethod
     def check_internal_group(group: Group) -> bool:
         """
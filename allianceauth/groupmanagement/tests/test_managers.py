@@ -198,6 +198,35 @@ class TestGroupManager(TestCase):
         ]:
             self.assertFalse(GroupManager.joinable_group(x, guest_state))
 
+    def test_get_groups_status_for_user(self):
+        AuthUtils.assign_state(self.user, AuthUtils.get_guest_state())
+        self.user.groups.add(self.group_open)
+        GroupRequest.objects.create(
+            status='Pending', user=self.user, group=self.group_default
+        )
+        result = {
+            x['group']: x
+            for x in GroupManager.get_groups_status_for_user(self.user)
+        }
+        self.assertNotIn(self.group_internal, result)
+        self.assertTrue(result[self.group_default]['joinable'])
+        self.assertTrue(result[self.group_default]['requested'])
+        self.assertEqual(
+            result[self.group_default]['request'].group, self.group_default
+        )
+        self.assertFalse(result[self.group_default_member]['joinable'])
+        self.assertFalse(result[self.group_default_member]['requested'])
+        self.assertTrue(result[self.group_hidden]['hidden'])
+        self.assertTrue(result[self.group_open]['open'])
+        self.assertTrue(result[self.group_open]['is_member'])
+        self.assertFalse(result[self.group_public_1]['is_member'])
+
+    def test_get_groups_status_for_user_constant_queries(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.profile.state
+        with self.assertNumQueries(4):
+            GroupManager.get_groups_status_for_user(user)
+
     def test_get_all_non_internal_groups(self):
         result = GroupManager.get_all_non_internal_groups()
         expected = {
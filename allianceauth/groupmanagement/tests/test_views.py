@@ -1,5 +1,7 @@
+import json
 from unittest.mock import Mock, patch
 
+from django.contrib.auth.models import Group
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
@@ -19,4 +21,102 @@ class TestViews(TestCase):
         request = self.factory.get(reverse('groupmanagement:groups'))
         request.user = self.user
         response = views.groups_view(request)
-        self.assertEqual(response.status_code, 200)        
\ No newline at end of file
+        self.assertEqual(response.status_code, 200)
+
+
+class TestGroupMembershipList(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='Members Group')
+        cls.group.authgroup.internal = False
+        cls.group.authgroup.save()
+        cls.manager = AuthUtils.create_user('Peter Parker')
+        cls.manager = AuthUtils.add_permission_to_user_by_name(
+            'auth.group_management', cls.manager
+        )
+        cls.members = []
+        for num, name in enumerate(
+            ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo'], start=1
+        ):
+            user = AuthUtils.create_user(name.lower())
+            AuthUtils.add_main_character_2(
+                user,
+                name,
+                1000 + num,
+                corp_name='Corp {}'.format(6 - num),
+                disconnect_signals=True
+            )
+            user.groups.add(cls.group)
+            cls.members.append(user)
+
+        cls.group.authgroup.group_leaders.add(cls.members[1])
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _get_page(self, **params):
+        request = self.factory.get(
+            reverse('groupmanagement:membership_data', args=[self.group.pk]),
+            params
+        )
+        request.user = self.manager
+        response = views.group_membership_list_data(request, self.group.pk)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_list_can_load(self):
+        request = self.factory.get(
+            reverse('groupmanagement:membership', args=[self.group.pk])
+        )
+        request.user = self.manager
+        response = views.group_membership_list(request, self.group.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Charlie', response.content.decode('utf-8'))
+
+    @patch(views.__name__ + '.MEMBERS_PAGE_SIZE', 2)
+    def test_keyset_pagination(self):
+        names = []
+        cursor = None
+        for _ in range(3):
+            params = {'cursor': cursor} if cursor else {}
+            data = self._get_page(**params)
+            names += [x['character_name'] for x in data['members']]
+            cursor = data['next_cursor']
+
+        self.assertIsNone(cursor)
+        self.assertListEqual(
+            names, ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo']
+        )
+
+    @patch(views.__name__ + '.MEMBERS_PAGE_SIZE', 2)
+    def test_keyset_pagination_descending(self):
+        data = self._get_page(order='-corporation')
+        self.assertListEqual(
+            [x['corporation_name'] for x in data['members']],
+            ['Corp 5', 'Corp 4']
+        )
+        data = self._get_page(order='-corporation', cursor=data['next_cursor'])
+        self.assertListEqual(
+            [x['corporation_name'] for x in data['members']],
+            ['Corp 3', 'Corp 2']
+        )
+
+    def test_search(self):
+        data = self._get_page(search='elt')
+        self.assertListEqual(
+            [x['character_name'] for x in data['members']], ['Delta']
+        )
+
+    def test_leader_flags(self):
+        data = self._get_page()
+        leaders = [x['character_name'] for x in data['members'] if x['is_leader']]
+        self.assertListEqual(leaders, ['Bravo'])
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        data = self._get_page(cursor='invalid')
+        self.assertEqual(data['members'][0]['character_name'], 'Alpha')
+
+    def test_invalid_order_falls_back_to_character(self):
+        data = self._get_page(order='password')
+        self.assertEqual(data['order'], 'character')
@@ -19,6 +19,11 @@ urlpatterns = [
         views.group_membership_list,
         name="membership",
     ),
+    url(
+        r"^groupmanagement/membership/(\w+)/data/$",
+        views.group_membership_list_data,
+        name="membership_data",
+    ),
     url(
         r"^groupmanagement/membership/(\w+)/audit-log/$",
         views.group_membership_audit,
@@ -1,3 +1,5 @@
+import base64
+import json
 import logging
 
 from django.conf import settings
@@ -6,8 +8,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.models import Group
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
-from django.db.models import Count
-from django.http import Http404
+from django.db.models import CharField, Count, Q, Value
+from django.db.models.functions import Coalesce
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.translation import ugettext_lazy as _
 
@@ -19,6 +22,18 @@ from .models import GroupRequest, RequestLog
 
 logger = logging.getLogger(__name__)
 
+# max number of members shown per page on the group membership list
+MEMBERS_PAGE_SIZE = getattr(settings, 'GROUPMANAGEMENT_MEMBERS_PAGE_SIZE', 100)
+
+# sortable fields of the group membership list
+MEMBERS_ORDER_FIELDS = {
+    'character': Coalesce('profile__main_character__character_name', 'username'),
+    'corporation': Coalesce(
+        'profile__main_character__corporation_name',
+        Value('', output_field=CharField())
+    ),
+}
+
 
 @login_required
 @user_passes_test(GroupManager.can_manage_groups)
@@ -91,13 +106,10 @@ def group_membership_audit(request, group_id):
     return render(request, 'groupmanagement/audit.html', context=render_items)
 
 
-@login_required
-@user_passes_test(GroupManager.can_manage_groups)
-def group_membership_list(request, group_id):
-    logger.debug(
-        "group_membership_list called by user %s "
-        "for group id %s" % (request.user, group_id)
-    )
+def _get_managed_group_or_deny(request, group_id) -> Group:
+    """returns the group if it is a joinable group the user may manage
+    or raises PermissionDenied / Http404
+    """
     group = get_object_or_404(Group, id=group_id)
     try:
 
@@ -115,21 +127,115 @@ def group_membership_list(request, group_id):
     except ObjectDoesNotExist:
         raise Http404("Group does not exist")
 
-    group_leaders = group.authgroup.group_leaders.all()
-    members = list()
-    for member in \
-        group.user_set\
-            .all()\
-            .select_related('profile', 'profile__main_character')\
-            .order_by('profile__main_character__character_name'):
+    return group
+
 
-        members.append({
+def _encode_members_cursor(sort_value: str, pk: int) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps([sort_value, pk]).encode('utf-8')
+    ).decode('ascii')
+
+
+def _decode_members_cursor(cursor: str) -> tuple:
+    """returns the decoded cursor as (sort_value, pk) or None if invalid"""
+    try:
+        sort_value, pk = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+    if not isinstance(sort_value, str) or not isinstance(pk, int):
+        return None
+
+    return sort_value, pk
+
+
+def _group_members_page(
+    group: Group, search: str = '', order: str = 'character', cursor: str = None
+) -> dict:
+    """returns one page of members for a group
+
+    Members are searched and sorted in the database and paginated with a
+    keyset cursor on (sort value, user id), so the cost of a page does not
+    depend on the size of the group.
+    """
+    descending = order.startswith('-')
+    order_field = order.lstrip('-')
+    if order_field not in MEMBERS_ORDER_FIELDS:
+        order_field = 'character'
+        descending = False
+
+    members_qs = group.user_set\
+        .select_related('profile', 'profile__main_character')\
+        .annotate(sort_value=MEMBERS_ORDER_FIELDS[order_field])
+
+    if search:
+        members_qs = members_qs.filter(
+            Q(username__icontains=search)
+            | Q(profile__main_character__character_name__icontains=search)
+            | Q(profile__main_character__corporation_name__icontains=search)
+            | Q(profile__main_character__alliance_name__icontains=search)
+        )
+
+    cursor_values = _decode_members_cursor(cursor) if cursor else None
+    if cursor_values:
+        sort_value, pk = cursor_values
+        if descending:
+            members_qs = members_qs.filter(
+                Q(sort_value__lt=sort_value) | Q(sort_value=sort_value, pk__lt=pk)
+            )
+        else:
+            members_qs = members_qs.filter(
+                Q(sort_value__gt=sort_value) | Q(sort_value=sort_value, pk__gt=pk)
+            )
+
+    if descending:
+        members_qs = members_qs.order_by('-sort_value', '-pk')
+    else:
+        members_qs = members_qs.order_by('sort_value', 'pk')
+
+    page = list(members_qs[:MEMBERS_PAGE_SIZE + 1])
+    if len(page) > MEMBERS_PAGE_SIZE:
+        page = page[:MEMBERS_PAGE_SIZE]
+        next_cursor = _encode_members_cursor(page[-1].sort_value, page[-1].pk)
+    else:
+        next_cursor = None
+
+    leader_ids = set(
+        group.authgroup.group_leaders.values_list('pk', flat=True)
+    )
+    members = [
+        {
             'user': member,
             'main_char': member.profile.main_character,
-            'is_leader': member in group_leaders
-        })
+            'is_leader': member.pk in leader_ids
+        }
+        for member in page
+    ]
+    return {
+        'members': members,
+        'next_cursor': next_cursor,
+        'search': search,
+        'order': ('-' if descending else '') + order_field,
+    }
 
-    render_items = {'group': group, 'members': members}
+
+@login_required
+@user_passes_test(GroupManager.can_manage_groups)
+def group_membership_list(request, group_id):
+    logger.debug(
+        "group_membership_list called by user %s "
+        "for group id %s" % (request.user, group_id)
+    )
+    group = _get_managed_group_or_deny(request, group_id)
+    render_items = _group_members_page(
+        group,
+        search=request.GET.get('search', '').strip(),
+        order=request.GET.get('order', 'character'),
+        cursor=request.GET.get('cursor'),
+    )
+    render_items['group'] = group
 
     return render(
         request, 'groupmanagement/groupmembers.html',
@@ -137,6 +243,51 @@ def group_membership_list(request, group_id):
     )
 
 
+@login_required
+@user_passes_test(GroupManager.can_manage_groups)
+def group_membership_list_data(request, group_id):
+    logger.debug(
+        "group_membership_list_data called by user %s "
+        "for group id %s" % (request.user, group_id)
+    )
+    group = _get_managed_group_or_deny(request, group_id)
+    page = _group_members_page(
+        group,
+        search=request.GET.get('search', '').strip(),
+        order=request.GET.get('order', 'character'),
+        cursor=request.GET.get('cursor'),
+    )
+    data = {
+        'members': [
+            {
+                'user_id': member['user'].pk,
+                'username': member['user'].username,
+                'character_id': (
+                    member['main_char'].character_id
+                    if member['main_char'] else None
+                ),
+                'character_name': (
+                    member['main_char'].character_name
+                    if member['main_char'] else None
+                ),
+                'corporation_name': (
+                    member['main_char'].corporation_name
+                    if member['main_char'] else None
+                ),
+                'alliance_name': (
+                    member['main_char'].alliance_name
+                    if member['main_char'] else None
+                ),
+                'is_leader': member['is_leader'],
+            }
+            for member in page['members']
+        ],
+        'next_cursor': page['next_cursor'],
+        'order': page['order'],
+    }
+    return JsonResponse(data)
+
+
 @login_required
 @user_passes_test(GroupManager.can_manage_groups)
 def group_membership_remove(request, group_id, user_id):
@@ -317,15 +468,7 @@ def groups_view(request):
         request.user, include_hidden=False
     )
     groups_qs = groups_qs.order_by('name')
-    groups = []
-    for group in groups_qs:
-        group_request = GroupRequest.objects\
-            .filter(user=request.user)\
-            .filter(group=group)
-        groups.append({
-            'group': group,
-            'request': group_request[0] if group_request else None
-        })
+    groups = GroupManager.get_groups_status_for_user(request.user, groups_qs)
 
     context = {'groups': groups}
     return render(request, 'groupmanagement/groups.html', context=context)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HRApplicationsConfig(AppConfig):
     name = 'allianceauth.hrapplications'
     label = 'hrapplications'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,10 +1,59 @@
 from django.contrib.auth.models import User
-from django.db import models
-from typing import Optional
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models, transaction
+from typing import Iterable, Optional, Set
+
+
+# max length of a single search term, must match ApplicationSearchTerm.term
+SEARCH_TERM_MAX_LENGTH = 254
+
+
+def build_search_terms(values: Iterable[str]) -> Set[str]:
+    """Returns the set of search terms for the given values
+
+    Each value is lowercased and indexed starting at each of its words,
+    so that a prefix search matches e.g. both first and last names.
+    """
+    terms = set()
+    for value in values:
+        if not value:
+            continue
+        words = str(value).lower().split()
+        for num in range(len(words)):
+            terms.add(" ".join(words[num:])[:SEARCH_TERM_MAX_LENGTH])
+
+    return terms
+
+
+class ApplicationQuerySet(models.QuerySet):
+
+    def search(self, search_string: str) -> models.QuerySet:
+        """Returns applications matching the search string
+
+        Matches are prefix matches against the search index of each application,
+        which contains the applicant's username and the names, corporations and
+        alliances of the main character and all owned characters.
+        """
+        from .models import ApplicationSearchTerm
+
+        search_string = " ".join(search_string.lower().split())
+        if not search_string:
+            return self.none()
+
+        matching_ids = ApplicationSearchTerm.objects\
+            .filter(term__startswith=search_string[:SEARCH_TERM_MAX_LENGTH])\
+            .values('application_id')
+        return self.filter(pk__in=matching_ids)
 
 
 class ApplicationManager(models.Manager):
 
+    def get_queryset(self):
+        return ApplicationQuerySet(self.model, using=self._db)
+
+    def search(self, search_string: str) -> models.QuerySet:
+        return self.get_queryset().search(search_string)
+
     def pending_requests_count_for_user(self, user: User) -> Optional[int]:
         """Returns the number of pending group requests for the given user"""
         if user.is_superuser:
@@ -23,3 +72,49 @@ class ApplicationManager(models.Manager):
                 return None
         else:
             return None
+
+
+class ApplicationSearchTermManager(models.Manager):
+
+    def update_for_applications(self, applications: models.QuerySet) -> int:
+        """Rebuilds the search index for the given applications
+
+        Returns the number of search terms created
+        """
+        applications = applications\
+            .select_related('user', 'user__profile__main_character')\
+            .prefetch_related('user__character_ownerships__character')
+        search_terms = list()
+        application_ids = list()
+        for application in applications:
+            application_ids.append(application.pk)
+            values = [application.user.username]
+            try:
+                main_character = application.user.profile.main_character
+            except ObjectDoesNotExist:
+                main_character = None
+            characters = [
+                ownership.character
+                for ownership in application.user.character_ownerships.all()
+            ]
+            if main_character:
+                characters.append(main_character)
+            for character in characters:
+                values += [
+                    character.character_name,
+                    character.corporation_name,
+                    character.alliance_name,
+                ]
+            search_terms += [
+                self.model(application_id=application.pk, term=term)
+                for term in build_search_terms(values)
+            ]
+
+        if not application_ids:
+            return 0
+
+        with transaction.atomic():
+            self.filter(application_id__in=application_ids).delete()
+            self.bulk_create(search_terms, batch_size=500)
+
+        return len(search_terms)
@@ -0,0 +1,51 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from allianceauth.hrapplications.managers import build_search_terms
+
+
+def build_search_index(apps, schema_editor):
+    Application = apps.get_model('hrapplications', 'Application')
+    ApplicationSearchTerm = apps.get_model('hrapplications', 'ApplicationSearchTerm')
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+
+    main_characters = {
+        profile.user_id: profile.main_character
+        for profile in UserProfile.objects.select_related('main_character').filter(main_character__isnull=False)
+    }
+    search_terms = []
+    for app in Application.objects.select_related('user').prefetch_related('user__character_ownerships__character'):
+        characters = [o.character for o in app.user.character_ownerships.all()]
+        if app.user_id in main_characters:
+            characters.append(main_characters[app.user_id])
+        values = [app.user.username]
+        for character in characters:
+            values += [character.character_name, character.corporation_name, character.alliance_name]
+        search_terms += [ApplicationSearchTerm(application_id=app.pk, term=term) for term in build_search_terms(values)]
+
+    ApplicationSearchTerm.objects.bulk_create(search_terms, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0017_remove_fleetup_permission'),
+        ('hrapplications', '0007_auto_20200918_1412'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=254)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='hrapplications.application')),
+            ],
+            options={
+                'default_permissions': (),
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop)
+    ]
@@ -4,7 +4,7 @@ from sortedm2m.fields import SortedManyToManyField
 
 from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 
-from .managers import ApplicationManager
+from .managers import ApplicationManager, ApplicationSearchTermManager
 
 
 class ApplicationQuestion(models.Model):
@@ -89,3 +89,17 @@ class ApplicationComment(models.Model):
 
     def __str__(self):
         return str(self.user) + " comment on " + str(self.application)
+
+
+class ApplicationSearchTerm(models.Model):
+    """Denormalized search index entry for an application"""
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=254, db_index=True)
+
+    objects = ApplicationSearchTermManager()
+
+    class Meta:
+        default_permissions = ()
+
+    def __str__(self):
+        return str(self.application) + " Search Term " + self.term
@@ -0,0 +1,67 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from allianceauth.authentication.models import CharacterOwnership, UserProfile
+from allianceauth.eveonline.models import EveCharacter
+
+from .models import Application, ApplicationSearchTerm
+
+
+logger = logging.getLogger(__name__)
+
+
+def update_search_index_for_user(user_id: int):
+    applications = Application.objects.filter(user_id=user_id)
+    if applications.exists():
+        logger.debug("Updating application search index for user %s" % user_id)
+        ApplicationSearchTerm.objects.update_for_applications(applications)
+
+
+@receiver(post_save, sender=Application)
+def update_search_index_on_application_save(sender, instance, **kwargs):
+    ApplicationSearchTerm.objects.update_for_applications(
+        Application.objects.filter(pk=instance.pk)
+    )
+
+
+@receiver(post_save, sender=EveCharacter)
+def update_search_index_on_character_save(sender, instance, created, **kwargs):
+    # new characters are indexed once they are owned by a user
+    if created or not instance.has_changed('character_name', 'corporation_name', 'alliance_name'):
+        return
+
+    applications = Application.objects.filter(
+        Q(user__character_ownerships__character=instance)
+        | Q(user__profile__main_character=instance)
+    ).distinct()
+    if applications.exists():
+        logger.debug(
+            "Updating application search index for character %s" % instance
+        )
+        ApplicationSearchTerm.objects.update_for_applications(applications)
+
+
+@receiver(post_save, sender=CharacterOwnership)
+@receiver(post_delete, sender=CharacterOwnership)
+def update_search_index_on_ownership_change(sender, instance, **kwargs):
+    update_search_index_for_user(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+def update_search_index_on_profile_save(sender, instance, created, **kwargs):
+    if created or not instance.has_changed('main_character'):
+        return
+
+    update_search_index_for_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def update_search_index_on_user_save(sender, instance, update_fields, **kwargs):
+    if update_fields and 'username' not in update_fields:
+        return
+
+    update_search_index_for_user(instance.pk)
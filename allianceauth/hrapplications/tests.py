@@ -1,10 +1,22 @@
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
 
-from allianceauth.eveonline.models import EveCorporationInfo
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.eveonline.models import EveCharacter, EveCorporationInfo
 from allianceauth.tests.auth_utils import AuthUtils
 
-from .models import Application, ApplicationForm, ApplicationQuestion, ApplicationChoice
+from . import views
+from .managers import build_search_terms
+from .models import (
+    Application,
+    ApplicationForm,
+    ApplicationQuestion,
+    ApplicationChoice,
+    ApplicationSearchTerm,
+)
 
 
 class TestApplicationManagersPendingRequestsCountForUser(TestCase):
@@ -101,3 +113,103 @@ class TestApplicationManagersPendingRequestsCountForUser(TestCase):
         self.assertEqual(
             Application.objects.pending_requests_count_for_user(superuser), 2
         )
+
+
+class TestBuildSearchTerms(TestCase):
+
+    def test_terms_start_at_each_word(self):
+        self.assertSetEqual(
+            build_search_terms(['Bruce Wayne', None, 'Wayne Tech']),
+            {'bruce wayne', 'wayne', 'wayne tech', 'tech'}
+        )
+
+
+class TestApplicationSearch(TestCase):
+
+    def setUp(self) -> None:
+        self.corporation = EveCorporationInfo.objects.create(
+            corporation_id=2001, corporation_name="Wayne Tech", member_count=42
+        )
+        self.form = ApplicationForm.objects.create(corp=self.corporation)
+        self.user_requestor = AuthUtils.create_member("peter")
+        AuthUtils.add_main_character_2(
+            self.user_requestor,
+            "Peter Parker",
+            1002,
+            2002,
+            "Daily Bugle",
+            alliance_id=3001,
+            alliance_name="Avengers"
+        )
+        self.application = Application.objects.create(
+            form=self.form, user=self.user_requestor
+        )
+        self.factory = RequestFactory()
+
+    def test_index_built_on_application_save(self):
+        terms = set(
+            ApplicationSearchTerm.objects
+            .filter(application=self.application)
+            .values_list('term', flat=True)
+        )
+        self.assertIn('peter parker', terms)
+        self.assertIn('daily bugle', terms)
+        self.assertIn('avengers', terms)
+        self.assertIn('peter', terms)
+
+    def test_search_by_prefix(self):
+        self.assertIn(self.application, Application.objects.search('park'))
+        self.assertIn(self.application, Application.objects.search('Daily B'))
+        self.assertNotIn(self.application, Application.objects.search('bruce'))
+
+    def test_index_updated_on_new_alt(self):
+        character = EveCharacter.objects.create(
+            character_id=1003,
+            character_name="Spider Man",
+            corporation_id=2003,
+            corporation_name="Web Inc",
+            corporation_ticker="WEB"
+        )
+        CharacterOwnership.objects.create(
+            user=self.user_requestor, character=character, owner_hash='abc123'
+        )
+        self.assertIn(self.application, Application.objects.search('spider'))
+
+    def test_index_updated_on_character_update(self):
+        character = self.user_requestor.profile.main_character
+        character.corporation_name = "Stark Industries"
+        character.save()
+        self.assertIn(self.application, Application.objects.search('stark'))
+        self.assertNotIn(self.application, Application.objects.search('daily'))
+
+    @patch('allianceauth.hrapplications.signals.Application')
+    def test_index_not_queried_on_unrelated_changes(self, mock_application):
+        character = self.user_requestor.profile.main_character
+        character.corporation_ticker = "STARK"
+        character.save()
+        profile = self.user_requestor.profile
+        profile.save()
+        self.user_requestor.save(update_fields=['last_login'])
+        self.assertFalse(mock_application.objects.filter.called)
+
+    def test_index_updated_on_username_change(self):
+        self.user_requestor.username = 'spidey'
+        self.user_requestor.save()
+        self.assertIn(self.application, Application.objects.search('spidey'))
+
+    def test_search_view_returns_distinct_paginated_results(self):
+        superuser = User.objects.create_superuser(
+            "Superman", "superman@example.com", "password"
+        )
+        request = self.factory.get(
+            reverse('hrapplications:search'), {'search_string': 'p'}
+        )
+        request.user = superuser
+        response = views.hr_application_search(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content.decode('utf-8').count(
+                reverse('hrapplications:view', args=[self.application.pk])
+            ),
+            1
+        )
@@ -1,10 +1,11 @@
 import logging
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.decorators import user_passes_test
+from django.core.paginator import Paginator
 from django.shortcuts import render, get_object_or_404, redirect, Http404
-from django.db.models import Q
 from .models import Application
 from .models import ApplicationComment
 from .models import ApplicationForm
@@ -16,6 +17,9 @@ from .forms import HRApplicationSearchForm
 
 logger = logging.getLogger(__name__)
 
+# max number of applications shown per page of search results
+SEARCH_PAGE_SIZE = getattr(settings, 'HRAPPLICATIONS_SEARCH_PAGE_SIZE', 50)
+
 
 def create_application_test(user):
     return bool(user.profile.main_character)
@@ -201,41 +205,43 @@ def hr_application_search(request):
     logger.debug("hr_application_search called by user %s" % request.user)
     if request.method == 'POST':
         form = HRApplicationSearchForm(request.POST)
-        logger.debug("Request type POST contains form valid: %s" % form.is_valid())
-        if form.is_valid():
-            searchstring = form.cleaned_data['search_string'].lower()
-            applications = set([])
-            logger.debug("Searching for application with character name %s for user %s" % (searchstring, request.user))
-            app_list = Application.objects.all()
-            if not request.user.is_superuser:
-                try:
-                    app_list = app_list.filter(
-                        form__corp__corporation_id=request.user.profile.main_character.corporation_id)
-                except AttributeError:
-                    logger.warn(
-                        "User %s missing main character model: unable to filter applications to search" % request.user)
+    elif 'search_string' in request.GET:
+        form = HRApplicationSearchForm(request.GET)
+    else:
+        logger.debug("Returning empty search form for user %s" % request.user)
+        return redirect("hrapplications:index")
 
-            applications = app_list.filter(
-                Q(user__profile__main_character__character_name__icontains=searchstring) |
-                Q(user__profile__main_character__corporation_name__icontains=searchstring) |
-                Q(user__profile__main_character__alliance_name__icontains=searchstring) |
-                Q(user__character_ownerships__character__character_name__icontains=searchstring) |
-                Q(user__character_ownerships__character__corporation_name__icontains=searchstring) |
-                Q(user__character_ownerships__character__alliance_name__icontains=searchstring) |
-                Q(user__username__icontains=searchstring)
-            )
+    logger.debug("Request type %s contains form valid: %s" % (request.method, form.is_valid()))
+    if form.is_valid():
+        searchstring = form.cleaned_data['search_string'].lower()
+        logger.debug("Searching for application with character name %s for user %s" % (searchstring, request.user))
+        app_list = Application.objects.all()
+        if not request.user.is_superuser:
+            try:
+                app_list = app_list.filter(
+                    form__corp__corporation_id=request.user.profile.main_character.corporation_id)
+            except AttributeError:
+                logger.warn(
+                    "User %s missing main character model: unable to filter applications to search" % request.user)
 
-            context = {'applications': applications, 'search_form': HRApplicationSearchForm()}
+        applications = app_list\
+            .search(searchstring)\
+            .select_related('user__profile__main_character', 'form__corp')\
+            .order_by('-created', '-pk')
+        page = Paginator(applications, SEARCH_PAGE_SIZE).get_page(request.GET.get('page'))
 
-            return render(request, 'hrapplications/searchview.html', context=context)
-        else:
-            logger.debug("Form invalid - returning for user %s to retry." % request.user)
-            context = {'applications': None, 'search_form': form}
-            return render(request, 'hrapplications/searchview.html', context=context)
+        context = {
+            'applications': page,
+            'page': page,
+            'search_string': searchstring,
+            'search_form': HRApplicationSearchForm(),
+        }
 
+        return render(request, 'hrapplications/searchview.html', context=context)
     else:
-        logger.debug("Returning empty search form for user %s" % request.user)
-        return redirect("hrapplications:view")
+        logger.debug("Form invalid - returning for user %s to retry." % request.user)
+        context = {'applications': None, 'search_form': form}
+        return render(request, 'hrapplications/searchview.html', context=context)
 
 
 @login_required
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('optimer', '0004_on_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='optimer',
+            index=models.Index(fields=['start'], name='optimer_opt_start_41c924_idx'),
+        ),
+    ]
@@ -1,14 +1,31 @@
 from datetime import datetime
 
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 from allianceauth.eveonline.models import EveCharacter
 
 
+class OpTimerQuerySet(models.QuerySet):
+    def before(self, start, optimer_id=None):
+        """
+        Operations starting before the given cursor, newest first.
+        Ties on start are broken by id so pages never overlap.
+        """
+        if optimer_id is None:
+            query = Q(start__lt=start)
+        else:
+            query = Q(start__lt=start) | Q(start=start, id__lt=optimer_id)
+        return self.filter(query).order_by('-start', '-id')
+
+
 class OpTimer(models.Model):
     class Meta:
         ordering = ['start']
+        indexes = [
+            models.Index(fields=['start']),
+        ]
 
     doctrine = models.CharField(max_length=254, default="")
     system = models.CharField(max_length=254, default="")
@@ -19,5 +36,7 @@ class OpTimer(models.Model):
     post_time = models.DateTimeField(default=timezone.now)
     eve_character = models.ForeignKey(EveCharacter, null=True, on_delete=models.SET_NULL)
 
+    objects = OpTimerQuerySet.as_manager()
+
     def __str__(self):
         return self.operation_name
@@ -1 +1,49 @@
-# Create your tests here.
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from allianceauth.tests.auth_utils import AuthUtils
+
+from .models import OpTimer
+
+
+class OptimerViewsTestCase(TestCase):
+    def setUp(self):
+        self.user = AuthUtils.create_user('test_user')
+        AuthUtils.add_main_character(self.user, 'test character', '1234', '2345', 'test corp', 'testc')
+        AuthUtils.add_permission_to_user_by_name('auth.optimer_view', self.user)
+        self.client.force_login(self.user)
+
+        now = timezone.now()
+        self.future_op = OpTimer.objects.create(operation_name='future', start=now + timedelta(days=1))
+        self.past_op = OpTimer.objects.create(operation_name='past', start=now - timedelta(days=1))
+        self.old_op = OpTimer.objects.create(operation_name='old', start=now - timedelta(days=30))
+
+    def test_optimer_view_window(self):
+        response = self.client.get(reverse('optimer:view'))
+
+        self.assertEqual(list(response.context['future_timers']), [self.future_op])
+        self.assertEqual(list(response.context['past_timers']), [self.past_op])
+        self.assertNotIn(self.old_op, response.context['optimer'])
+        self.assertTrue(response.context['older_timers_url'].startswith(reverse('optimer:data')))
+
+    def test_optimer_data(self):
+        older_op = OpTimer.objects.create(operation_name='older', start=self.old_op.start - timedelta(days=1))
+        url = self.client.get(reverse('optimer:view')).context['older_timers_url']
+
+        pages = []
+        with mock.patch('allianceauth.optimer.views.PAGE_SIZE', 1):
+            while url:
+                data = self.client.get(url).json()
+                pages.append([op['id'] for op in data['timers']])
+                url = data['next']
+
+        self.assertEqual(pages, [[self.old_op.id], [older_op.id]])
+
+    def test_optimer_data_invalid_cursor(self):
+        response = self.client.get(reverse('optimer:data'), {'before': 'yesterday'})
+
+        self.assertEqual(response.status_code, 400)
@@ -6,6 +6,7 @@ app_name = 'optimer'
 
 urlpatterns = [
     url(r'^$', views.optimer_view, name='view'),
+    url(r'^data/$', views.optimer_data, name='data'),
     url(r'^add$', views.add_optimer_view, name='add'),
     url(r'^(\w+)/remove$', views.remove_optimer, name='remove'),
     url(r'^(\w+)/edit$', views.edit_optimer, name='edit'),
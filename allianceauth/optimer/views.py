@@ -1,11 +1,18 @@
+import datetime
 import logging
+from urllib.parse import urlencode
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.decorators import permission_required
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext_lazy as _
 from .form import OpForm
 
@@ -13,21 +20,63 @@ from .models import OpTimer
 
 logger = logging.getLogger(__name__)
 
+PAST_DAYS = getattr(settings, 'OPTIMER_PAST_DAYS', 7)
+PAGE_SIZE = getattr(settings, 'OPTIMER_PAGE_SIZE', 50)
+
+
+def get_optimer_data_url(start, optimer_id=None):
+    params = {'before': start.isoformat()}
+    if optimer_id is not None:
+        params['before_id'] = optimer_id
+    return reverse('optimer:data') + '?' + urlencode(params)
+
 
 @login_required
 @permission_required('auth.optimer_view')
 def optimer_view(request):
     logger.debug("optimer_view called by user %s" % request.user)
+    now = timezone.now()
+    window_start = now - datetime.timedelta(days=PAST_DAYS)
     base_query = OpTimer.objects.select_related('eve_character')
-    render_items = {'optimer': base_query.all(),
+    render_items = {'optimer': base_query.filter(start__gte=window_start),
                     'future_timers': base_query.filter(
-                        start__gte=timezone.now()),
+                        start__gte=now),
                     'past_timers': base_query.filter(
-                        start__lt=timezone.now()).order_by('-start')}
+                        start__gte=window_start).before(now),
+                    'older_timers_url': None}
+    if OpTimer.objects.filter(start__lt=window_start).exists():
+        render_items['older_timers_url'] = get_optimer_data_url(window_start)
 
     return render(request, 'optimer/management.html', context=render_items)
 
 
+@login_required
+@permission_required('auth.optimer_view')
+def optimer_data(request):
+    """
+    Pages of operations older than the cursor given in the query string,
+    so the management page can lazily load history beyond its window.
+    """
+    before = parse_datetime(request.GET.get('before', ''))
+    before_id = request.GET.get('before_id')
+    if before is None or (before_id is not None and not before_id.isdigit()):
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+    if before_id is not None:
+        before_id = int(before_id)
+
+    timers = list(OpTimer.objects.select_related('eve_character').before(before, before_id)[:PAGE_SIZE + 1])
+    next_url = None
+    if len(timers) > PAGE_SIZE:
+        timers = timers[:PAGE_SIZE]
+        next_url = get_optimer_data_url(timers[-1].start, timers[-1].id)
+
+    return JsonResponse({
+        'html': render_to_string('optimer/fleetoprows.html', {'timers': timers}, request=request),
+        'timers': [{'id': op.id, 'start': op.start.isoformat()} for op in timers],
+        'next': next_url,
+    })
+
+
 @login_required
 @permission_required('auth.optimer_management')
 def add_optimer_view(request):
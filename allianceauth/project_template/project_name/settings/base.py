@@ -54,6 +54,10 @@ CELERYBEAT_SCHEDULE = {
     'check_all_character_ownership': {
         'task': 'allianceauth.authentication.tasks.check_all_character_ownership',
         'schedule': crontab(minute=0, hour='*/4'),
+    },
+    'update_admin_status': {
+        'task': 'allianceauth.tasks.update_admin_status',
+        'schedule': crontab(minute='*/5'),
     }
 }
 
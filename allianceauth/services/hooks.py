@@ -1,4 +1,5 @@
 from django.conf.urls import include, url
+from django.db.models import QuerySet
 from django.template.loader import render_to_string
 from django.utils.functional import cached_property
 from django.conf import settings
@@ -46,6 +47,9 @@ class ServicesHook:
         self.urlpatterns = []
         self.service_ctrl_template = 'services/services_ctrl.html'
         self.access_perm = None
+        # only cache the rendered control if it depends on nothing but the service account,
+        # state, main character and superuser status of the user
+        self.cache_services_ctrl = False
 
     @property
     def title(self):
@@ -162,13 +166,44 @@ class UrlHook:
 class NameFormatter:
     DEFAULT_FORMAT = getattr(settings, "DEFAULT_SERVICE_NAME_FORMAT", '[{corp_ticker}] {character_name}')
 
-    def __init__(self, service, user):
+    def __init__(self, service, user, format_configs=None):
         """
         :param service: ServicesHook of the service to generate the name for.
         :param user: django.contrib.auth.models.User to format name for
+        :param format_configs: optional lookup table from get_format_configs()
+        to use instead of querying the config of this user
         """
         self.service = service
         self.user = user
+        self._format_configs = format_configs
+
+    @classmethod
+    def get_format_configs(cls) -> dict:
+        """
+        Load all name format configs in one go
+        :return: dict of NameFormatConfig keyed by (service name, state pk)
+        """
+        format_configs = {}
+        for config in NameFormatConfig.objects.prefetch_related('states').order_by('pk'):
+            for state in config.states.all():
+                format_configs.setdefault((config.service_name, state.pk), config)
+        return format_configs
+
+    @classmethod
+    def format_names(cls, service, users) -> dict:
+        """
+        Generate names for many users of a service without per user queries
+        :param service: ServicesHook of the service to generate the names for.
+        :param users: iterable or queryset of django.contrib.auth.models.User
+        :return: dict of generated names keyed by user pk
+        """
+        if isinstance(users, QuerySet):
+            users = users.select_related('profile__main_character')
+        format_configs = cls.get_format_configs()
+        return {
+            user.pk: cls(service, user, format_configs).format_name()
+            for user in users
+        }
 
     def format_name(self):
         """
@@ -199,6 +234,9 @@ class NameFormatter:
 
     @cached_property
     def formatter_config(self):
+        if self._format_configs is not None:
+            return self._format_configs.get((self.service.name, self.user.profile.state_id))
+
         format_config = NameFormatConfig.objects.filter(service_name=self.service.name,
                                                         states__pk=self.user.profile.state.pk)
 
@@ -15,3 +15,9 @@ DISCORD_TASKS_RETRY_PAUSE = clean_setting('DISCORD_TASKS_RETRY_PAUSE', 60)
 
 # automatically sync Discord users names to user's main character name when created
 DISCORD_SYNC_NAMES = clean_setting('DISCORD_SYNC_NAMES', False)
+
+# max number of users updated by one task during bulk updates
+DISCORD_BULK_CHUNK_SIZE = clean_setting('DISCORD_BULK_CHUNK_SIZE', 50, min_value=1)
+
+# number of tasks updating chunks of users concurrently during bulk updates
+DISCORD_BULK_CONCURRENCY = clean_setting('DISCORD_BULK_CONCURRENCY', 2, min_value=1)
@@ -27,6 +27,7 @@ class DiscordService(ServicesHook):
         self.name = 'discord'
         self.service_ctrl_template = 'services/discord/discord_service_ctrl.html'
         self.access_perm = 'discord.access_discord'
+        self.cache_services_ctrl = True
         self.name_format = '{character_name}'
 
     def delete_user(self, user: User, notify_user: bool = False) -> None:
@@ -1,3 +1,4 @@
 from .client import DiscordClient   # noqa
 from .exceptions import DiscordApiBackoff  # noqa
 from .helpers import DiscordRoles  # noqa
+from .telemetry import DiscordTelemetry  # noqa
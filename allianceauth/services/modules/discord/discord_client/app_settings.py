@@ -43,3 +43,15 @@ DISCORD_ROLES_CACHE_MAX_AGE = clean_setting(
 DISCORD_DISABLE_ROLE_CREATION = clean_setting(
     'DISCORD_DISABLE_ROLE_CREATION', False
 )
+
+# Turns on recording of request counts, latencies, waits and backoffs 
+# of the Discord client in Redis.
+DISCORD_TELEMETRY_ENABLED = clean_setting(
+    'DISCORD_TELEMETRY_ENABLED', True
+)
+
+# How long recorded telemetry is kept in Redis in seconds. 
+# This is also the longest window telemetry can be summarized over.
+DISCORD_TELEMETRY_MAX_AGE = clean_setting(
+    'DISCORD_TELEMETRY_MAX_AGE', 3600 * 24
+)
@@ -1,7 +1,7 @@
 from hashlib import md5
 import json
 import logging
-from time import sleep
+from time import perf_counter, sleep
 from urllib.parse import urljoin
 from uuid import uuid1
 
@@ -25,6 +25,7 @@ from .app_settings import (
 )
 from .exceptions import DiscordRateLimitExhausted, DiscordTooManyRequestsError
 from .helpers import DiscordRoles
+from .telemetry import DiscordTelemetry
 from ..utils import LoggerAddTag
 
 
@@ -79,13 +80,19 @@ class DiscordClient:
     _KEY_GLOBAL_RATE_LIMIT_REMAINING = 'DISCORD_GLOBAL_RATE_LIMIT_REMAINING'
     _KEYPREFIX_GUILD_NAME = 'DISCORD_GUILD_NAME'
     _KEYPREFIX_GUILD_ROLES = 'DISCORD_GUILD_ROLES'
+    _KEYPREFIX_GUILD_ROLES_VERSION = 'DISCORD_GUILD_ROLES_VERSION'
     _KEYPREFIX_ROLE_NAME = 'DISCORD_ROLE_NAME'    
     _NICK_MAX_CHARS = 32
+    _GUILD_MEMBERS_MAX_PAGE_SIZE = 1000
     
     _HTTP_STATUS_CODE_NOT_FOUND = 404
     _HTTP_STATUS_CODE_RATE_LIMITED = 429
     _DISCORD_STATUS_CODE_UNKNOWN_MEMBER = 10007
 
+    # parsed guild roles shared by all clients of this process
+    # as dict of guild ID: (roles version, DiscordRoles)
+    _parsed_guild_roles = dict()
+
     def __init__(
         self, 
         access_token: str, 
@@ -113,6 +120,8 @@ class DiscordClient:
         else:
             self._redis = redis
 
+        self._telemetry = DiscordTelemetry(self._redis)
+
         lua_1 = """
             if redis.call("exists", KEYS[1]) == 0 then
                 redis.call("set", KEYS[1], ARGV[1], 'px', ARGV[2])
@@ -139,6 +148,10 @@ class DiscordClient:
     def is_rate_limited(self):
         return self._is_rate_limited
     
+    @property
+    def telemetry(self) -> DiscordTelemetry:
+        return self._telemetry
+    
     def __repr__(self):
         return f'{type(self).__name__}(access_token=...{self.access_token[-5:]})'
 
@@ -239,8 +252,43 @@ class DiscordClient:
                 value=json.dumps(roles), 
                 ex=DISCORD_ROLES_CACHE_MAX_AGE
             )
+            self._bump_guild_roles_version(guild_id)
         return roles
 
+    def guild_discord_roles(self, guild_id: int, use_cache: bool = True) -> DiscordRoles:
+        """Returns all roles for this guild as DiscordRoles object
+
+        The parsed object is kept in memory and reused by all clients of this
+        process as long as the version of the cached guild roles in Redis 
+        does not change.
+        
+        If use_cache is set to False it will always hit the API to retrieve
+        fresh data and update the cache
+        """
+        # version must be read before the roles, so we never keep newer roles
+        # under an outdated version
+        version_key = self._guild_roles_version_cache_key(guild_id)
+        version = self._redis_decode(self._redis.get(name=version_key))
+        if not version:
+            # no version yet or expired, so start a new one
+            self._redis.set(
+                name=version_key, 
+                value=uuid1().hex, 
+                ex=DISCORD_ROLES_CACHE_MAX_AGE, 
+                nx=True
+            )
+            version = self._redis_decode(self._redis.get(name=version_key))
+        elif use_cache:
+            parsed = self._parsed_guild_roles.get(guild_id)
+            if parsed and parsed[0] == version:
+                logger.debug('Returning parsed roles for guild %s', guild_id)
+                return parsed[1]
+
+        guild_roles = DiscordRoles(self.guild_roles(guild_id, use_cache=use_cache))
+        if version:
+            self._parsed_guild_roles[guild_id] = (version, guild_roles)
+        return guild_roles
+
     def create_guild_role(self, guild_id: int, role_name: str, **kwargs) -> dict:
         """Create a new guild role with the given name. 
         See official documentation for additional optional parameters.
@@ -273,17 +321,32 @@ class DiscordClient:
     def _invalidate_guild_roles_cache(self, guild_id: int) -> None:        
         cache_key = self._guild_roles_cache_key(guild_id)        
         self._redis.delete(cache_key)
+        self._bump_guild_roles_version(guild_id)
         logger.debug('Guild roles cache invalidated')
 
+    def _bump_guild_roles_version(self, guild_id: int) -> None:
+        """Marks parsed guild roles held by any process as outdated"""
+        self._redis.set(
+            name=self._guild_roles_version_cache_key(guild_id), 
+            value=uuid1().hex, 
+            ex=DISCORD_ROLES_CACHE_MAX_AGE
+        )
+
     @classmethod
     def _guild_roles_cache_key(cls, guild_id: int) -> str:
         """Returns key for accessing cached roles for a guild"""
         gen_key = cls._generate_hash(f'{guild_id}')
         return f'{cls._KEYPREFIX_GUILD_ROLES}__{gen_key}'
+
+    @classmethod
+    def _guild_roles_version_cache_key(cls, guild_id: int) -> str:
+        """Returns key for accessing the version of cached roles for a guild"""
+        gen_key = cls._generate_hash(f'{guild_id}')
+        return f'{cls._KEYPREFIX_GUILD_ROLES_VERSION}__{gen_key}'
     
     def match_role_from_name(self, guild_id: int, role_name: str) -> dict:
         """returns Discord role matching the given name or an empty dict"""
-        guild_roles = DiscordRoles(self.guild_roles(guild_id))
+        guild_roles = self.guild_discord_roles(guild_id)
         return guild_roles.role_by_name(role_name)
 
     def match_or_create_roles_from_names(self, guild_id: int, role_names: list) -> list:
@@ -299,14 +362,14 @@ class DiscordClient:
         - role_names: list of name strings each defining a role
         """
         roles = list()
-        guild_roles = DiscordRoles(self.guild_roles(guild_id))
+        guild_roles = self.guild_discord_roles(guild_id)
         role_names_cleaned = {
             DiscordRoles.sanitize_role_name(name) for name in role_names
         }
         for role_name in role_names_cleaned:
             role, created = self.match_or_create_role_from_name(
                 guild_id=guild_id, 
-                role_name=DiscordRoles.sanitize_role_name(role_name),
+                role_name=role_name,
                 guild_roles=guild_roles
             )
             if role:
@@ -337,7 +400,7 @@ class DiscordClient:
 
         created = False        
         if guild_roles is None:
-            guild_roles = DiscordRoles(self.guild_roles(guild_id))
+            guild_roles = self.guild_discord_roles(guild_id)
         role = guild_roles.role_by_name(role_name)
         if not role:
             if not DISCORD_DISABLE_ROLE_CREATION:
@@ -399,6 +462,30 @@ class DiscordClient:
             r.raise_for_status()
             return r.json()
 
+    def guild_members(self, guild_id: int, limit: int = None) -> list:
+        """returns the infos of all members of a guild
+        
+        Members are fetched page by page with one request per page.
+        Requires the server members intent to be enabled for the bot.
+
+        Params:
+        - guild_id: ID of guild
+        - limit: max number of members per page
+        """
+        limit = int(limit) if limit else self._GUILD_MEMBERS_MAX_PAGE_SIZE
+        members = list()
+        after = 0
+        while True:
+            route = f'guilds/{guild_id}/members?limit={limit}&after={after}'
+            r = self._api_request(method='get', route=route)
+            page = r.json()
+            members += page
+            if len(page) < limit:
+                break
+            after = page[-1]['user']['id']
+        
+        return members
+
     def modify_guild_member(
         self, guild_id: int, user_id: int, role_ids: list = None, nick: str = None
     ) -> bool:
@@ -562,7 +649,15 @@ class DiscordClient:
         
         logger.info('%s: sending %s request to url \'%s\'', uid, method.upper(), url)
         logger.debug('%s: request headers: %s', uid, headers)
-        r = getattr(requests, method)(**args)
+        status_code = None
+        started = perf_counter()
+        try:
+            r = getattr(requests, method)(**args)
+            status_code = r.status_code
+        finally:
+            self._telemetry.record_request(
+                method, route, status_code, (perf_counter() - started) * 1000
+            )
         logger.debug(
             '%s: returned status code %d with headers: %s', 
             uid, 
@@ -602,12 +697,16 @@ class DiscordClient:
                     global_backoff_duration
                 )
                 sleep(global_backoff_duration / 1000)
+                self._telemetry.record_wait(
+                    DiscordTelemetry.WAIT_BACKOFF, global_backoff_duration
+                )
             else:
                 logger.info(
                     '%s: Global API backoff still ongoing for %s ms. Re-raising.',
                     uid,
                     global_backoff_duration
                 )
+                self._telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
                 raise DiscordTooManyRequestsError(retry_after=global_backoff_duration)
 
     def _ensure_rate_limed_not_exhausted(self, uid: str) -> int:
@@ -638,6 +737,8 @@ class DiscordClient:
 
             elif resets_in < WAIT_THRESHOLD:                
                 sleep(resets_in / 1000)
+                self._telemetry.record_wait(DiscordTelemetry.WAIT_RATE_LIMIT, resets_in)
+                self._telemetry.record_retry(DiscordTelemetry.RETRY_RATE_LIMIT)
                 logger.debug(
                     '%s: No requests remaining until reset in %d ms. '
                     'Waiting for reset.',
@@ -653,6 +754,9 @@ class DiscordClient:
                     uid, 
                     resets_in
                 )
+                self._telemetry.record_backoff(
+                    DiscordTelemetry.BACKOFF_RATE_LIMIT_EXHAUSTED
+                )
                 raise DiscordRateLimitExhausted(resets_in)
 
         raise RuntimeError('Failed to handle rate limit after after too tries.')
@@ -678,6 +782,7 @@ class DiscordClient:
             uid,
             retry_after
         )
+        self._telemetry.record_backoff(DiscordTelemetry.BACKOFF_TOO_MANY_REQUESTS)
         raise DiscordTooManyRequestsError(retry_after=retry_after)
 
     def _report_rate_limit_from_api(self, r, uid):
@@ -0,0 +1,256 @@
+import logging
+import re
+from time import time
+
+from redis import Redis
+
+from django.core.cache import caches
+
+from .. import __title__
+from .app_settings import DISCORD_TELEMETRY_ENABLED, DISCORD_TELEMETRY_MAX_AGE
+from ..utils import LoggerAddTag
+
+
+logger = LoggerAddTag(logging.getLogger(__name__), __title__)
+
+# Upper bounds of the latency histogram buckets in milliseconds.
+# Requests slower than the last bound are counted as +Inf.
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Duration of the time buckets metrics are aggregated in in seconds
+BUCKET_DURATION = 60
+
+# Duration of the roll-up buckets used to summarize longer windows in seconds
+ROLLUP_DURATION = 3600
+
+# Default rolling windows for summaries in minutes
+SUMMARY_WINDOWS = (5, 60, 60 * 24)
+
+
+class DiscordTelemetry:
+    """Records metrics about the API requests of the Discord client in Redis
+
+    Metrics are aggregated per route in time buckets of one minute
+    and in hourly roll-ups, which both expire after DISCORD_TELEMETRY_MAX_AGE.
+    Recording a metric takes one round trip to Redis and errors are
+    never passed on to the client.
+
+    All durations are in milliseconds.
+    """
+    _KEYPREFIX_TELEMETRY = 'DISCORD_TELEMETRY'
+    _FIELD_SEPARATOR = '|'
+
+    WAIT_BACKOFF = 'backoff'
+    WAIT_RATE_LIMIT = 'rate_limit'
+    BACKOFF_TOO_MANY_REQUESTS = 'too_many_requests'
+    BACKOFF_ONGOING = 'ongoing_backoff'
+    BACKOFF_RATE_LIMIT_EXHAUSTED = 'rate_limit_exhausted'
+    RETRY_RATE_LIMIT = 'rate_limit'
+
+    def __init__(self, redis: Redis, is_enabled: bool = None) -> None:
+        """
+        Params:
+        - redis: Redis instance to be used
+        - is_enabled: Set to False to not record anything,
+        defaults to DISCORD_TELEMETRY_ENABLED
+        """
+        self._redis = redis
+        self._is_enabled = DISCORD_TELEMETRY_ENABLED \
+            if is_enabled is None else bool(is_enabled)
+
+    @classmethod
+    def from_default_cache(cls) -> 'DiscordTelemetry':
+        """returns an instance using the Redis instance
+        from the default Django cache backend
+        """
+        return cls(caches['default'].get_master_client())
+
+    @property
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    @staticmethod
+    def route_template(method: str, route: str) -> str:
+        """returns the route with query and IDs removed,
+        so requests to the same endpoint are counted together
+        """
+        path = re.sub(r'/\d+', '/{id}', str(route).split('?')[0])
+        return f'{method.upper()} {path}'
+
+    def record_request(
+        self, method: str, route: str, status_code: int, latency: float
+    ) -> None:
+        """records a request incl. its latency.
+        Requests without status code or one >= 400 are counted as errors.
+        """
+        route = self.route_template(method, route)
+        latency = int(latency)
+        bound = next(
+            (str(bound) for bound in LATENCY_BUCKETS if latency <= bound), '+Inf'
+        )
+        fields = {
+            self._field('requests', route): 1,
+            self._field('latency_sum', route): latency,
+            self._field('latency', route, bound): 1,
+        }
+        if not status_code or status_code >= 400:
+            fields[self._field('errors', route)] = 1
+
+        self._increment(fields)
+
+    def record_wait(self, reason: str, duration: float) -> None:
+        """records a blocking wait of the client"""
+        self._increment({
+            self._field('waits', reason): 1,
+            self._field('wait_sum', reason): int(duration),
+        })
+
+    def record_backoff(self, reason: str) -> None:
+        """records an API backoff or rate limit exception raised by the client"""
+        self._increment({self._field('backoffs', reason): 1})
+
+    def record_retry(self, reason: str) -> None:
+        """records a retry of the client after a blocking wait"""
+        self._increment({self._field('retries', reason): 1})
+
+    def summary(self, minutes: int) -> dict:
+        """returns all metrics recorded over the last x minutes,
+        incl. the current one
+        """
+        buckets_count = min(
+            int(minutes),
+            max(1, DISCORD_TELEMETRY_MAX_AGE // BUCKET_DURATION)
+        )
+        pipe = self._redis.pipeline(transaction=False)
+        for key in self._summary_keys(buckets_count):
+            pipe.hgetall(key)
+
+        totals = dict()
+        for values in pipe.execute():
+            for field, value in values.items():
+                field = self._redis_decode(field)
+                totals[field] = totals.get(field, 0) + int(value)
+
+        result = {
+            'minutes': buckets_count,
+            'routes': dict(),
+            'waits': dict(),
+            'backoffs': dict(),
+            'retries': dict(),
+        }
+        for field, value in totals.items():
+            metric, name, *extra = field.split(self._FIELD_SEPARATOR)
+            if metric in ('requests', 'errors', 'latency_sum', 'latency'):
+                route = result['routes'].setdefault(
+                    name,
+                    {
+                        'requests': 0,
+                        'errors': 0,
+                        'latency_sum': 0,
+                        'latency_histogram': dict()
+                    }
+                )
+                if metric == 'latency':
+                    route['latency_histogram'][extra[0]] = value
+                else:
+                    route[metric] = value
+
+            elif metric in ('waits', 'wait_sum'):
+                wait = result['waits'].setdefault(
+                    name, {'waits': 0, 'wait_sum': 0}
+                )
+                wait[metric] = value
+
+            elif metric in ('backoffs', 'retries'):
+                result[metric][name] = value
+
+        for route in result['routes'].values():
+            route['latency_avg'] = route['latency_sum'] / route['requests'] \
+                if route['requests'] else 0
+            route['latency_p50'] = self._percentile(route['latency_histogram'], 50)
+            route['latency_p95'] = self._percentile(route['latency_histogram'], 95)
+
+        return result
+
+    def reset(self) -> None:
+        """deletes all recorded metrics"""
+        keys = list(self._redis.scan_iter(match=f'{self._KEYPREFIX_TELEMETRY}__*'))
+        if keys:
+            self._redis.delete(*keys)
+
+    def _summary_keys(self, buckets_count: int) -> list:
+        """returns the keys covering the last x minute buckets,
+        using hourly roll-ups for all hours fully inside that window
+        """
+        last_bucket = self._current_bucket()
+        bucket = last_bucket - (buckets_count - 1) * BUCKET_DURATION
+        keys = list()
+        while bucket <= last_bucket:
+            if (
+                bucket % ROLLUP_DURATION == 0
+                and bucket + ROLLUP_DURATION - BUCKET_DURATION <= last_bucket
+            ):
+                keys.append(self._rollup_key(bucket))
+                bucket += ROLLUP_DURATION
+            else:
+                keys.append(self._bucket_key(bucket))
+                bucket += BUCKET_DURATION
+
+        return keys
+
+    def _increment(self, fields: dict) -> None:
+        if not self._is_enabled:
+            return
+
+        bucket = self._current_bucket()
+        keys = {
+            self._bucket_key(bucket): BUCKET_DURATION,
+            self._rollup_key(bucket - bucket % ROLLUP_DURATION): ROLLUP_DURATION,
+        }
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, duration in keys.items():
+                for field, amount in fields.items():
+                    pipe.hincrby(key, field, amount)
+
+                pipe.expire(key, DISCORD_TELEMETRY_MAX_AGE + duration)
+
+            pipe.execute()
+        except Exception:
+            logger.warning('Failed to record telemetry', exc_info=True)
+
+    @classmethod
+    def _field(cls, *parts) -> str:
+        return cls._FIELD_SEPARATOR.join(str(part) for part in parts)
+
+    @classmethod
+    def _bucket_key(cls, bucket: int) -> str:
+        return f'{cls._KEYPREFIX_TELEMETRY}__{bucket}'
+
+    @classmethod
+    def _rollup_key(cls, bucket: int) -> str:
+        return f'{cls._KEYPREFIX_TELEMETRY}__HOUR__{bucket}'
+
+    @staticmethod
+    def _current_bucket() -> int:
+        now = int(time())
+        return now - now % BUCKET_DURATION
+
+    @staticmethod
+    def _percentile(histogram: dict, percent: int) -> str:
+        """returns the upper bound of the histogram bucket
+        containing the given percentile
+        """
+        total = sum(histogram.values())
+        if not total:
+            return None
+
+        count = 0
+        for bound in [str(bound) for bound in LATENCY_BUCKETS] + ['+Inf']:
+            count += histogram.get(bound, 0)
+            if count * 100 >= total * percent:
+                return bound
+
+    @staticmethod
+    def _redis_decode(value) -> str:
+        return value.decode('utf-8') if isinstance(value, bytes) else value
@@ -231,7 +231,69 @@ class TestGuildRoles(TestCase):
         result = client.guild_roles(TEST_GUILD_ID)
         self.assertEqual(result, expected)
         self.assertFalse(my_mock_redis.set.called)
-    
+
+
+def create_dict_redis():
+    """returns a mock redis client storing values in a dict"""
+    data = dict()
+
+    def my_set(name, value, ex=None, nx=False):
+        if nx and name in data:
+            return None
+        data[name] = str(value).encode('utf8')
+        return True
+
+    return MagicMock(**{
+        'get.side_effect': lambda name: data.get(name),
+        'set.side_effect': my_set,
+        'delete.side_effect': lambda name: data.pop(name, None),
+        'pttl.return_value': -1,
+    })
+
+
+@requests_mock.Mocker()
+class TestGuildDiscordRoles(TestCase):
+
+    def setUp(self):
+        self.url = f'{API_BASE_URL}guilds/{TEST_GUILD_ID}/roles'
+        DiscordClient._parsed_guild_roles.clear()
+        self.my_redis = create_dict_redis()
+        self.client = DiscordClient2(TEST_BOT_TOKEN, self.my_redis)
+
+    def test_reuse_parsed_roles(self, requests_mocker):
+        requests_mocker.get(url=self.url, json=[ROLE_ALPHA, ROLE_BRAVO])
+        self.client.guild_discord_roles(TEST_GUILD_ID)
+        first = self.client.guild_discord_roles(TEST_GUILD_ID)
+        with patch(MODULE_PATH + '.DiscordRoles') as mock_DiscordRoles:
+            second = DiscordClient2(TEST_BOT_TOKEN, self.my_redis)\
+                .guild_discord_roles(TEST_GUILD_ID)
+            self.assertFalse(mock_DiscordRoles.called)
+        self.assertIs(first, second)
+        self.assertEqual(first, DiscordRoles([ROLE_ALPHA, ROLE_BRAVO]))
+        self.assertEqual(requests_mocker.call_count, 1)
+
+    def test_reparse_when_roles_changed(self, requests_mocker):
+        requests_mocker.get(url=self.url, json=[ROLE_ALPHA])
+        requests_mocker.delete(
+            url=f'{self.url}/{ROLE_ALPHA["id"]}', status_code=204
+        )
+        first = self.client.guild_discord_roles(TEST_GUILD_ID)
+        self.client.delete_guild_role(TEST_GUILD_ID, ROLE_ALPHA['id'])
+        requests_mocker.get(url=self.url, json=[ROLE_BRAVO])
+        second = self.client.guild_discord_roles(TEST_GUILD_ID)
+        self.assertEqual(first, DiscordRoles([ROLE_ALPHA]))
+        self.assertEqual(second, DiscordRoles([ROLE_BRAVO]))
+
+    def test_refresh_without_cache(self, requests_mocker):
+        requests_mocker.get(url=self.url, json=[ROLE_ALPHA])
+        self.client.guild_discord_roles(TEST_GUILD_ID)
+        requests_mocker.get(url=self.url, json=[ROLE_ALPHA, ROLE_BRAVO])
+        result = self.client.guild_discord_roles(TEST_GUILD_ID, use_cache=False)
+        self.assertEqual(result, DiscordRoles([ROLE_ALPHA, ROLE_BRAVO]))
+        result = self.client.guild_discord_roles(TEST_GUILD_ID)
+        self.assertEqual(result, DiscordRoles([ROLE_ALPHA, ROLE_BRAVO]))
+        self.assertEqual(requests_mocker.call_count, 2)
+
 
 @requests_mock.Mocker()
 class TestGuildMember(TestCase):
@@ -270,6 +332,41 @@ class TestGuildMember(TestCase):
             self.client.guild_member(TEST_GUILD_ID, TEST_USER_ID)        
         
 
+@requests_mock.Mocker()
+class TestGuildMembers(TestCase):
+   
+    def setUp(self):
+        self.client = DiscordClient2(TEST_BOT_TOKEN, mock_redis)
+        self.headers = DEFAULT_REQUEST_HEADERS
+
+    def test_return_all_members_from_multiple_pages(self, requests_mocker):
+        member_1 = {'user': create_user_info(id=1001), 'nick': None}
+        member_2 = {'user': create_user_info(id=1002), 'nick': None}
+        member_3 = {'user': create_user_info(id=1003), 'nick': None}
+        requests_mocker.get(            
+            f'{API_BASE_URL}guilds/{TEST_GUILD_ID}/members?limit=2&after=0',
+            request_headers=self.headers,
+            json=[member_1, member_2]
+        )        
+        requests_mocker.get(            
+            f'{API_BASE_URL}guilds/{TEST_GUILD_ID}/members?limit=2&after=1002',
+            request_headers=self.headers,
+            json=[member_3]
+        )        
+        result = self.client.guild_members(TEST_GUILD_ID, limit=2)
+        self.assertListEqual(result, [member_1, member_2, member_3])
+        self.assertEqual(requests_mocker.call_count, 2)
+
+    def test_raise_exception_on_error(self, requests_mocker):        
+        requests_mocker.get(            
+            f'{API_BASE_URL}guilds/{TEST_GUILD_ID}/members?limit=1000&after=0',
+            request_headers=self.headers,
+            status_code=500
+        )        
+        with self.assertRaises(HTTPError):
+            self.client.guild_members(TEST_GUILD_ID)        
+
+
 class TestGuildGetName(TestCase):
 
     @patch(MODULE_PATH + '.DiscordClient.guild_infos')    
@@ -0,0 +1,142 @@
+from unittest.mock import patch, MagicMock
+from unittest import TestCase
+
+import requests_mock
+
+from django.core.cache import caches
+
+from . import TEST_BOT_TOKEN, TEST_GUILD_ID, TEST_USER_ID
+from ..client import DiscordClient
+from ..exceptions import DiscordTooManyRequestsError
+from ..telemetry import DiscordTelemetry
+from ...utils import set_logger_to_file
+
+logger = set_logger_to_file(
+    'allianceauth.services.modules.discord.discord_client.telemetry', __file__
+)
+
+MODULE_PATH = 'allianceauth.services.modules.discord.discord_client.telemetry'
+API_BASE_URL = 'https://discord.com/api/'
+
+TEST_NOW = 1600000000
+
+
+@patch(MODULE_PATH + '.time', lambda: TEST_NOW)
+class TestDiscordTelemetry(TestCase):
+
+    def setUp(self):
+        self.redis = caches['default'].get_master_client()
+        self.telemetry = DiscordTelemetry(self.redis, is_enabled=True)
+        self.telemetry.reset()
+
+    def test_route_template_removes_ids_and_query(self):
+        result = DiscordTelemetry.route_template(
+            'get', f'guilds/{TEST_GUILD_ID}/members?limit=1000&after=0'
+        )
+        self.assertEqual(result, 'GET guilds/{id}/members')
+
+    def test_summarize_requests_per_route(self):
+        route = f'guilds/{TEST_GUILD_ID}/members/{TEST_USER_ID}'
+        self.telemetry.record_request('get', route, 200, 40)
+        self.telemetry.record_request('get', route, 200, 110)
+        self.telemetry.record_request('get', route, 404, 3000)
+        self.telemetry.record_request('patch', route, None, 20)
+
+        result = self.telemetry.summary(5)['routes']
+        self.assertSetEqual(
+            set(result.keys()),
+            {'GET guilds/{id}/members/{id}', 'PATCH guilds/{id}/members/{id}'}
+        )
+        route_get = result['GET guilds/{id}/members/{id}']
+        self.assertEqual(route_get['requests'], 3)
+        self.assertEqual(route_get['errors'], 1)
+        self.assertEqual(route_get['latency_avg'], 1050)
+        self.assertDictEqual(
+            route_get['latency_histogram'], {'50': 1, '250': 1, '5000': 1}
+        )
+        self.assertEqual(route_get['latency_p50'], '250')
+        self.assertEqual(route_get['latency_p95'], '5000')
+        self.assertEqual(result['PATCH guilds/{id}/members/{id}']['errors'], 1)
+
+    def test_summarize_waits_backoffs_and_retries(self):
+        self.telemetry.record_wait(DiscordTelemetry.WAIT_RATE_LIMIT, 100)
+        self.telemetry.record_wait(DiscordTelemetry.WAIT_RATE_LIMIT, 150)
+        self.telemetry.record_retry(DiscordTelemetry.RETRY_RATE_LIMIT)
+        self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_TOO_MANY_REQUESTS)
+
+        result = self.telemetry.summary(5)
+        self.assertDictEqual(
+            result['waits'], {'rate_limit': {'waits': 2, 'wait_sum': 250}}
+        )
+        self.assertDictEqual(result['retries'], {'rate_limit': 1})
+        self.assertDictEqual(result['backoffs'], {'too_many_requests': 1})
+
+    def test_summary_only_includes_given_window(self):
+        self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+        with patch(MODULE_PATH + '.time', lambda: TEST_NOW + 600):
+            self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+            self.assertDictEqual(
+                self.telemetry.summary(5)['backoffs'], {'ongoing_backoff': 1}
+            )
+            self.assertDictEqual(
+                self.telemetry.summary(60)['backoffs'], {'ongoing_backoff': 2}
+            )
+
+    def test_summary_uses_hourly_rollups(self):
+        with patch(MODULE_PATH + '.time', lambda: TEST_NOW - 3 * 3600):
+            self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+        self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+
+        self.assertDictEqual(
+            self.telemetry.summary(60 * 24)['backoffs'], {'ongoing_backoff': 2}
+        )
+        self.assertDictEqual(
+            self.telemetry.summary(60)['backoffs'], {'ongoing_backoff': 1}
+        )
+        self.assertLess(len(self.telemetry._summary_keys(60 * 24)), 150)
+
+    def test_reset_deletes_all_metrics(self):
+        self.telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+        self.telemetry.reset()
+        self.assertDictEqual(self.telemetry.summary(5)['backoffs'], {})
+
+    def test_records_nothing_when_disabled(self):
+        telemetry = DiscordTelemetry(self.redis, is_enabled=False)
+        telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+        self.assertDictEqual(self.telemetry.summary(5)['backoffs'], {})
+
+    def test_errors_in_redis_are_not_passed_on(self):
+        my_redis = MagicMock(**{'pipeline.side_effect': RuntimeError})
+        telemetry = DiscordTelemetry(my_redis, is_enabled=True)
+        telemetry.record_backoff(DiscordTelemetry.BACKOFF_ONGOING)
+
+
+@requests_mock.Mocker()
+class TestDiscordClientTelemetry(TestCase):
+
+    def setUp(self):
+        my_redis = MagicMock(**{
+            'get.return_value': None,
+            'pttl.return_value': -1,
+        })
+        self.client = DiscordClient(TEST_BOT_TOKEN, my_redis, is_rate_limited=False)
+        self.client._telemetry = MagicMock(spec=DiscordTelemetry)
+        self.url = f'{API_BASE_URL}guilds/{TEST_GUILD_ID}/members/{TEST_USER_ID}'
+
+    def test_client_records_requests(self, requests_mocker):
+        requests_mocker.get(self.url, json={'user': {}})
+        self.client.guild_member(TEST_GUILD_ID, TEST_USER_ID)
+
+        args, _ = self.client.telemetry.record_request.call_args
+        self.assertEqual(
+            args[:3], ('get', f'guilds/{TEST_GUILD_ID}/members/{TEST_USER_ID}', 200)
+        )
+
+    def test_client_records_new_backoff(self, requests_mocker):
+        requests_mocker.get(self.url, status_code=429, json={'retry_after': 5000})
+        with self.assertRaises(DiscordTooManyRequestsError):
+            self.client.guild_member(TEST_GUILD_ID, TEST_USER_ID)
+
+        self.client.telemetry.record_backoff.assert_called_once_with(
+            DiscordTelemetry.BACKOFF_TOO_MANY_REQUESTS
+        )
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from ...discord_client.telemetry import DiscordTelemetry, SUMMARY_WINDOWS
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarizes requests, latencies, waits and backoffs "
+        "of the Discord client over rolling windows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            nargs='+',
+            default=list(SUMMARY_WINDOWS),
+            help='Rolling windows to summarize in minutes',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete all recorded telemetry',
+        )
+
+    def handle(self, *args, **options):
+        telemetry = DiscordTelemetry.from_default_cache()
+        if options['reset']:
+            telemetry.reset()
+            self.stdout.write(self.style.SUCCESS('Deleted all recorded telemetry.'))
+            return
+
+        for minutes in options['minutes']:
+            self._write_summary(telemetry.summary(minutes))
+
+    def _write_summary(self, summary):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            'Last {} minutes'.format(summary['minutes'])
+        ))
+        if not summary['routes']:
+            self.stdout.write('  No requests recorded.')
+
+        for name, route in sorted(
+            summary['routes'].items(), key=lambda item: -item[1]['requests']
+        ):
+            self.stdout.write(
+                '  {name}: {requests} requests, {errors} errors, '
+                'avg {latency_avg:.0f} ms, p50 <= {latency_p50} ms, '
+                'p95 <= {latency_p95} ms'.format(name=name, **route)
+            )
+
+        for name, wait in sorted(summary['waits'].items()):
+            self.stdout.write(
+                '  Waits for {name}: {waits} totaling {wait_sum} ms'.format(
+                    name=name, **wait
+                )
+            )
+
+        for metric in ('backoffs', 'retries'):
+            for name, count in sorted(summary[metric].items()):
+                self.stdout.write(
+                    '  {} for {}: {}'.format(metric.capitalize(), name, count)
+                )
@@ -34,6 +34,10 @@ class DiscordUserManager(models.Manager):
     # full server admin
     BOT_PERMISSIONS = 0x00000008
 
+    # max number of given users whose usernames are fetched one by one
+    # instead of paging through the member list of the whole server
+    USERNAMES_MEMBER_LOOKUP_MAX = 10
+
     # get user ID, accept invite
     SCOPES = [
         'identify',
@@ -114,6 +118,7 @@ class DiscordUserManager(models.Manager):
                         'uid': user_id, 
                         'username': discord_user['username'][:32], 
                         'discriminator': discord_user['discriminator'][:4],
+                        'nickname': nickname[:32] if nickname else '',
                         'activated': now()
                     }
                 )
@@ -148,6 +153,72 @@ class DiscordUserManager(models.Manager):
         else:
             return None
 
+    def changed_nicknames(self, discord_users_qs: models.QuerySet = None) -> dict:
+        """returns the formatted names of the main characters of all given 
+        Discord users, which differ from the last synced nickname, as dict 
+        keyed by user PK. Names are generated locally without hitting the API.
+        """
+        from .auth_hooks import DiscordService
+
+        if discord_users_qs is None:
+            discord_users_qs = self.all()
+        discord_users = list(
+            discord_users_qs
+            .filter(user__profile__main_character__isnull=False)
+            .select_related('user__profile__main_character')
+        )
+        nicknames = NameFormatter.format_names(
+            DiscordService(), [discord_user.user for discord_user in discord_users]
+        )
+        return {
+            discord_user.user_id: nicknames[discord_user.user_id]
+            for discord_user in discord_users
+            if nicknames[discord_user.user_id][:32] != discord_user.nickname
+        }
+
+    def update_usernames(self, user_pks: list = None) -> set:
+        """updates the usernames of all or the given Discord users 
+        from the member list of the Discord server. Only changed usernames are saved.
+
+        The member list is fetched with one request per 1,000 members, so up to
+        USERNAMES_MEMBER_LOOKUP_MAX given users are looked up one by one instead.
+        
+        Returns the PKs of users which are no longer members of the Discord server
+        """
+        discord_users_qs = self.all() if user_pks is None \
+            else self.filter(user__pk__in=user_pks)
+        discord_users = {
+            discord_user.uid: discord_user for discord_user in discord_users_qs
+        }
+        client = self._bot_client()
+        if user_pks is not None and len(discord_users) <= self.USERNAMES_MEMBER_LOOKUP_MAX:
+            members = [
+                client.guild_member(guild_id=DISCORD_GUILD_ID, user_id=uid)
+                for uid in discord_users.keys()
+            ]
+            members = [member for member in members if member]
+        else:
+            members = client.guild_members(guild_id=DISCORD_GUILD_ID)
+
+        changed = list()
+        for member in members:
+            discord_user = discord_users.pop(int(member['user']['id']), None)
+            if not discord_user:
+                continue
+            username = member['user']['username'][:32]
+            discriminator = member['user']['discriminator'][:4]
+            if (
+                discord_user.username != username 
+                or discord_user.discriminator != discriminator
+            ):
+                discord_user.username = username
+                discord_user.discriminator = discriminator
+                changed.append(discord_user)
+        
+        self.bulk_update(changed, ['username', 'discriminator'], batch_size=500)
+        logger.info('Updated usernames for %d Discord users', len(changed))
+        return {discord_user.user_id for discord_user in discord_users.values()}
+
     @staticmethod
     def user_group_names(user: User, state_name: str = None) -> list:
         """returns list of group names plus state the given user is a member of"""
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-19 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discord', '0003_big_overhaul'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='discorduser',
+            name='nickname',
+            field=models.CharField(blank=True, default='', help_text="user's nickname on Discord as last synced by Auth", max_length=32),
+        ),
+    ]
@@ -10,7 +10,7 @@ from allianceauth.notifications import notify
 
 from . import __title__
 from .app_settings import DISCORD_GUILD_ID
-from .discord_client import DiscordApiBackoff, DiscordRoles
+from .discord_client import DiscordApiBackoff
 from .discord_client.helpers import match_or_create_roles_from_names
 from .managers import DiscordUserManager
 from .utils import LoggerAddTag
@@ -47,6 +47,12 @@ class DiscordUser(models.Model):
         blank=True, 
         help_text='user\'s discriminator on Discord'
     )
+    nickname = models.CharField(
+        max_length=32, 
+        default='', 
+        blank=True, 
+        help_text='user\'s nickname on Discord as last synced by Auth'
+    )
     activated = models.DateTimeField(
         default=None, 
         null=True, 
@@ -88,6 +94,9 @@ class DiscordUser(models.Model):
                 nick=nickname
             )
             if success:
+                # remember what was synced to skip unchanged nicknames in bulk updates
+                self.nickname = nickname[:32]
+                DiscordUser.objects.filter(pk=self.pk).update(nickname=self.nickname)
                 logger.info('Nickname for %s has been updated', self.user)
             else:
                 logger.warning('Failed to update nickname for %s', self.user)
@@ -114,12 +123,12 @@ class DiscordUser(models.Model):
             # User is no longer a member
             return None
         
-        guild_roles = DiscordRoles(client.guild_roles(guild_id=DISCORD_GUILD_ID))
+        guild_roles = client.guild_discord_roles(guild_id=DISCORD_GUILD_ID)
         logger.debug('Current guild roles: %s', guild_roles.ids())
         if 'roles' in member_info:
             if not guild_roles.has_roles(member_info['roles']):
-                guild_roles = DiscordRoles(
-                    client.guild_roles(guild_id=DISCORD_GUILD_ID, use_cache=False)
+                guild_roles = client.guild_discord_roles(
+                    guild_id=DISCORD_GUILD_ID, use_cache=False
                 )
                 if not guild_roles.has_roles(member_info['roles']):
                     raise RuntimeError(
@@ -1,17 +1,24 @@
+import json
 import logging
 from typing import Any
+from uuid import uuid1
 
-from celery import shared_task, chain
+from celery import shared_task
 from requests.exceptions import HTTPError
 
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.db.models.query import QuerySet
 
 from allianceauth.services.tasks import QueueOnce
 
 from . import __title__
 from .app_settings import (
-    DISCORD_TASKS_MAX_RETRIES, DISCORD_TASKS_RETRY_PAUSE, DISCORD_SYNC_NAMES
+    DISCORD_BULK_CHUNK_SIZE,
+    DISCORD_BULK_CONCURRENCY,
+    DISCORD_SYNC_NAMES,
+    DISCORD_TASKS_MAX_RETRIES,
+    DISCORD_TASKS_RETRY_PAUSE,
 )
 from .discord_client import DiscordApiBackoff
 from .models import DiscordUser
@@ -23,6 +30,12 @@ logger = LoggerAddTag(logging.getLogger(__name__), __title__)
 # task priority of bulk tasks
 BULK_TASK_PRIORITY = 6
 
+# How long chunks and progress of bulk runs are kept in Redis in seconds
+BULK_RUN_MAX_AGE = 3600 * 24
+
+_KEYPREFIX_BULK_RUN_CHUNKS = 'DISCORD_BULK_RUN_CHUNKS'
+_KEYPREFIX_BULK_RUN_PROGRESS = 'DISCORD_BULK_RUN_PROGRESS'
+
 
 @shared_task(
     bind=True, name='discord.update_groups', base=QueueOnce, max_retries=None
@@ -152,11 +165,8 @@ def _bulk_update_groups_for_users(discord_users_qs: QuerySet) -> None:
     logger.info(
         "Starting to bulk update discord roles for %d users", discord_users_qs.count()
     )
-    update_groups_chain = list()
-    for discord_user in discord_users_qs:
-        update_groups_chain.append(update_groups.si(discord_user.user.pk))
-    
-    chain(update_groups_chain).apply_async(priority=BULK_TASK_PRIORITY)
+    user_pks = discord_users_qs.values_list('user__pk', flat=True)
+    _start_bulk_run('update_groups', [(user_pk, {}) for user_pk in user_pks])
 
 
 @shared_task(name='discord.update_all_nicknames')
@@ -176,15 +186,207 @@ def update_nicknames_bulk(user_pks: list) -> None:
 
 
 def _bulk_update_nicknames_for_users(discord_users_qs: QuerySet) -> None:
+    nicknames = DiscordUser.objects.changed_nicknames(discord_users_qs)
     logger.info(
-        "Starting to bulk update discord nicknames for %d users", 
+        "Starting to bulk update discord nicknames for %d of %d users", 
+        len(nicknames),
         discord_users_qs.count()
     )
-    update_nicknames_chain = list()
-    for discord_user in discord_users_qs:
-        update_nicknames_chain.append(update_nickname.si(discord_user.user.pk))
+    _start_bulk_run(
+        'update_nickname', 
+        [
+            (user_pk, {'nickname': nickname}) 
+            for user_pk, nickname in nicknames.items()
+        ]
+    )
+
+
+def _start_bulk_run(method: str, items: list) -> str:
+    """Starts a bulk run, which calls a method of DiscordUser for many users
+    
+    Users are split into chunks, which are queued in Redis and processed by 
+    up to DISCORD_BULK_CONCURRENCY tasks in parallel. So task payloads stay 
+    small no matter how many users there are. All tasks share the rate limit 
+    and backoffs of the Discord client.
+
+    Params:
+    - method: name of the DiscordUser method to call
+    - items: list of user PK and kwargs for the method for every user
+
+    Returns the ID of the new run or None if there was nothing to do
+    """
+    if not items:
+        return None
     
-    chain(update_nicknames_chain).apply_async(priority=BULK_TASK_PRIORITY)
+    run_id = uuid1().hex
+    chunks = [
+        json.dumps({'items': items[i:i + DISCORD_BULK_CHUNK_SIZE], 'attempt': 0})
+        for i in range(0, len(items), DISCORD_BULK_CHUNK_SIZE)
+    ]
+    chunks_key, progress_key = _bulk_run_keys(run_id)
+    pipe = _redis().pipeline()
+    pipe.rpush(chunks_key, *chunks)
+    pipe.hset(progress_key, 'total', len(items))
+    pipe.hset(progress_key, 'done', 0)
+    pipe.hset(progress_key, 'failed', 0)
+    pipe.expire(chunks_key, BULK_RUN_MAX_AGE)
+    pipe.expire(progress_key, BULK_RUN_MAX_AGE)
+    pipe.execute()
+    logger.info(
+        'Starting bulk run %s for %s with %d users in %d chunks', 
+        run_id,
+        method,
+        len(items), 
+        len(chunks)
+    )
+    for _ in range(min(DISCORD_BULK_CONCURRENCY, len(chunks))):
+        process_bulk_run.apply_async(
+            args=[run_id, method], priority=BULK_TASK_PRIORITY
+        )
+
+    return run_id
+
+
+@shared_task(bind=True, name='discord.process_bulk_run', max_retries=None)
+def process_bulk_run(self, run_id: str, method: str) -> None:
+    """Processes the next chunk of users of a bulk run 
+    and then starts over until no chunks are left.
+
+    Chunks interrupted by an API backoff are put back and continued by 
+    whichever task gets to them first after the backoff. Users failing with 
+    HTTP errors are put back as a new chunk and retried after a pause.
+    """
+    redis = _redis()
+    chunks_key, _ = _bulk_run_keys(run_id)
+    chunk = redis.lpop(chunks_key)
+    if chunk is None:
+        return
+
+    chunk = json.loads(chunk)
+    items, attempt = chunk['items'], chunk['attempt']
+    discord_users = {
+        discord_user.user_id: discord_user 
+        for discord_user in DiscordUser.objects
+        .filter(user__pk__in=[user_pk for user_pk, _ in items])
+        .select_related('user')
+    }
+    done, failed, retry_items = 0, 0, list()
+    for num, (user_pk, kwargs) in enumerate(items):
+        discord_user = discord_users.get(user_pk)
+        if not discord_user:
+            logger.debug(
+                'User with pk %s does not have a discord account, skipping %s', 
+                user_pk, 
+                method
+            )
+            done += 1
+            continue
+        
+        try:
+            success = getattr(discord_user, method)(**kwargs)
+        
+        except DiscordApiBackoff as bo:
+            logger.info(
+                "API back off for bulk run %s due to %r, retrying in %s seconds",
+                run_id,
+                bo,
+                bo.retry_after_seconds
+            )
+            redis.lpush(
+                chunks_key, json.dumps({'items': items[num:], 'attempt': attempt})
+            )
+            if retry_items:
+                redis.rpush(
+                    chunks_key,
+                    json.dumps({'items': retry_items, 'attempt': attempt + 1})
+                )
+            _report_bulk_run_progress(run_id, method, done, failed)
+            raise self.retry(countdown=bo.retry_after_seconds)
+
+        except (HTTPError, ConnectionError):
+            if attempt < DISCORD_TASKS_MAX_RETRIES:
+                logger.warning(
+                    '%s failed for user %s', method, discord_user.user, exc_info=True
+                )
+                retry_items.append((user_pk, kwargs))
+            else:
+                logger.error(
+                    '%s failed for user %s after max retries',
+                    method,
+                    discord_user.user,
+                    exc_info=True
+                )
+                failed += 1
+
+        except Exception:
+            logger.error(
+                '%s for user %s failed due to unexpected exception',
+                method,
+                discord_user.user,
+                exc_info=True
+            )
+            failed += 1
+
+        else:
+            done += 1
+            if success is None and method != 'delete_user':
+                delete_user.delay(user_pk, notify_user=True)
+
+    _report_bulk_run_progress(run_id, method, done, failed)
+    if retry_items:
+        logger.warning(
+            'Bulk run %s: %s failed for %d users, retrying in %d secs', 
+            run_id,
+            method,
+            len(retry_items),
+            DISCORD_TASKS_RETRY_PAUSE,
+        )
+        redis.rpush(
+            chunks_key, json.dumps({'items': retry_items, 'attempt': attempt + 1})
+        )
+        raise self.retry(countdown=DISCORD_TASKS_RETRY_PAUSE)
+
+    process_bulk_run.apply_async(args=[run_id, method], priority=BULK_TASK_PRIORITY)
+
+
+def _report_bulk_run_progress(run_id: str, method: str, done: int, failed: int):
+    _, progress_key = _bulk_run_keys(run_id)
+    pipe = _redis().pipeline()
+    pipe.hincrby(progress_key, 'done', done)
+    pipe.hincrby(progress_key, 'failed', failed)
+    pipe.hget(progress_key, 'total')
+    total_done, total_failed, total = pipe.execute()
+    logger.info(
+        'Bulk run %s for %s: %d of %d users processed, %d failed',
+        run_id,
+        method,
+        total_done + total_failed,
+        int(total),
+        total_failed
+    )
+
+
+def bulk_run_progress(run_id: str) -> dict:
+    """returns the number of total, done and failed users of a bulk run
+    or None if the run is not known
+    """
+    _, progress_key = _bulk_run_keys(run_id)
+    progress = _redis().hgetall(progress_key)
+    if not progress:
+        return None
+    
+    return {key.decode('utf-8'): int(value) for key, value in progress.items()}
+
+
+def _bulk_run_keys(run_id: str) -> tuple:
+    return (
+        f'{_KEYPREFIX_BULK_RUN_CHUNKS}__{run_id}', 
+        f'{_KEYPREFIX_BULK_RUN_PROGRESS}__{run_id}'
+    )
+
+
+def _redis():
+    return caches['default'].get_master_client()
 
 
 def _task_perform_users_action(self, method: str, **kwargs) -> Any:   
@@ -233,49 +435,55 @@ def update_servername(self) -> None:
     _task_perform_users_action(self, method="server_name", use_cache=False)
 
 
+@shared_task(
+    bind=True, 
+    name='discord.update_usernames_from_server', 
+    base=QueueOnce, 
+    max_retries=None
+)
+def update_usernames_from_server(self, user_pks: list = None) -> None:
+    """Update locally stored Discord usernames for all or the given users 
+    from the member list of the Discord server.
+    Users who are no longer members of the Discord server are deleted.
+
+    Paging through the member list takes one request per 1,000 members,
+    so a few given users are looked up one by one instead.
+
+    Params:
+    - user_pks: optional list of PKs of users to update
+    """
+    missing_user_pks = _task_perform_users_action(
+        self, method='update_usernames', user_pks=user_pks
+    )
+    for user_pk in missing_user_pks or []:
+        delete_user.delay(user_pk, notify_user=True)
+
+
 @shared_task(name='discord.update_all_usernames')
 def update_all_usernames() -> None:
     """Update all usernames for all known users with a Discord account. 
     Also updates the server name
     """
     update_servername.delay()
-    discord_users_qs = DiscordUser.objects.all()
-    _bulk_update_usernames_for_users(discord_users_qs)
+    update_usernames_from_server.apply_async(priority=BULK_TASK_PRIORITY)
     
 
 @shared_task(name='discord.update_usernames_bulk')
 def update_usernames_bulk(user_pks: list) -> None:
     """Update usernames for list of users with a Discord account in bulk."""    
-    discord_users_qs = DiscordUser.objects\
-        .filter(user__pk__in=user_pks)\
-        .select_related()
-    _bulk_update_usernames_for_users(discord_users_qs)
-
-
-def _bulk_update_usernames_for_users(discord_users_qs: QuerySet) -> None:
-    logger.info(
-        "Starting to bulk update discord usernames for %d users", 
-        discord_users_qs.count()
+    update_usernames_from_server.apply_async(
+        kwargs={'user_pks': user_pks}, priority=BULK_TASK_PRIORITY
     )
-    update_usernames_chain = list()
-    for discord_user in discord_users_qs:
-        update_usernames_chain.append(update_username.si(discord_user.user.pk))
-    
-    chain(update_usernames_chain).apply_async(priority=BULK_TASK_PRIORITY)
 
 
 @shared_task(name='discord.update_all')
 def update_all() -> None:
-    """Updates groups and nicknames (when activated) for all users."""
+    """Updates groups, usernames and nicknames (when activated) for all users."""
     discord_users_qs = DiscordUser.objects.all()
     logger.info(
         'Starting to bulk update all for %s Discord users', discord_users_qs.count()
     )
-    update_all_chain = list()
-    for discord_user in discord_users_qs:
-        update_all_chain.append(update_groups.si(discord_user.user.pk))
-        update_all_chain.append(update_username.si(discord_user.user.pk))
-        if DISCORD_SYNC_NAMES:
-            update_all_chain.append(update_nickname.si(discord_user.user.pk))
-        
-    chain(update_all_chain).apply_async(priority=BULK_TASK_PRIORITY)
+    _bulk_update_groups_for_users(discord_users_qs)
+    update_usernames_from_server.apply_async(priority=BULK_TASK_PRIORITY)
+    if DISCORD_SYNC_NAMES:
+        _bulk_update_nicknames_for_users(discord_users_qs)
@@ -0,0 +1,25 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..discord_client import DiscordTelemetry
+
+
+class TestDiscordTelemetryCommand(TestCase):
+
+    def setUp(self):
+        self.telemetry = DiscordTelemetry.from_default_cache()
+        self.telemetry.reset()
+        self.stdout = StringIO()
+
+    def test_summarize_telemetry(self):
+        self.telemetry.record_request('get', 'guilds/123/roles', 200, 80)
+        call_command('discord_telemetry', '--minutes', '5', stdout=self.stdout)
+        self.assertIn('Last 5 minutes', self.stdout.getvalue())
+        self.assertIn('GET guilds/{id}/roles: 1 requests', self.stdout.getvalue())
+
+    def test_reset_telemetry(self):
+        self.telemetry.record_request('get', 'guilds/123/roles', 200, 80)
+        call_command('discord_telemetry', '--reset', stdout=self.stdout)
+        self.assertDictEqual(self.telemetry.summary(5)['routes'], {})
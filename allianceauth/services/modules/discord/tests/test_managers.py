@@ -19,7 +19,7 @@ from . import (
     ROLE_BRAVO,
     ROLE_CHARLIE, 
 )
-from ..discord_client.tests import create_matched_role
+from ..discord_client.tests import create_matched_role, create_user_info
 from ..app_settings import (
     DISCORD_APP_ID, 
     DISCORD_APP_SECRET,     
@@ -453,6 +453,94 @@ class TestUserHasAccount(TestCase):
         self.assertFalse(DiscordUser.objects.user_has_account('abc'))
 
 
+class TestChangedNicknames(TestCase):
+
+    def setUp(self):
+        self.user = AuthUtils.create_user(TEST_USER_NAME)
+        AuthUtils.add_main_character_2(self.user, TEST_MAIN_NAME, TEST_MAIN_ID)
+
+    def test_return_nickname_if_not_yet_synced(self):
+        DiscordUser.objects.create(user=self.user, uid=TEST_USER_ID)
+        result = DiscordUser.objects.changed_nicknames()
+        self.assertDictEqual(result, {self.user.pk: TEST_MAIN_NAME})
+
+    def test_skip_nickname_if_already_synced(self):
+        DiscordUser.objects.create(
+            user=self.user, uid=TEST_USER_ID, nickname=TEST_MAIN_NAME
+        )
+        result = DiscordUser.objects.changed_nicknames()
+        self.assertDictEqual(result, {})
+
+    def test_skip_users_without_main(self):
+        user = AuthUtils.create_user('Bruce Wayne')
+        DiscordUser.objects.create(user=user, uid=987)
+        result = DiscordUser.objects.changed_nicknames()
+        self.assertNotIn(user.pk, result)
+
+    def test_only_consider_given_users(self):
+        DiscordUser.objects.create(user=self.user, uid=TEST_USER_ID)
+        result = DiscordUser.objects.changed_nicknames(
+            DiscordUser.objects.exclude(user=self.user)
+        )
+        self.assertDictEqual(result, {})
+
+
+@patch(MODULE_PATH + '.managers.DiscordClient', spec=DiscordClient)
+class TestUpdateUsernames(TestCase):
+
+    def setUp(self):
+        self.user_1 = AuthUtils.create_user('Peter Parker')
+        self.user_2 = AuthUtils.create_user('Bruce Wayne')
+        self.discord_user_1 = DiscordUser.objects.create(
+            user=self.user_1, uid=1001, username='Spidey', discriminator='1234'
+        )
+        self.discord_user_2 = DiscordUser.objects.create(
+            user=self.user_2, uid=1002, username='Batman', discriminator='5678'
+        )
+
+    def test_update_changed_usernames(self, mock_DiscordClient):
+        mock_DiscordClient.return_value.guild_members.return_value = [
+            {'user': create_user_info(1001, 'Spiderman', '4321')},
+            {'user': create_user_info(1002, 'Batman', '5678')},
+            {'user': create_user_info(1003, 'Superman', '0001')},
+        ]
+        result = DiscordUser.objects.update_usernames()
+        self.assertSetEqual(result, set())
+        self.discord_user_1.refresh_from_db()
+        self.assertEqual(self.discord_user_1.username, 'Spiderman')
+        self.assertEqual(self.discord_user_1.discriminator, '4321')
+        self.discord_user_2.refresh_from_db()
+        self.assertEqual(self.discord_user_2.username, 'Batman')
+
+    def test_return_users_no_longer_on_server(self, mock_DiscordClient):
+        mock_DiscordClient.return_value.guild_members.return_value = [
+            {'user': create_user_info(1001, 'Spidey', '1234')},
+        ]
+        result = DiscordUser.objects.update_usernames()
+        self.assertSetEqual(result, {self.user_2.pk})
+
+    @patch(MODULE_PATH + '.managers.DiscordUserManager.USERNAMES_MEMBER_LOOKUP_MAX', 0)
+    def test_only_consider_given_users(self, mock_DiscordClient):
+        mock_DiscordClient.return_value.guild_members.return_value = [
+            {'user': create_user_info(1002, 'Batmobile', '5678')},
+        ]
+        result = DiscordUser.objects.update_usernames([self.user_1.pk])
+        self.assertSetEqual(result, {self.user_1.pk})
+        self.discord_user_2.refresh_from_db()
+        self.assertEqual(self.discord_user_2.username, 'Batman')
+
+    def test_look_up_few_given_users_one_by_one(self, mock_DiscordClient):
+        mock_DiscordClient.return_value.guild_member.side_effect = lambda guild_id, user_id: {
+            1001: None,
+            1002: {'user': create_user_info(1002, 'Batmobile', '5678')},
+        }[user_id]
+        result = DiscordUser.objects.update_usernames([self.user_1.pk, self.user_2.pk])
+        self.assertSetEqual(result, {self.user_1.pk})
+        self.assertFalse(mock_DiscordClient.return_value.guild_members.called)
+        self.discord_user_2.refresh_from_db()
+        self.assertEqual(self.discord_user_2.username, 'Batmobile')
+
+
 @patch(MODULE_PATH + '.managers.DiscordClient', spec=DiscordClient)
 @patch(MODULE_PATH + '.managers.logger')
 class TestServerName(TestCase):
@@ -17,7 +17,7 @@ from . import (
     ROLE_CHARLIE, 
     ROLE_MIKE    
 )
-from ..discord_client import DiscordClient, DiscordApiBackoff
+from ..discord_client import DiscordClient, DiscordApiBackoff, DiscordRoles
 from ..discord_client.tests import create_matched_role
 from ..models import DiscordUser
 from ..utils import set_logger_to_file
@@ -283,7 +283,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
@@ -303,7 +304,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
@@ -323,7 +325,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
                 
@@ -340,7 +343,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
@@ -371,7 +375,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = False
@@ -389,7 +394,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
@@ -404,21 +410,23 @@ class TestUpdateGroups(TestCase):
     ):                
         def my_guild_roles(guild_id, use_cache=True):
             if use_cache:
-                return [ROLE_ALPHA, ROLE_BRAVO, ROLE_MIKE]
+                return DiscordRoles([ROLE_ALPHA, ROLE_BRAVO, ROLE_MIKE])
             else:
-                return [ROLE_ALPHA, ROLE_BRAVO, ROLE_CHARLIE, ROLE_MIKE]
+                return DiscordRoles([ROLE_ALPHA, ROLE_BRAVO, ROLE_CHARLIE, ROLE_MIKE])
         
         roles_current = [3]
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.side_effect = my_guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.side_effect = my_guild_roles
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'roles': roles_current}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
         result = self.discord_user.update_groups()
         self.assertTrue(result)
-        self.assertEqual(mock_DiscordClient.return_value.guild_roles.call_count, 2)
+        self.assertEqual(
+            mock_DiscordClient.return_value.guild_discord_roles.call_count, 2
+        )
 
     def test_raise_exception_if_member_info_is_invalid(
         self, 
@@ -428,7 +436,8 @@ class TestUpdateGroups(TestCase):
         mock_user_group_names.return_value = []
         mock_DiscordClient.return_value.match_or_create_roles_from_names\
             .return_value = self.roles_requested
-        mock_DiscordClient.return_value.guild_roles.return_value = self.guild_roles
+        mock_DiscordClient.return_value.guild_discord_roles.return_value = \
+            DiscordRoles(self.guild_roles)
         mock_DiscordClient.return_value.guild_member.return_value = \
             {'user': 'dummy'}
         mock_DiscordClient.return_value.modify_guild_member.return_value = True
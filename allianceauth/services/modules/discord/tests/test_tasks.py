@@ -309,137 +309,295 @@ class TestBulkTasks(TestCase):
         cls.user_1 = AuthUtils.create_user('Peter Parker')
         cls.user_2 = AuthUtils.create_user('Kara Danvers')
         cls.user_3 = AuthUtils.create_user('Clark Kent')
+        for num, user in enumerate([cls.user_1, cls.user_2, cls.user_3], start=1):
+            AuthUtils.add_main_character_2(user, user.username, 1000 + num)
         DiscordUser.objects.all().delete()
 
-    @patch(MODULE_PATH + '.update_groups.si')
-    def test_can_update_groups_for_multiple_users(self, mock_update_groups):
+    @staticmethod
+    def _bulk_run_pks(mock_start_bulk_run, method: str) -> set:
+        """returns PKs of all users the given method has been started for"""
+        return {
+            user_pk 
+            for args, _ in mock_start_bulk_run.call_args_list if args[0] == method
+            for user_pk, _ in args[1]
+        }
+
+    @patch(MODULE_PATH + '._start_bulk_run')
+    def test_can_update_groups_for_multiple_users(self, mock_start_bulk_run):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
         du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
         DiscordUser.objects.create(user=self.user_3, uid=789)
         expected_pks = [du_1.pk, du_2.pk]
 
         tasks.update_groups_bulk(expected_pks)
-        self.assertEqual(mock_update_groups.call_count, 2)
-        current_pks = [args[0][0] for args in mock_update_groups.call_args_list]
-        
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_groups'), 
+            set(expected_pks)
+        )
 
-    @patch(MODULE_PATH + '.update_groups.si')
-    def test_can_update_all_groups(self, mock_update_groups):
+    @patch(MODULE_PATH + '._start_bulk_run')
+    def test_can_update_all_groups(self, mock_start_bulk_run):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
         du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
         du_3 = DiscordUser.objects.create(user=self.user_3, uid=789)
 
         tasks.update_all_groups()
-        self.assertEqual(mock_update_groups.call_count, 3)
-        current_pks = [args[0][0] for args in mock_update_groups.call_args_list]
         expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_groups'), 
+            set(expected_pks)
+        )
 
-    @patch(MODULE_PATH + '.update_nickname.si')
-    def test_can_update_nicknames_for_multiple_users(self, mock_update_nickname):
+    @patch(MODULE_PATH + '._start_bulk_run')
+    def test_can_update_nicknames_for_multiple_users(self, mock_start_bulk_run):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
-        du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
+        du_2 = DiscordUser.objects.create(
+            user=self.user_2, 
+            uid=456, 
+            nickname=DiscordUser.objects.user_formatted_nick(self.user_2)
+        )
         DiscordUser.objects.create(user=self.user_3, uid=789)
-        expected_pks = [du_1.pk, du_2.pk]
 
-        tasks.update_nicknames_bulk(expected_pks)
-        self.assertEqual(mock_update_nickname.call_count, 2)
-        current_pks = [
-            args[0][0] for args in mock_update_nickname.call_args_list
-        ]        
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        tasks.update_nicknames_bulk([du_1.pk, du_2.pk])
+        mock_start_bulk_run.assert_called_once_with(
+            'update_nickname', 
+            [
+                (
+                    du_1.pk, 
+                    {'nickname': DiscordUser.objects.user_formatted_nick(self.user_1)}
+                )
+            ]
+        )
 
-    @patch(MODULE_PATH + '.update_nickname.si')
-    def test_can_update_nicknames_for_all_users(self, mock_update_nickname):
+    @patch(MODULE_PATH + '._start_bulk_run')
+    def test_can_update_nicknames_for_all_users(self, mock_start_bulk_run):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid='123')
         du_2 = DiscordUser.objects.create(user=self.user_2, uid='456')
         du_3 = DiscordUser.objects.create(user=self.user_3, uid='789')
 
         tasks.update_all_nicknames()
-        self.assertEqual(mock_update_nickname.call_count, 3)
-        current_pks = [
-            args[0][0] for args in mock_update_nickname.call_args_list
-        ]
         expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_nickname'), 
+            set(expected_pks)
+        )
 
-    @patch(MODULE_PATH + '.update_username.si')
-    def test_can_update_username_for_multiple_users(self, mock_update_username):
+    @patch(MODULE_PATH + '._start_bulk_run')
+    def test_dont_update_nicknames_for_users_without_main(self, mock_start_bulk_run):
+        user = AuthUtils.create_user('Bruce Wayne')
+        DiscordUser.objects.create(user=user, uid=987)
+
+        tasks.update_all_nicknames()
+        self.assertNotIn(
+            user.pk, self._bulk_run_pks(mock_start_bulk_run, 'update_nickname')
+        )
+
+    @patch(MODULE_PATH + '.update_usernames_from_server')
+    def test_can_update_username_for_multiple_users(self, mock_update_usernames):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
         du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
         DiscordUser.objects.create(user=self.user_3, uid=789)
         expected_pks = [du_1.pk, du_2.pk]
 
         tasks.update_usernames_bulk(expected_pks)
-        self.assertEqual(mock_update_username.call_count, 2)
-        current_pks = [args[0][0] for args in mock_update_username.call_args_list]
-        
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        _, kwargs = mock_update_usernames.apply_async.call_args
+        self.assertEqual(kwargs['kwargs'], {'user_pks': expected_pks})
 
-    @patch(MODULE_PATH + '.update_username')
+    @patch(MODULE_PATH + '.update_usernames_from_server')
     @patch(MODULE_PATH + '.update_servername')    
     def test_can_update_all_usernames(
-        self, mock_update_servername, mock_update_username
+        self, mock_update_servername, mock_update_usernames
     ):
-        du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
-        du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
-        du_3 = DiscordUser.objects.create(user=self.user_3, uid=789)
+        DiscordUser.objects.create(user=self.user_1, uid=123)
 
         tasks.update_all_usernames()
         self.assertTrue(mock_update_servername.delay.called)
-        self.assertEqual(mock_update_username.si.call_count, 3)
-        current_pks = [args[0][0] for args in mock_update_username.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        self.assertTrue(mock_update_usernames.apply_async.called)
+
+    @patch(MODULE_PATH + '.delete_user')
+    @patch(MODULE_PATH + '.DiscordUser.objects.update_usernames')
+    def test_update_usernames_from_server_deletes_users_who_left(
+        self, mock_update_usernames, mock_delete_user
+    ):
+        mock_update_usernames.return_value = {self.user_2.pk}
+
+        tasks.update_usernames_from_server()
+        mock_delete_user.delay.assert_called_once_with(
+            self.user_2.pk, notify_user=True
+        )
 
     @patch(MODULE_PATH + '.DISCORD_SYNC_NAMES', True)
-    @patch(MODULE_PATH + '.update_nickname')
-    @patch(MODULE_PATH + '.update_groups')
-    @patch(MODULE_PATH + '.update_username')
+    @patch(MODULE_PATH + '._start_bulk_run')
+    @patch(MODULE_PATH + '.update_usernames_from_server')
     def test_can_update_all_incl_nicknames(
-        self, mock_update_usernames, mock_update_groups, mock_update_nickname
+        self, mock_update_usernames, mock_start_bulk_run
     ):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
         du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
         du_3 = DiscordUser.objects.create(user=self.user_3, uid=789)
 
         tasks.update_all()
-        self.assertEqual(mock_update_groups.si.call_count, 3)        
-        current_pks = [args[0][0] for args in mock_update_groups.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
-
-        self.assertEqual(mock_update_nickname.si.call_count, 3)
-        current_pks = [args[0][0] for args in mock_update_nickname.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
-
-        self.assertEqual(mock_update_usernames.si.call_count, 3)        
-        current_pks = [args[0][0] for args in mock_update_usernames.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        expected_pks = {du_1.pk, du_2.pk, du_3.pk}
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_groups'), expected_pks
+        )
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_nickname'), expected_pks
+        )
+        self.assertTrue(mock_update_usernames.apply_async.called)
 
     @patch(MODULE_PATH + '.DISCORD_SYNC_NAMES', False)
-    @patch(MODULE_PATH + '.update_nickname')
-    @patch(MODULE_PATH + '.update_groups')
-    @patch(MODULE_PATH + '.update_username')
+    @patch(MODULE_PATH + '._start_bulk_run')
+    @patch(MODULE_PATH + '.update_usernames_from_server')
     def test_can_update_all_excl_nicknames(
-        self, mock_update_usernames, mock_update_groups, mock_update_nickname
+        self, mock_update_usernames, mock_start_bulk_run
     ):
         du_1 = DiscordUser.objects.create(user=self.user_1, uid=123)
         du_2 = DiscordUser.objects.create(user=self.user_2, uid=456)
         du_3 = DiscordUser.objects.create(user=self.user_3, uid=789)
 
         tasks.update_all()
-        self.assertEqual(mock_update_groups.si.call_count, 3)        
-        current_pks = [args[0][0] for args in mock_update_groups.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_groups'), 
+            {du_1.pk, du_2.pk, du_3.pk}
+        )
+        self.assertSetEqual(
+            self._bulk_run_pks(mock_start_bulk_run, 'update_nickname'), set()
+        )
+        self.assertTrue(mock_update_usernames.apply_async.called)
 
-        self.assertEqual(mock_update_nickname.si.call_count, 0)
 
-        self.assertEqual(mock_update_usernames.si.call_count, 3)        
-        current_pks = [args[0][0] for args in mock_update_usernames.si.call_args_list]
-        expected_pks = [du_1.pk, du_2.pk, du_3.pk]
-        self.assertSetEqual(set(current_pks), set(expected_pks))
+@patch(MODULE_PATH + '.DISCORD_BULK_CONCURRENCY', 2)
+@patch(MODULE_PATH + '.DISCORD_BULK_CHUNK_SIZE', 2)
+@patch(MODULE_PATH + '.logger')
+class TestBulkRuns(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            AuthUtils.create_user(f'Bruce Wayne {num}') for num in range(5)
+        ]
+        DiscordUser.objects.all().delete()
+        for num, user in enumerate(cls.users):
+            DiscordUser.objects.create(user=user, uid=1000 + num)
+
+    def _items(self, users=None) -> list:
+        return [(user.pk, {}) for user in users or self.users]
+
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_process_all_users_in_chunks(self, mock_update_groups, mock_logger):
+        mock_update_groups.return_value = True
+
+        run_id = tasks._start_bulk_run('update_groups', self._items())
+        updated_pks = {
+            args[0].user_id for args, _ in mock_update_groups.call_args_list
+        }
+        self.assertSetEqual(updated_pks, {user.pk for user in self.users})
+        self.assertDictEqual(
+            tasks.bulk_run_progress(run_id), {'total': 5, 'done': 5, 'failed': 0}
+        )
+
+    @patch(MODULE_PATH + '.process_bulk_run')
+    def test_start_no_more_tasks_than_chunks(
+        self, mock_process_bulk_run, mock_logger
+    ):
+        tasks._start_bulk_run('update_groups', self._items(self.users[:2]))
+        self.assertEqual(mock_process_bulk_run.apply_async.call_count, 1)
+
+        tasks._start_bulk_run('update_groups', self._items())
+        self.assertEqual(mock_process_bulk_run.apply_async.call_count, 3)
+
+    def test_nothing_to_start_without_users(self, mock_logger):
+        self.assertIsNone(tasks._start_bulk_run('update_groups', []))
+
+    @patch(MODULE_PATH + '.DiscordUser.update_nickname', autospec=True)
+    def test_pass_kwargs_to_method(self, mock_update_nickname, mock_logger):
+        mock_update_nickname.return_value = True
+        user = self.users[0]
+
+        tasks._start_bulk_run('update_nickname', [(user.pk, {'nickname': 'Batman'})])
+        _, kwargs = mock_update_nickname.call_args
+        self.assertDictEqual(kwargs, {'nickname': 'Batman'})
+
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_continue_chunk_after_backoff(self, mock_update_groups, mock_logger):
+        calls = list()
+
+        def my_update_groups(discord_user):
+            calls.append(discord_user.user_id)
+            if len(calls) == 2:
+                raise DiscordApiBackoff(1000)
+            return True
+
+        mock_update_groups.side_effect = my_update_groups
+
+        run_id = tasks._start_bulk_run('update_groups', self._items())
+        self.assertSetEqual(set(calls), {user.pk for user in self.users})
+        self.assertEqual(len(calls), 6)
+        self.assertDictEqual(
+            tasks.bulk_run_progress(run_id), {'total': 5, 'done': 5, 'failed': 0}
+        )
+
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_requeue_failed_users_on_backoff(self, mock_update_groups, mock_logger):
+        calls = list()
+
+        def my_update_groups(discord_user):
+            calls.append(discord_user.user_id)
+            if len(calls) == 1:
+                raise HTTPError('Test exception')
+            if len(calls) == 2:
+                raise DiscordApiBackoff(1000)
+            return True
+
+        mock_update_groups.side_effect = my_update_groups
+
+        run_id = tasks._start_bulk_run('update_groups', self._items())
+        self.assertEqual(calls.count(self.users[0].pk), 2)
+        self.assertDictEqual(
+            tasks.bulk_run_progress(run_id), {'total': 5, 'done': 5, 'failed': 0}
+        )
+
+    @patch(MODULE_PATH + '.DISCORD_TASKS_MAX_RETRIES', 2)
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_retry_failed_users_until_max_retries(
+        self, mock_update_groups, mock_logger
+    ):
+        failing_user = self.users[1]
+        calls = list()
+
+        def my_update_groups(discord_user):
+            calls.append(discord_user.user_id)
+            if discord_user.user_id == failing_user.pk:
+                raise HTTPError('Test exception')
+            return True
+
+        mock_update_groups.side_effect = my_update_groups
+
+        run_id = tasks._start_bulk_run('update_groups', self._items())
+        self.assertEqual(calls.count(failing_user.pk), 3)
+        self.assertDictEqual(
+            tasks.bulk_run_progress(run_id), {'total': 5, 'done': 4, 'failed': 1}
+        )
+
+    @patch(MODULE_PATH + '.delete_user')
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_delete_users_no_longer_on_server(
+        self, mock_update_groups, mock_delete_user, mock_logger
+    ):
+        mock_update_groups.return_value = None
+        user = self.users[0]
+
+        tasks._start_bulk_run('update_groups', self._items([user]))
+        mock_delete_user.delay.assert_called_once_with(user.pk, notify_user=True)
+
+    @patch(MODULE_PATH + '.DiscordUser.update_groups', autospec=True)
+    def test_skip_users_without_account(self, mock_update_groups, mock_logger):
+        user = AuthUtils.create_user('Peter Parker')
+
+        run_id = tasks._start_bulk_run('update_groups', self._items([user]))
+        self.assertFalse(mock_update_groups.called)
+        self.assertDictEqual(
+            tasks.bulk_run_progress(run_id), {'total': 1, 'done': 1, 'failed': 0}
+        )
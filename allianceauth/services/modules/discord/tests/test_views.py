@@ -166,3 +166,40 @@ class TestDiscordAddBot(TestCase):
         response = discord_add_bot(request)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, bot_url)
+
+
+class TestDiscordTelemetry(TestCase):
+
+    def test_staff_can_see_telemetry(self):
+        my_user = User.objects.create_superuser('Lex Luthor', 'abc', 'def')
+        AuthUtils.add_main_character_2(my_user, 'Lex Luthor', 1001)
+        self.client.force_login(my_user)
+        response = self.client.get(reverse('discord:telemetry'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Last 5 minutes')
+
+    def test_staff_with_permission_can_see_telemetry(self):
+        my_user = AuthUtils.create_member('Bruce Wayne')
+        my_user.is_staff = True
+        my_user.save()
+        AuthUtils.add_permission_to_user_by_name('discord.view_discorduser', my_user)
+        AuthUtils.add_main_character_2(my_user, 'Bruce Wayne', 1003)
+        self.client.force_login(my_user)
+        response = self.client.get(reverse('discord:telemetry'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_staff_without_permission_can_not_see_telemetry(self):
+        my_user = AuthUtils.create_member('Clark Kent')
+        my_user.is_staff = True
+        my_user.save()
+        AuthUtils.add_main_character_2(my_user, 'Clark Kent', 1004)
+        self.client.force_login(my_user)
+        response = self.client.get(reverse('discord:telemetry'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_normal_users_can_not_see_telemetry(self):
+        my_user = AuthUtils.create_member('Peter Parker')
+        AuthUtils.add_main_character_2(my_user, 'Peter Parker', 1002)
+        self.client.force_login(my_user)
+        response = self.client.get(reverse('discord:telemetry'))
+        self.assertEqual(response.status_code, 302)
@@ -11,6 +11,7 @@ module_urls = [
     url(r'^reset/$', views.reset_discord, name='reset'),
     url(r'^callback/$', views.discord_callback, name='callback'),
     url(r'^add_bot/$', views.discord_add_bot, name='add_bot'),
+    url(r'^telemetry/$', views.discord_telemetry, name='telemetry'),
 ]
 
 urlpatterns = [
@@ -1,15 +1,17 @@
 import logging
 
-from django.contrib import messages
+from django.contrib import admin, messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.decorators import user_passes_test
-from django.shortcuts import redirect
+from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
 from allianceauth.services.views import superuser_test
 
 from . import __title__
+from .discord_client.telemetry import DiscordTelemetry, SUMMARY_WINDOWS
 from .models import DiscordUser
 from .utils import LoggerAddTag
 
@@ -117,3 +119,22 @@ def discord_callback(request):
 @user_passes_test(superuser_test)
 def discord_add_bot(request):
     return redirect(DiscordUser.objects.generate_bot_add_url())
+
+
+def telemetry_test(user):
+    return user.is_superuser or user.has_perm('discord.view_discorduser')
+
+
+@login_required
+@staff_member_required
+@user_passes_test(telemetry_test)
+def discord_telemetry(request):
+    telemetry = DiscordTelemetry.from_default_cache()
+    context = {
+        **admin.site.each_context(request),
+        'title': 'Discord API telemetry',
+        'opts': DiscordUser._meta,
+        'is_enabled': telemetry.is_enabled,
+        'summaries': [telemetry.summary(minutes) for minutes in SUMMARY_WINDOWS],
+    }
+    return render(request, 'admin/discord/telemetry.html', context)
@@ -21,6 +21,7 @@ class MumbleService(ServicesHook):
         self.urlpatterns = urlpatterns
         self.service_url = settings.MUMBLE_URL
         self.access_perm = 'mumble.access_mumble'
+        self.cache_services_ctrl = True
         self.service_ctrl_template = 'services/mumble/mumble_service_ctrl.html'
         self.name_format = '[{corp_ticker}]{character_name}'
 
@@ -15,10 +15,19 @@ class MumbleManager(models.Manager):
     HASH_FN = 'bcrypt-sha256'
 
     @staticmethod
-    def get_display_name(user):
+    def get_display_name(user, format_configs=None):
         from .auth_hooks import MumbleService
-        return NameFormatter(MumbleService(), user).format_name()
+        return NameFormatter(MumbleService(), user, format_configs).format_name()
     
+    @staticmethod
+    def get_groups_string(user, groups=None):
+        if groups is None:
+            groups = user.groups.all()
+        groups_str = [user.profile.state.name]
+        for group in groups:
+            groups_str.append(str(group.name))
+        return ','.join(set([g.replace(' ', '-') for g in groups_str]))
+
     @staticmethod
     def get_username(user):
         return user.profile.main_character.character_name  # main character as the user.username may be incorect
@@ -60,6 +69,44 @@ class MumbleManager(models.Manager):
     def user_exists(self, username):
         return self.filter(username=username).exists()
 
+    def _bulk_queryset(self):
+        return self.exclude(username__exact='').select_related(
+            'user__profile__state', 'user__profile__main_character'
+        )
+
+    def update_all_groups(self) -> int:
+        """Update the groups of all mumble users with changes only
+
+        :return: number of rows updated
+        """
+        changed = []
+        for mumble_user in self._bulk_queryset().prefetch_related('user__groups'):
+            groups = self.get_groups_string(mumble_user.user)
+            if set(groups.split(',')) != set((mumble_user.groups or '').split(',')):
+                mumble_user.groups = groups
+                changed.append(mumble_user)
+        if changed:
+            self.bulk_update(changed, ['groups'], batch_size=500)
+        logger.info("Updated groups of %d mumble users", len(changed))
+        return len(changed)
+
+    def update_all_display_names(self) -> int:
+        """Update the display names of all mumble users with changes only
+
+        :return: number of rows updated
+        """
+        changed = []
+        format_configs = NameFormatter.get_format_configs()
+        for mumble_user in self._bulk_queryset():
+            display_name = self.get_display_name(mumble_user.user, format_configs)
+            if display_name != mumble_user.display_name:
+                mumble_user.display_name = display_name
+                changed.append(mumble_user)
+        if changed:
+            self.bulk_update(changed, ['display_name'], batch_size=500)
+        logger.info("Updated display names of %d mumble users", len(changed))
+        return len(changed)
+
 
 class MumbleUser(AbstractServiceModel):
     username = models.CharField(max_length=254, unique=True)
@@ -133,12 +180,7 @@ class MumbleUser(AbstractServiceModel):
         self.update_password()
 
     def update_groups(self, groups: Group=None):
-        if groups is None:
-            groups = self.user.groups.all()
-        groups_str = [self.user.profile.state.name]
-        for group in groups:
-            groups_str.append(str(group.name))
-        safe_groups = ','.join(set([g.replace(' ', '-') for g in groups_str]))
+        safe_groups = MumbleManager.get_groups_string(self.user, groups)
         logger.info("Updating mumble user {} groups to {}".format(self.user, safe_groups))
         self.groups = safe_groups
         self.save()
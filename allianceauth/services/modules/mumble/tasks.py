@@ -69,13 +69,11 @@ class MumbleTasks:
     @shared_task(name="mumble.update_all_groups")
     def update_all_groups():
         logger.debug("Updating ALL mumble groups")
-        for mumble_user in MumbleUser.objects.exclude(username__exact=''):
-            MumbleTasks.update_groups.delay(mumble_user.user.pk)
+        return MumbleUser.objects.update_all_groups()
 
     @staticmethod
     @shared_task(name="mumble.update_all_display_names")
     def update_all_display_names():
         logger.debug("Updating ALL mumble display names")
-        for mumble_user in MumbleUser.objects.exclude(username__exact=''):
-            MumbleTasks.update_display_name.delay(mumble_user.user.pk)
+        return MumbleUser.objects.update_all_display_names()
 
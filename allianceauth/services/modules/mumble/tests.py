@@ -48,13 +48,13 @@ class MumbleHooksTestCase(TestCase):
         self.assertTrue(service.service_active_for_user(member))
         self.assertFalse(service.service_active_for_user(none_user))
 
-    @mock.patch(MODULE_PATH + '.tasks.User.mumble')
-    def test_update_all_groups(self, mumble):
+    @mock.patch(MODULE_PATH + '.tasks.MumbleUser.objects.update_all_groups')
+    def test_update_all_groups(self, update_all_groups):
         service = self.service()
         service.update_all_groups()
-        # Check member and blue user have groups updated
-        self.assertTrue(mumble.update_groups.called)
-        self.assertEqual(mumble.update_groups.call_count, 1)
+        # Check all users have groups updated in bulk
+        self.assertTrue(update_all_groups.called)
+        self.assertEqual(update_all_groups.call_count, 1)
 
     def test_update_groups(self):
         # Check member has Member group updated
@@ -212,3 +212,52 @@ class MumbleManagerTestCase(TestCase):
 
         self.assertEqual(pwhash[:15], '$bcrypt-sha256$')
         self.assertEqual(len(pwhash), 83)
+
+
+class MumbleBulkUpdateTestCase(TestCase):
+    def setUp(self):
+        self.member = AuthUtils.create_member('member_user')
+        AuthUtils.add_main_character(self.member, 'auth_member', '12345', corp_id='111',
+                                     corp_name='Test Corporation', corp_ticker='TESTR')
+        self.member = User.objects.get(pk=self.member.pk)
+        MumbleUser.objects.create(user=self.member)
+        self.member_2 = AuthUtils.create_member('member_user_2')
+        AuthUtils.add_main_character(self.member_2, 'auth_member_2', '12346', corp_id='111',
+                                     corp_name='Test Corporation', corp_ticker='TESTR')
+        self.member_2 = User.objects.get(pk=self.member_2.pk)
+        MumbleUser.objects.create(user=self.member_2)
+
+    def test_update_all_groups_only_changed(self):
+        group = Group.objects.create(name='Test Group')
+        self.member.groups.add(group)
+
+        result = MumbleUser.objects.update_all_groups()
+
+        self.assertEqual(result, 1)
+        self.member.mumble.refresh_from_db()
+        self.assertSetEqual(
+            set(self.member.mumble.groups.split(',')), {'Guest', 'Member', 'Test-Group'}
+        )
+        self.assertEqual(MumbleUser.objects.update_all_groups(), 0)
+
+    def test_update_all_groups_queries(self):
+        Group.objects.create(name='Test Group').user_set.add(self.member, self.member_2)
+
+        with self.assertNumQueries(3):
+            # fetch users, prefetch groups, one bulk update
+            self.assertEqual(MumbleUser.objects.update_all_groups(), 2)
+
+    def test_update_all_display_names_only_changed(self):
+        MumbleUser.objects.filter(user=self.member).update(display_name='outdated')
+
+        result = MumbleUser.objects.update_all_display_names()
+
+        self.assertEqual(result, 1)
+        self.member.mumble.refresh_from_db()
+        self.assertEqual(self.member.mumble.display_name, '[TESTR]auth_member')
+        self.assertEqual(MumbleUser.objects.update_all_display_names(), 0)
+
+    def test_update_all_display_names_task(self):
+        MumbleUser.objects.filter(user=self.member).update(display_name='outdated')
+
+        self.assertEqual(MumbleTasks.update_all_display_names(), 1)
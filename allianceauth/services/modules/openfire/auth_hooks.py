@@ -19,6 +19,7 @@ class OpenfireService(ServicesHook):
         self.urlpatterns = urlpatterns
         self.service_url = settings.JABBER_URL
         self.access_perm = 'openfire.access_openfire'
+        self.cache_services_ctrl = True
         self.name_format = '{character_name}'
 
     @property
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from allianceauth.services.modules.openfire.manager import OpenfireManager
+from allianceauth.services.modules.openfire.tasks import OpenfireTasks
+
+
+class Command(BaseCommand):
+    help = "Synchronizes the groups of all Openfire users by reconciling against Openfire group memberships."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the changes without applying them',
+        )
+
+    def handle(self, *args, **options):
+        report = OpenfireManager.reconcile_groups(
+            OpenfireTasks.get_all_users_groups(), dry_run=options['dry_run']
+        )
+        self.stdout.write(
+            '{users_changed} of {users} users need changes: '
+            '{groups_added} group memberships to add, {groups_removed} to remove.'.format(**report)
+        )
+        self.stdout.write(
+            'Used {api_calls} API calls for {groups} groups instead of '
+            '{api_calls_per_user} calls when updating each user, '
+            'saving {api_calls_saved} calls.'.format(**report)
+        )
+        if report['groups_failed']:
+            self.stdout.write(self.style.WARNING(
+                'Skipped groups whose members could not be fetched: %s' % ', '.join(report['groups_failed'])
+            ))
+        if report['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run, no changes were applied.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Synchronized Openfire groups.'))
@@ -3,8 +3,10 @@ import random
 import string
 from urllib.parse import urlparse
 
+import requests
 import sleekxmpp
 from django.conf import settings
+from ofrestapi.groups import Groups as ofGroups
 from ofrestapi.users import Users as ofUsers
 from ofrestapi import exception
 
@@ -13,6 +15,46 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class PooledSessionMixin:
+    """
+    Sends REST API requests through one shared requests session
+    so connections to the Openfire server are pooled and reused
+
+    ofrestapi has no public way to pass in a session, so this hooks into
+    Base._submit_request(func, endpoint, **kwargs) of openfire-restapi 0.2,
+    which is pinned in setup.py. Any func this does not know is called unchanged.
+    """
+    _session = None
+
+    # the requests module level functions ofrestapi passes to _submit_request
+    _SESSION_METHODS = {
+        requests.get: 'get',
+        requests.put: 'put',
+        requests.post: 'post',
+        requests.delete: 'delete',
+    }
+
+    @staticmethod
+    def get_session():
+        if PooledSessionMixin._session is None:
+            PooledSessionMixin._session = requests.Session()
+        return PooledSessionMixin._session
+
+    def _submit_request(self, func, endpoint, **kwargs):
+        method = self._SESSION_METHODS.get(func)
+        if method:
+            func = getattr(self.get_session(), method)
+        return super()._submit_request(func, endpoint, **kwargs)
+
+
+class OpenfireUsersApi(PooledSessionMixin, ofUsers):
+    pass
+
+
+class OpenfireGroupsApi(PooledSessionMixin, ofGroups):
+    pass
+
+
 class OpenfireManager:
     def __init__(self):
         pass
@@ -64,7 +106,7 @@ class OpenfireManager:
         try:
             sanitized_username = OpenfireManager.__sanitize_username(username)
             password = OpenfireManager.__generate_random_pass()
-            api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+            api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
             api.add_user(sanitized_username, password)
             logger.info("Added openfire user %s" % username)
         except exception.UserAlreadyExistsException:
@@ -78,7 +120,7 @@ class OpenfireManager:
     def delete_user(username):
         logger.debug("Deleting user %s from openfire." % username)
         try:
-            api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+            api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
             api.delete_user(username)
             logger.info("Deleted user %s from openfire." % username)
             return True
@@ -89,14 +131,14 @@ class OpenfireManager:
     @staticmethod
     def lock_user(username):
         logger.debug("Locking openfire user %s" % username)
-        api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
         api.lock_user(username)
         logger.info("Locked openfire user %s" % username)
 
     @staticmethod
     def unlock_user(username):
         logger.debug("Unlocking openfire user %s" % username)
-        api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
         api.unlock_user(username)
         logger.info("Unlocked openfire user %s" % username)
 
@@ -106,7 +148,7 @@ class OpenfireManager:
         try:
             if not password:
                 password = OpenfireManager.__generate_random_pass()
-            api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+            api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
             api.update_user(username, password=password)
             logger.info("Updated openfire user %s password." % username)
             return password
@@ -118,7 +160,7 @@ class OpenfireManager:
     def update_user_groups(cls, username, groups):
         logger.debug("Updating openfire user %s groups %s" % (username, groups))
         s_groups = list(map(cls._sanitize_groupname, groups))  # Sanitized group names
-        api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
         response = api.get_user_groups(username)
         remote_groups = []
         if response:
@@ -142,10 +184,105 @@ class OpenfireManager:
         if del_groups:
             api.delete_user_groups(username, del_groups)
 
+    @staticmethod
+    def _parse_list(response, *keys):
+        """returns a list from a REST API response, which can be a list, a single item or a dict wrapping either"""
+        for key in keys:
+            if isinstance(response, dict):
+                response = response.get(key)
+        if not response:
+            return []
+        if isinstance(response, (str, dict)):
+            return [response]
+        return list(response)
+
+    @classmethod
+    def get_group_members(cls, api, groupname):
+        """returns the usernames of all members and admins of an openfire group"""
+        group = api.get_group(groupname)
+        members = cls._parse_list(group, 'members') + cls._parse_list(group, 'admins')
+        usernames = set()
+        for member in members:
+            if isinstance(member, dict):
+                member = member.get('member') or member.get('admin') or ''
+            for jid in cls._parse_list(member):
+                usernames.add(str(jid).split('@')[0].lower())
+        return usernames
+
+    @classmethod
+    def reconcile_groups(cls, users_groups, dry_run=False):
+        """
+        Update the groups of many users by reconciling against group memberships
+
+        Fetches the members of each openfire group once instead of fetching
+        the groups of each user, then applies only the changes.
+        Groups whose members can not be fetched are left untouched and reported.
+        :param users_groups: dict of openfire username to list of group names
+        :param dry_run: only compute the changes without applying them
+        :return: dict with a report of the changes and the API calls needed
+        """
+        groups_api = OpenfireGroupsApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        users_api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        usernames = {username.lower(): username for username in users_groups.keys()}
+        remote_groups = {username: set() for username in usernames.keys()}
+        response = groups_api.get_groups()
+        read_calls = 1
+        failed_groups = set()
+        for group in cls._parse_list(response, 'groups') + cls._parse_list(response, 'group'):
+            groupname = group['name'] if isinstance(group, dict) else group
+            read_calls += 1
+            try:
+                members = cls.get_group_members(groups_api, groupname)
+            except Exception:
+                logger.exception("Unable to fetch members of openfire group %s, skipping it" % groupname)
+                failed_groups.add(groupname)
+                continue
+            for member in members & set(remote_groups.keys()):
+                remote_groups[member].add(groupname)
+
+        report = {
+            'users': len(users_groups),
+            'groups': read_calls - 1,
+            'users_changed': 0,
+            'groups_added': 0,
+            'groups_removed': 0,
+            'groups_failed': sorted(failed_groups),
+            'dry_run': dry_run,
+        }
+        skipped_groups = failed_groups | set(map(cls._sanitize_groupname, failed_groups))
+        write_calls = 0
+        for username_lower, username in usernames.items():
+            s_groups = set(map(cls._sanitize_groupname, users_groups[username])) - skipped_groups
+            add_groups = sorted(s_groups - remote_groups[username_lower])
+            del_groups = sorted(remote_groups[username_lower] - s_groups)
+            if not add_groups and not del_groups:
+                continue
+
+            logger.info(
+                "%sUpdating openfire groups for user %s - adding %s, removing %s" % (
+                    "[dry run] " if dry_run else "", username, add_groups, del_groups))
+            report['users_changed'] += 1
+            report['groups_added'] += len(add_groups)
+            report['groups_removed'] += len(del_groups)
+            if add_groups:
+                write_calls += 1
+                if not dry_run:
+                    users_api.add_user_groups(username, add_groups)
+            if del_groups:
+                write_calls += 1
+                if not dry_run:
+                    users_api.delete_user_groups(username, del_groups)
+
+        report['api_calls'] = read_calls + write_calls
+        report['api_calls_per_user'] = len(users_groups) + write_calls
+        report['api_calls_saved'] = report['api_calls_per_user'] - report['api_calls']
+        logger.info("Openfire group reconciliation report: %s" % report)
+        return report
+
     @staticmethod
     def delete_user_groups(username, groups):
         logger.debug("Deleting openfire groups %s from user %s" % (groups, username))
-        api = ofUsers(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
+        api = OpenfireUsersApi(settings.OPENFIRE_ADDRESS, settings.OPENFIRE_SECRET_KEY)
         api.delete_user_groups(username, groups)
         logger.info("Deleted groups %s from openfire user %s" % (groups, username))
 
@@ -45,9 +45,7 @@ class OpenfireTasks:
         user = User.objects.get(pk=pk)
         logger.debug("Updating jabber groups for user %s" % user)
         if OpenfireTasks.has_account(user):
-            groups = [user.profile.state.name]
-            for group in user.groups.all():
-                groups.append(str(group.name))
+            groups = OpenfireTasks.get_groups(user)
             logger.debug("Updating user %s jabber groups to %s" % (user, groups))
             try:
                 OpenfireManager.update_user_groups(user.openfire.username, groups)
@@ -62,8 +60,25 @@ class OpenfireTasks:
     @shared_task(name="openfire.update_all_groups")
     def update_all_groups():
         logger.debug("Updating ALL jabber groups")
-        for openfire_user in OpenfireUser.objects.exclude(username__exact=''):
-            OpenfireTasks.update_groups.delay(openfire_user.user.pk)
+        OpenfireManager.reconcile_groups(OpenfireTasks.get_all_users_groups())
+
+    @staticmethod
+    def get_groups(user):
+        groups = [user.profile.state.name]
+        for group in user.groups.all():
+            groups.append(str(group.name))
+        return groups
+
+    @staticmethod
+    def get_all_users_groups():
+        """returns dict of openfire username to group names for all openfire users"""
+        return {
+            openfire_user.username: OpenfireTasks.get_groups(openfire_user.user)
+            for openfire_user in OpenfireUser.objects
+            .exclude(username__exact='')
+            .select_related('user__profile__state')
+            .prefetch_related('user__groups')
+        }
 
     @staticmethod
     def get_username(user):
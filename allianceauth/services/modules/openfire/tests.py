@@ -49,9 +49,11 @@ class OpenfireHooksTestCase(TestCase):
     def test_update_all_groups(self, manager):
         service = self.service()
         service.update_all_groups()
-        # Check member and blue user have groups updated
-        self.assertTrue(manager.update_user_groups.called)
-        self.assertEqual(manager.update_user_groups.call_count, 1)
+        # Check member and blue user have groups updated in one reconciliation
+        self.assertTrue(manager.reconcile_groups.called)
+        self.assertEqual(manager.reconcile_groups.call_count, 1)
+        args, kwargs = manager.reconcile_groups.call_args
+        self.assertIn(DEFAULT_AUTH_GROUP, args[0][self.member])
 
     def test_update_groups(self):
         # Check member has Member group updated
@@ -211,7 +213,7 @@ class OpenfireManagerTestCase(TestCase):
 
         self.assertEqual(result_groupname, "my_testgroupname")
 
-    @mock.patch(MODULE_PATH + '.manager.ofUsers')
+    @mock.patch(MODULE_PATH + '.manager.OpenfireUsersApi')
     def test_update_user_groups(self, api):
         groups = ["AddGroup", "othergroup", "Guest Group"]
         server_groups = ["othergroup", "Guest Group", "REMOVE group"]
@@ -228,3 +230,88 @@ class OpenfireManagerTestCase(TestCase):
         self.assertTrue(api_instance.delete_user_groups.called)
         args, kwargs = api_instance.delete_user_groups.call_args
         self.assertEqual(args[1], ["removegroup"])
+
+    @mock.patch(MODULE_PATH + '.manager.OpenfireUsersApi')
+    @mock.patch(MODULE_PATH + '.manager.OpenfireGroupsApi')
+    def test_reconcile_groups(self, groups_api, users_api):
+        groups_api_instance = groups_api.return_value
+        groups_api_instance.get_groups.return_value = {
+            'groups': [{'name': 'member'}, {'name': 'Remove Group'}]
+        }
+        groups_api_instance.get_group.side_effect = lambda name: {
+            'member': {'members': ['alpha@example.com', 'bravo@example.com']},
+            'Remove Group': {'members': {'member': 'alpha@example.com'}},
+        }[name]
+        users_api_instance = users_api.return_value
+
+        report = self.manager.reconcile_groups({
+            'alpha': ['Member'],
+            'bravo': ['Member', 'New Group'],
+            'charlie': ['Member'],
+        })
+
+        self.assertEqual(groups_api_instance.get_group.call_count, 2)
+        self.assertFalse(users_api_instance.get_user_groups.called)
+        users_api_instance.delete_user_groups.assert_called_once_with(
+            'alpha', ['Remove Group']
+        )
+        add_calls = [x[0] for x in users_api_instance.add_user_groups.call_args_list]
+        self.assertIn(('bravo', ['newgroup']), add_calls)
+        self.assertIn(('charlie', ['member']), add_calls)
+        self.assertEqual(report['users_changed'], 3)
+        self.assertEqual(report['api_calls'], 6)
+        self.assertEqual(report['api_calls_per_user'], 6)
+
+    @mock.patch(MODULE_PATH + '.manager.OpenfireUsersApi')
+    @mock.patch(MODULE_PATH + '.manager.OpenfireGroupsApi')
+    def test_reconcile_groups_dry_run(self, groups_api, users_api):
+        groups_api_instance = groups_api.return_value
+        groups_api_instance.get_groups.return_value = {'groups': [{'name': 'member'}]}
+        groups_api_instance.get_group.return_value = {'members': []}
+        users_api_instance = users_api.return_value
+
+        report = self.manager.reconcile_groups(
+            {'alpha': ['Member'], 'bravo': ['Member']}, dry_run=True
+        )
+
+        self.assertFalse(users_api_instance.add_user_groups.called)
+        self.assertEqual(report['groups_added'], 2)
+        self.assertTrue(report['dry_run'])
+
+    @mock.patch(MODULE_PATH + '.manager.OpenfireUsersApi')
+    @mock.patch(MODULE_PATH + '.manager.OpenfireGroupsApi')
+    def test_reconcile_groups_skips_failing_groups(self, groups_api, users_api):
+        from ofrestapi.exception import InvalidResponseException
+        groups_api_instance = groups_api.return_value
+        groups_api_instance.get_groups.return_value = {
+            'groups': [{'name': 'member'}, {'name': 'broken'}]
+        }
+
+        def get_group(name):
+            if name == 'broken':
+                raise InvalidResponseException(500)
+            return {'members': ['alpha@example.com']}
+
+        groups_api_instance.get_group.side_effect = get_group
+        users_api_instance = users_api.return_value
+
+        report = self.manager.reconcile_groups({'alpha': ['Member', 'Broken']})
+
+        self.assertFalse(users_api_instance.add_user_groups.called)
+        self.assertFalse(users_api_instance.delete_user_groups.called)
+        self.assertEqual(report['groups_failed'], ['broken'])
+        self.assertEqual(report['users_changed'], 0)
+
+    @mock.patch('requests.Session.request')
+    def test_api_uses_shared_session(self, request):
+        from .manager import OpenfireUsersApi
+        request.return_value.status_code = 200
+        request.return_value.json.return_value = {'groupname': []}
+
+        OpenfireUsersApi('http://example.com', 'secret').get_user_groups('alpha')
+        OpenfireUsersApi('http://example.com', 'secret').get_user_groups('bravo')
+
+        self.assertEqual(request.call_count, 2)
+        self.assertIs(
+            OpenfireUsersApi.get_session(), OpenfireUsersApi.get_session()
+        )
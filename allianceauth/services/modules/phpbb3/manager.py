@@ -29,8 +29,12 @@ class Phpbb3Manager:
 
     SQL_USER_ID_FROM_USERNAME = r"SELECT user_id from %susers WHERE username = %%s" % TABLE_PREFIX
 
+    SQL_USER_IDS_FROM_USERNAMES = r"SELECT user_id, username from %susers WHERE username IN (%%s)" % TABLE_PREFIX
+
     SQL_ADD_USER_GROUP = r"INSERT INTO %suser_group (group_id, user_id, user_pending) VALUES (%%s, %%s, %%s)" % TABLE_PREFIX
 
+    SQL_ADD_USER_GROUPS = r"INSERT INTO %suser_group (group_id, user_id, user_pending) VALUES %%s" % TABLE_PREFIX
+
     SQL_GET_GROUP_ID = r"SELECT group_id from %sgroups WHERE group_name = %%s" % TABLE_PREFIX
 
     SQL_ADD_GROUP = r"INSERT INTO %sgroups (group_name,group_desc,group_legend) VALUES (%%s,%%s,0)" % TABLE_PREFIX
@@ -39,6 +43,8 @@ class Phpbb3Manager:
 
     SQL_REMOVE_USER_GROUP = r"DELETE FROM %suser_group WHERE user_id=%%s AND group_id=%%s " % TABLE_PREFIX
 
+    SQL_REMOVE_USER_GROUPS = r"DELETE FROM %suser_group WHERE user_id=%%%%s AND group_id IN (%%s)" % TABLE_PREFIX
+
     SQL_GET_ALL_GROUPS = r"SELECT group_id, group_name FROM %sgroups" % TABLE_PREFIX
 
     SQL_GET_USER_GROUPS = r"SELECT %(prefix)sgroups.group_name FROM %(prefix)sgroups , %(prefix)suser_group WHERE " \
@@ -47,21 +53,46 @@ class Phpbb3Manager:
     SQL_ADD_USER_AVATAR = r"UPDATE %susers SET user_avatar_type=2, user_avatar_width=64, user_avatar_height=64, " \
                           "user_avatar=%%s WHERE user_id = %%s" % TABLE_PREFIX
 
+    SQL_GET_USERS_GROUPS = r"SELECT %(prefix)suser_group.user_id, %(prefix)sgroups.group_name " \
+                           r"FROM %(prefix)sgroups , %(prefix)suser_group WHERE " \
+                           r"%(prefix)suser_group.group_id = %(prefix)sgroups.group_id " \
+                           r"AND %(prefix)suser_group.user_id IN (%%s)" % {'prefix': TABLE_PREFIX}
+
     SQL_CLEAR_USER_PERMISSIONS = r"UPDATE %susers SET user_permissions = '' WHERE user_id = %%s" % TABLE_PREFIX
 
+    SQL_CLEAR_USERS_PERMISSIONS = r"UPDATE %susers SET user_permissions = '' WHERE user_id IN (%%s)" % TABLE_PREFIX
+
     SQL_DEL_SESSION = r"DELETE FROM %ssessions where session_user_id = %%s" % TABLE_PREFIX
 
     SQL_DEL_AUTOLOGIN = r"DELETE FROM %ssessions_keys where user_id = %%s" % TABLE_PREFIX
 
+    # max number of values in a single IN clause or multi-row INSERT
+    SQL_BATCH_SIZE = 500
+
     def __init__(self):
         pass
 
     @staticmethod
-    def __add_avatar(username, characterid):
+    def __cursor(cursor=None):
+        return cursor if cursor is not None else connections['phpbb3'].cursor()
+
+    @staticmethod
+    def __chunks(values, size):
+        values = list(values)
+        for num in range(0, len(values), size):
+            yield values[num:num + size]
+
+    @staticmethod
+    def __placeholders(count, template='%s'):
+        return ', '.join([template] * count)
+
+    @staticmethod
+    def __add_avatar(username, characterid, cursor=None, userid=None):
         logger.debug("Adding EVE character id %s portrait as phpbb avater for user %s" % (characterid, username))
         avatar_url = EveCharacter.generic_portrait_url(characterid, 64)
-        cursor = connections['phpbb3'].cursor()
-        userid = Phpbb3Manager.__get_user_id(username)
+        cursor = Phpbb3Manager.__cursor(cursor)
+        if userid is None:
+            userid = Phpbb3Manager.__get_user_id(username, cursor)
         cursor.execute(Phpbb3Manager.SQL_ADD_USER_AVATAR, [avatar_url, userid])
 
     @staticmethod
@@ -84,18 +115,18 @@ class Phpbb3Manager:
         return re.sub('[^\w.-]', '', name)
 
     @staticmethod
-    def __get_group_id(groupname):
+    def __get_group_id(groupname, cursor=None):
         logger.debug("Getting phpbb3 group id for groupname %s" % groupname)
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         cursor.execute(Phpbb3Manager.SQL_GET_GROUP_ID, [groupname])
         row = cursor.fetchone()
         logger.debug("Got phpbb group id %s for groupname %s" % (row[0], groupname))
         return row[0]
 
     @staticmethod
-    def __get_user_id(username):
+    def __get_user_id(username, cursor=None):
         logger.debug("Getting phpbb3 user id for username %s" % username)
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         cursor.execute(Phpbb3Manager.SQL_USER_ID_FROM_USERNAME, [username])
         row = cursor.fetchone()
         if row is not None:
@@ -106,9 +137,29 @@ class Phpbb3Manager:
             return None
 
     @staticmethod
-    def __get_all_groups():
+    def __get_user_ids(usernames, cursor=None):
+        logger.debug("Getting phpbb3 user ids for %s usernames" % len(usernames))
+        cursor = Phpbb3Manager.__cursor(cursor)
+        # the database may match usernames case-insensitively, so map rows back to the requested names
+        requested = {username.lower(): username for username in usernames}
+        requested_exact = set(usernames)
+        out = {}
+        for chunk in Phpbb3Manager.__chunks(usernames, Phpbb3Manager.SQL_BATCH_SIZE):
+            cursor.execute(
+                Phpbb3Manager.SQL_USER_IDS_FROM_USERNAMES % Phpbb3Manager.__placeholders(len(chunk)), chunk
+            )
+            for row in cursor.fetchall():
+                username = row[1] if row[1] in requested_exact else requested.get(row[1].lower())
+                if username is None:
+                    logger.warning("Ignoring phpbb user %s not matching any requested username" % row[1])
+                    continue
+                out[username] = row[0]
+        return out
+
+    @staticmethod
+    def __get_all_groups(cursor=None):
         logger.debug("Getting all phpbb3 groups.")
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         cursor.execute(Phpbb3Manager.SQL_GET_ALL_GROUPS)
         rows = cursor.fetchall()
         out = {}
@@ -118,12 +169,16 @@ class Phpbb3Manager:
         return out
 
     @staticmethod
-    def __get_user_groups(userid):
-        logger.debug("Getting phpbb3 user id %s groups" % userid)
-        cursor = connections['phpbb3'].cursor()
-        cursor.execute(Phpbb3Manager.SQL_GET_USER_GROUPS, [userid])
-        out = [row[0] for row in cursor.fetchall()]
-        logger.debug("Got user %s phpbb groups %s" % (userid, out))
+    def __get_users_groups(userids, cursor=None):
+        logger.debug("Getting phpbb3 groups for %s user ids" % len(userids))
+        cursor = Phpbb3Manager.__cursor(cursor)
+        out = {userid: set() for userid in userids}
+        for chunk in Phpbb3Manager.__chunks(userids, Phpbb3Manager.SQL_BATCH_SIZE):
+            cursor.execute(
+                Phpbb3Manager.SQL_GET_USERS_GROUPS % Phpbb3Manager.__placeholders(len(chunk)), chunk
+            )
+            for row in cursor.fetchall():
+                out[row[0]].add(row[1])
         return out
 
     @staticmethod
@@ -133,37 +188,65 @@ class Phpbb3Manager:
         return unixtime
 
     @staticmethod
-    def __create_group(groupname):
+    def __create_group(groupname, cursor=None):
         logger.debug("Creating phpbb3 group %s" % groupname)
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         cursor.execute(Phpbb3Manager.SQL_ADD_GROUP, [groupname, groupname])
         logger.info("Created phpbb group %s" % groupname)
-        return Phpbb3Manager.__get_group_id(groupname)
+        return Phpbb3Manager.__get_group_id(groupname, cursor)
 
     @staticmethod
-    def __add_user_to_group(userid, groupid):
-        logger.debug("Adding phpbb3 user id %s to group id %s" % (userid, groupid))
-        try:
-            cursor = connections['phpbb3'].cursor()
-            cursor.execute(Phpbb3Manager.SQL_ADD_USER_GROUP, [groupid, userid, 0])
-            cursor.execute(Phpbb3Manager.SQL_CLEAR_USER_PERMISSIONS, [userid])
-            logger.info("Added phpbb user id %s to group id %s" % (userid, groupid))
-        except:
-            logger.exception("Unable to add phpbb user id %s to group id %s" % (userid, groupid))
-            pass
+    def __add_users_to_groups(memberships, cursor=None):
+        """adds users to groups with multi-row inserts
+
+        memberships: list of (userid, groupid) tuples
+        """
+        logger.debug("Adding %s phpbb3 group memberships" % len(memberships))
+        cursor = Phpbb3Manager.__cursor(cursor)
+        for chunk in Phpbb3Manager.__chunks(memberships, Phpbb3Manager.SQL_BATCH_SIZE):
+            try:
+                params = []
+                for userid, groupid in chunk:
+                    params += [groupid, userid, 0]
+                cursor.execute(
+                    Phpbb3Manager.SQL_ADD_USER_GROUPS % Phpbb3Manager.__placeholders(len(chunk), '(%s, %s, %s)'),
+                    params
+                )
+                logger.info("Added %s phpbb group memberships" % len(chunk))
+            except Exception:
+                logger.warning("Unable to add phpbb group memberships in bulk, adding them one by one", exc_info=True)
+                Phpbb3Manager.__add_users_to_groups_one_by_one(chunk, cursor)
 
     @staticmethod
-    def __remove_user_from_group(userid, groupid):
-        logger.debug("Removing phpbb3 user id %s from group id %s" % (userid, groupid))
+    def __add_users_to_groups_one_by_one(memberships, cursor):
+        for userid, groupid in memberships:
+            try:
+                cursor.execute(Phpbb3Manager.SQL_ADD_USER_GROUP, [groupid, userid, 0])
+            except Exception:
+                logger.exception("Unable to add phpbb user id %s to group id %s" % (userid, groupid))
+
+    @staticmethod
+    def __remove_user_from_groups(userid, groupids, cursor=None):
+        logger.debug("Removing phpbb3 user id %s from group ids %s" % (userid, groupids))
+        cursor = Phpbb3Manager.__cursor(cursor)
         try:
-            cursor = connections['phpbb3'].cursor()
-            cursor.execute(Phpbb3Manager.SQL_REMOVE_USER_GROUP, [userid, groupid])
-            cursor.execute(Phpbb3Manager.SQL_CLEAR_USER_PERMISSIONS, [userid])
-            logger.info("Removed phpbb user id %s from group id %s" % (userid, groupid))
+            cursor.execute(
+                Phpbb3Manager.SQL_REMOVE_USER_GROUPS % Phpbb3Manager.__placeholders(len(groupids)),
+                [userid] + list(groupids)
+            )
+            logger.info("Removed phpbb user id %s from group ids %s" % (userid, groupids))
         except:
-            logger.exception("Unable to remove phpbb user id %s from group id %s" % (userid, groupid))
+            logger.exception("Unable to remove phpbb user id %s from group ids %s" % (userid, groupids))
             pass
 
+    @staticmethod
+    def __clear_users_permissions(userids, cursor=None):
+        cursor = Phpbb3Manager.__cursor(cursor)
+        for chunk in Phpbb3Manager.__chunks(userids, Phpbb3Manager.SQL_BATCH_SIZE):
+            cursor.execute(
+                Phpbb3Manager.SQL_CLEAR_USERS_PERMISSIONS % Phpbb3Manager.__placeholders(len(chunk)), chunk
+            )
+
     @staticmethod
     def add_user(username, email, groups, characterid):
         logger.debug("Adding phpbb user with username %s, email %s, groups %s, characterid %s" % (
@@ -175,17 +258,17 @@ class Phpbb3Manager:
         pwhash = Phpbb3Manager.__gen_hash(password)
         logger.debug("Proceeding to add phpbb user %s and pwhash starting with %s" % (username_clean, pwhash[0:5]))
         # check if the username was simply revoked
-        if Phpbb3Manager.check_user(username_clean):
+        if Phpbb3Manager.check_user(username_clean, cursor):
             logger.warn("Unable to add phpbb user with username %s - already exists. Updating user instead." % username)
-            Phpbb3Manager.__update_user_info(username_clean, email, pwhash)
+            Phpbb3Manager.__update_user_info(username_clean, email, pwhash, cursor)
         else:
             try:
 
                 cursor.execute(Phpbb3Manager.SQL_ADD_USER, [username_clean, username_clean, pwhash,
                                                             email, 2, Phpbb3Manager.__get_current_utc_date(),
                                                             "", ""])
-                Phpbb3Manager.update_groups(username_clean, groups)
-                Phpbb3Manager.__add_avatar(username_clean, characterid)
+                Phpbb3Manager.update_groups(username_clean, groups, cursor)
+                Phpbb3Manager.__add_avatar(username_clean, characterid, cursor)
                 logger.info("Added phpbb user %s" % username_clean)
             except:
                 logger.exception("Unable to add phpbb user %s" % username_clean)
@@ -203,10 +286,10 @@ class Phpbb3Manager:
         try:
             pwhash = Phpbb3Manager.__gen_hash(password)
             cursor.execute(Phpbb3Manager.SQL_DIS_USER, [revoke_email, pwhash, username])
-            userid = Phpbb3Manager.__get_user_id(username)
+            userid = Phpbb3Manager.__get_user_id(username, cursor)
             cursor.execute(Phpbb3Manager.SQL_DEL_AUTOLOGIN, [userid])
             cursor.execute(Phpbb3Manager.SQL_DEL_SESSION, [userid])
-            Phpbb3Manager.update_groups(username, [])
+            Phpbb3Manager.update_groups(username, [], cursor)
             logger.info("Disabled phpbb user %s" % username)
             return True
         except TypeError:
@@ -218,7 +301,7 @@ class Phpbb3Manager:
         logger.debug("Deleting phpbb user %s" % username)
         cursor = connections['phpbb3'].cursor()
 
-        if Phpbb3Manager.check_user(username):
+        if Phpbb3Manager.check_user(username, cursor):
             cursor.execute(Phpbb3Manager.SQL_DEL_USER, [username])
             logger.info("Deleted phpbb user %s" % username)
             return True
@@ -226,31 +309,71 @@ class Phpbb3Manager:
         return False
 
     @staticmethod
-    def update_groups(username, groups):
-        userid = Phpbb3Manager.__get_user_id(username)
-        logger.debug("Updating phpbb user %s with id %s groups %s" % (username, userid, groups))
-        if userid is not None:
-            forum_groups = Phpbb3Manager.__get_all_groups()
-            user_groups = set(Phpbb3Manager.__get_user_groups(userid))
+    def update_groups(username, groups, cursor=None):
+        Phpbb3Manager.update_groups_bulk({username: groups}, cursor)
+
+    @staticmethod
+    def update_groups_bulk(users_groups, cursor=None):
+        """
+        Updates the groups of many phpbb users at once
+
+        Users are resolved to IDs and their current groups fetched in batches,
+        and all changes are applied with multi-row statements on one cursor.
+        :param users_groups: dict of phpbb username to list of group names
+        :param cursor: database cursor to reuse, optional
+        :return: number of users whose groups were changed
+        """
+        cursor = Phpbb3Manager.__cursor(cursor)
+        userids = Phpbb3Manager.__get_user_ids(list(users_groups.keys()), cursor)
+        for username in users_groups.keys():
+            if username not in userids:
+                logger.error("Username %s not found on phpbb. Unable to determine user id." % username)
+
+        if not userids:
+            return 0
+
+        forum_groups = Phpbb3Manager.__get_all_groups(cursor)
+        current_groups = Phpbb3Manager.__get_users_groups(list(userids.values()), cursor)
+        add_memberships = []
+        remove_memberships = {}
+        for username, userid in userids.items():
+            groups = users_groups[username]
+            logger.debug("Updating phpbb user %s with id %s groups %s" % (username, userid, groups))
+            user_groups = current_groups[userid]
             act_groups = set([Phpbb3Manager._sanitize_groupname(g) for g in groups])
             addgroups = act_groups - user_groups
             remgroups = user_groups - act_groups
+            if not addgroups and not remgroups:
+                continue
+
             logger.info("Updating phpbb user %s groups - adding %s, removing %s" % (username, addgroups, remgroups))
             for g in addgroups:
-                if not g in forum_groups:
-                    forum_groups[g] = Phpbb3Manager.__create_group(g)
-                Phpbb3Manager.__add_user_to_group(userid, forum_groups[g])
+                if g not in forum_groups:
+                    forum_groups[g] = Phpbb3Manager.__create_group(g, cursor)
+                add_memberships.append((userid, forum_groups[g]))
+
+            if remgroups:
+                remove_memberships[userid] = [forum_groups[g] for g in remgroups]
 
-            for g in remgroups:
-                Phpbb3Manager.__remove_user_from_group(userid, forum_groups[g])
+        if add_memberships:
+            Phpbb3Manager.__add_users_to_groups(add_memberships, cursor)
+
+        for userid, groupids in remove_memberships.items():
+            Phpbb3Manager.__remove_user_from_groups(userid, groupids, cursor)
+
+        changed_userids = set([userid for userid, _ in add_memberships]) | set(remove_memberships.keys())
+        if changed_userids:
+            Phpbb3Manager.__clear_users_permissions(changed_userids, cursor)
+
+        return len(changed_userids)
 
     @staticmethod
     def remove_group(username, group):
         logger.debug("Removing phpbb user %s from group %s" % (username, group))
         cursor = connections['phpbb3'].cursor()
-        userid = Phpbb3Manager.__get_user_id(username)
+        userid = Phpbb3Manager.__get_user_id(username, cursor)
         if userid is not None:
-            groupid = Phpbb3Manager.__get_group_id(group)
+            groupid = Phpbb3Manager.__get_group_id(group, cursor)
 
             if userid:
                 if groupid:
@@ -264,9 +387,9 @@ class Phpbb3Manager:
                         pass
 
     @staticmethod
-    def check_user(username):
+    def check_user(username, cursor=None):
         logger.debug("Checking phpbb username %s" % username)
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         cursor.execute(Phpbb3Manager.SQL_USER_ID_FROM_USERNAME, [Phpbb3Manager.__santatize_username(username)])
         row = cursor.fetchone()
         if row:
@@ -281,22 +404,22 @@ class Phpbb3Manager:
         cursor = connections['phpbb3'].cursor()
         if not password:
             password = Phpbb3Manager.__generate_random_pass()
-        if Phpbb3Manager.check_user(username):
+        if Phpbb3Manager.check_user(username, cursor):
             pwhash = Phpbb3Manager.__gen_hash(password)
             logger.debug(
                 "Proceeding to update phpbb user %s password with pwhash starting with %s" % (username, pwhash[0:5]))
             cursor.execute(Phpbb3Manager.SQL_UPDATE_USER_PASSWORD, [pwhash, username])
-            Phpbb3Manager.__add_avatar(username, characterid)
+            Phpbb3Manager.__add_avatar(username, characterid, cursor)
             logger.info("Updated phpbb user %s password." % username)
             return password
         logger.error("Unable to update phpbb user %s password - user not found on phpbb." % username)
         return ""
 
     @staticmethod
-    def __update_user_info(username, email, password):
+    def __update_user_info(username, email, password, cursor=None):
         logger.debug(
             "Updating phpbb user %s info: username %s password of length %s" % (username, email, len(password)))
-        cursor = connections['phpbb3'].cursor()
+        cursor = Phpbb3Manager.__cursor(cursor)
         try:
             cursor.execute(Phpbb3Manager.SQL_DIS_USER, [email, password, username])
             logger.info("Updated phpbb user %s info" % username)
@@ -40,9 +40,7 @@ class Phpbb3Tasks:
         user = User.objects.get(pk=pk)
         logger.debug("Updating phpbb3 groups for user %s" % user)
         if Phpbb3Tasks.has_account(user):
-            groups = [user.profile.state.name]
-            for group in user.groups.all():
-                groups.append(str(group.name))
+            groups = Phpbb3Tasks.get_groups(user)
             logger.debug("Updating user %s phpbb3 groups to %s" % (user, groups))
             try:
                 Phpbb3Manager.update_groups(user.phpbb3.username, groups)
@@ -57,8 +55,22 @@ class Phpbb3Tasks:
     @shared_task(name="phpbb3.update_all_groups")
     def update_all_groups():
         logger.debug("Updating ALL phpbb3 groups")
-        for user in Phpbb3User.objects.exclude(username__exact=''):
-            Phpbb3Tasks.update_groups.delay(user.user_id)
+        users_groups = {
+            phpbb3_user.username: Phpbb3Tasks.get_groups(phpbb3_user.user)
+            for phpbb3_user in Phpbb3User.objects
+            .exclude(username__exact='')
+            .select_related('user__profile__state')
+            .prefetch_related('user__groups')
+        }
+        updated_count = Phpbb3Manager.update_groups_bulk(users_groups)
+        logger.info("Updated phpbb3 groups for %s of %s users" % (updated_count, len(users_groups)))
+
+    @staticmethod
+    def get_groups(user):
+        groups = [user.profile.state.name]
+        for group in user.groups.all():
+            groups.append(str(group.name))
+        return groups
 
     @staticmethod
     def disable():
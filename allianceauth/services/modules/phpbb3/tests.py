@@ -47,11 +47,14 @@ class Phpbb3HooksTestCase(TestCase):
 
     @mock.patch(MODULE_PATH + '.tasks.Phpbb3Manager')
     def test_update_all_groups(self, manager):
+        manager.update_groups_bulk.return_value = 1
         service = self.service()
         service.update_all_groups()
-        # Check member and blue user have groups updated
-        self.assertTrue(manager.update_groups.called)
-        self.assertEqual(manager.update_groups.call_count, 1)
+        # Check member and blue user have groups updated in one batch
+        self.assertTrue(manager.update_groups_bulk.called)
+        self.assertEqual(manager.update_groups_bulk.call_count, 1)
+        args, kwargs = manager.update_groups_bulk.call_args
+        self.assertIn(DEFAULT_AUTH_GROUP, args[0][self.member])
 
     def test_update_groups(self):
         # Check member has Member group updated
@@ -201,3 +204,68 @@ class Phpbb3ManagerTestCase(TestCase):
         pwhash = self.manager._Phpbb3Manager__gen_hash('test')
 
         self.assertIsInstance(pwhash, str)
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk(self, connections):
+        cursor = connections['phpbb3'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'alpha'), (2, 'bravo')],           # user ids
+            [(10, 'Member'), (11, 'Blue')],         # all groups
+            [(1, 'Blue'), (2, 'Member')],           # current user groups
+        ]
+        result = self.manager.update_groups_bulk({
+            'alpha': ['Member'],
+            'bravo': ['Member'],
+            'charlie': ['Member'],
+        })
+        self.assertEqual(result, 1)
+        statements = [x[0][0] for x in cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 6)
+        self.assertIn('IN (%s, %s, %s)', statements[0])
+        self.assertIn('VALUES (%s, %s, %s)', statements[3])
+        self.assertEqual(cursor.execute.call_args_list[3][0][1], [10, 1, 0])
+        self.assertIn('group_id IN (%s)', statements[4])
+        self.assertEqual(cursor.execute.call_args_list[4][0][1], [1, 11])
+        self.assertIn('user_permissions', statements[5])
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk_no_changes(self, connections):
+        cursor = connections['phpbb3'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'alpha')],
+            [(10, 'Member')],
+            [(1, 'Member')],
+        ]
+        result = self.manager.update_groups_bulk({'alpha': ['Member']})
+        self.assertEqual(result, 0)
+        self.assertEqual(cursor.execute.call_count, 3)
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk_maps_usernames_case_insensitive(self, connections):
+        cursor = connections['phpbb3'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'Alpha'), (3, 'unknown')],
+            [(10, 'Member')],
+            [],
+        ]
+        result = self.manager.update_groups_bulk({'alpha': ['Member']})
+        self.assertEqual(result, 1)
+        self.assertEqual(cursor.execute.call_args_list[3][0][1], [10, 1, 0])
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk_adds_memberships_one_by_one_on_error(self, connections):
+        cursor = connections['phpbb3'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'alpha'), (2, 'bravo')],
+            [(10, 'Member')],
+            [],
+        ]
+        cursor.execute.side_effect = [None, None, None, Exception, Exception, None, None]
+        result = self.manager.update_groups_bulk({
+            'alpha': ['Member'],
+            'bravo': ['Member'],
+        })
+        self.assertEqual(result, 2)
+        self.assertEqual(self.manager.SQL_ADD_USER_GROUP, cursor.execute.call_args_list[4][0][0])
+        self.assertEqual(cursor.execute.call_args_list[4][0][1], [10, 1, 0])
+        self.assertEqual(cursor.execute.call_args_list[5][0][1], [10, 2, 0])
@@ -30,6 +30,9 @@ class SmfManager:
 
     SQL_USER_ID_FROM_USERNAME = r"SELECT id_member from %smembers WHERE member_name = %%s" % TABLE_PREFIX
 
+    SQL_USERS_FROM_USERNAMES = r"SELECT id_member, member_name, additional_groups from %smembers " \
+                               r"WHERE member_name IN (%%s)" % TABLE_PREFIX
+
     SQL_ADD_USER_GROUP = r"UPDATE %smembers SET additional_groups = %%s WHERE id_member = %%s" % TABLE_PREFIX
 
     SQL_GET_GROUP_ID = r"SELECT id_group from %smembergroups WHERE group_name = %%s" % TABLE_PREFIX
@@ -46,6 +49,13 @@ class SmfManager:
 
     SQL_ADD_USER_AVATAR = r"UPDATE %smembers SET avatar = %%s WHERE id_member = %%s" % TABLE_PREFIX
 
+    # max number of values in a single IN clause
+    SQL_BATCH_SIZE = 500
+
+    @staticmethod
+    def _cursor(cursor=None):
+        return cursor if cursor is not None else connections['smf'].cursor()
+
     @staticmethod
     def _sanitize_groupname(name):
         name = name.strip(' _')
@@ -72,26 +82,26 @@ class SmfManager:
         return unixtime
 
     @classmethod
-    def create_group(cls, groupname):
+    def create_group(cls, groupname, cursor=None):
         logger.debug("Creating smf group %s" % groupname)
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_ADD_GROUP, [groupname, groupname])
         logger.info("Created smf group %s" % groupname)
-        return cls.get_group_id(groupname)
+        return cls.get_group_id(groupname, cursor)
 
     @classmethod
-    def get_group_id(cls, groupname):
+    def get_group_id(cls, groupname, cursor=None):
         logger.debug("Getting smf group id for groupname %s" % groupname)
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_GET_GROUP_ID, [groupname])
         row = cursor.fetchone()
         logger.debug("Got smf group id %s for groupname %s" % (row[0], groupname))
         return row[0]
 
     @classmethod
-    def check_user(cls, username):
+    def check_user(cls, username, cursor=None):
         logger.debug("Checking smf username %s" % username)
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_USER_ID_FROM_USERNAME, [cls.santatize_username(username)])
         row = cursor.fetchone()
         if row:
@@ -101,17 +111,17 @@ class SmfManager:
         return False
 
     @classmethod
-    def add_avatar(cls, member_name, characterid):
+    def add_avatar(cls, member_name, characterid, cursor=None):
         logger.debug("Adding EVE character id %s portrait as smf avatar for user %s" % (characterid, member_name))        
         avatar_url = EveCharacter.generic_portrait_url(characterid, 64)
-        cursor = connections['smf'].cursor()
-        id_member = cls.get_user_id(member_name)
+        cursor = cls._cursor(cursor)
+        id_member = cls.get_user_id(member_name, cursor)
         cursor.execute(cls.SQL_ADD_USER_AVATAR, [avatar_url, id_member])
 
     @classmethod
-    def get_user_id(cls, username):
+    def get_user_id(cls, username, cursor=None):
         logger.debug("Getting smf user id for username %s" % username)
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_USER_ID_FROM_USERNAME, [username])
         row = cursor.fetchone()
         if row is not None:
@@ -122,9 +132,9 @@ class SmfManager:
             return None
 
     @classmethod
-    def get_all_groups(cls):
+    def get_all_groups(cls, cursor=None):
         logger.debug("Getting all smf groups.")
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_GET_ALL_GROUPS)
         rows = cursor.fetchall()
         out = {}
@@ -134,9 +144,9 @@ class SmfManager:
         return out
 
     @classmethod
-    def get_user_groups(cls, userid):
+    def get_user_groups(cls, userid, cursor=None):
         logger.debug("Getting smf user id %s groups" % userid)
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         cursor.execute(cls.SQL_GET_USER_GROUPS, [userid])
         out = [row[0] for row in cursor.fetchall()]
         logger.debug("Got user %s smf groups %s" % (userid, out))
@@ -153,26 +163,26 @@ class SmfManager:
         logger.debug("Proceeding to add smf user %s and pwhash starting with %s" % (username, pwhash[0:5]))
         register_date = cls.get_current_utc_date()
         # check if the username was simply revoked
-        if cls.check_user(username) is True:
+        if cls.check_user(username, cursor) is True:
             logger.warn("Unable to add smf user with username %s - already exists. Updating user instead." % username)
-            cls.__update_user_info(username_clean, email_address, pwhash)
+            cls.__update_user_info(username_clean, email_address, pwhash, cursor)
         else:
             try:
                 cursor.execute(cls.SQL_ADD_USER,
                                [username_clean, passwd, email_address, register_date, username_clean])
-                cls.add_avatar(username_clean, characterid)
+                cls.add_avatar(username_clean, characterid, cursor)
                 logger.info("Added smf member_name %s" % username_clean)
-                cls.update_groups(username_clean, groups)
+                cls.update_groups(username_clean, groups, cursor)
             except:
                 logger.warn("Unable to add smf user %s" % username_clean)
                 pass
         return username_clean, passwd
 
     @classmethod
-    def __update_user_info(cls, username, email_address, passwd):
+    def __update_user_info(cls, username, email_address, passwd, cursor=None):
         logger.debug(
             "Updating smf user %s info: username %s password of length %s" % (username, email_address, len(passwd)))
-        cursor = connections['smf'].cursor()
+        cursor = cls._cursor(cursor)
         try:
             cursor.execute(cls.SQL_DIS_USER, [email_address, passwd, username])
             logger.info("Updated smf user %s info" % username)
@@ -185,7 +195,7 @@ class SmfManager:
         logger.debug("Deleting smf user %s" % username)
         cursor = connections['smf'].cursor()
 
-        if cls.check_user(username):
+        if cls.check_user(username, cursor):
             cursor.execute(cls.SQL_DEL_USER, [username])
             logger.info("Deleted smf user %s" % username)
             return True
@@ -193,23 +203,73 @@ class SmfManager:
         return False
 
     @classmethod
-    def update_groups(cls, username, groups):
-        userid = cls.get_user_id(username)
-        logger.debug("Updating smf user %s with id %s groups %s" % (username, userid, groups))
-        if userid is not None:
-            forum_groups = cls.get_all_groups()
-            user_groups = set(cls.get_user_groups(userid))
+    def update_groups(cls, username, groups, cursor=None):
+        cls.update_groups_bulk({username: groups}, cursor)
+
+    @classmethod
+    def update_groups_bulk(cls, users_groups, cursor=None):
+        """
+        Updates the groups of many smf users at once
+
+        Users and their current groups are fetched in batches on one cursor
+        and only users whose groups changed are updated.
+        :param users_groups: dict of smf member name to list of group names
+        :param cursor: database cursor to reuse, optional
+        :return: number of users whose groups were changed
+        """
+        cursor = cls._cursor(cursor)
+        usernames = list(users_groups.keys())
+        # the database may match member names case-insensitively, so map rows back to the requested names
+        requested = {username.lower(): username for username in usernames}
+        members = {}
+        for num in range(0, len(usernames), cls.SQL_BATCH_SIZE):
+            chunk = usernames[num:num + cls.SQL_BATCH_SIZE]
+            cursor.execute(cls.SQL_USERS_FROM_USERNAMES % ', '.join(['%s'] * len(chunk)), chunk)
+            for row in cursor.fetchall():
+                username = row[1] if row[1] in users_groups else requested.get(row[1].lower())
+                if username is None:
+                    logger.warning("Ignoring smf member %s not matching any requested username" % row[1])
+                    continue
+                members[username] = (row[0], row[2])
+
+        for username in usernames:
+            if username not in members:
+                logger.error("username %s not found on smf. Unable to determine user id ." % username)
+
+        if not members:
+            return 0
+
+        forum_groups = cls.get_all_groups(cursor)
+        updates = []
+        for username, (userid, additional_groups) in members.items():
+            groups = users_groups[username]
+            logger.debug("Updating smf user %s with id %s groups %s" % (username, userid, groups))
             act_groups = set([cls._sanitize_groupname(g) for g in groups])
-            addgroups = act_groups - user_groups
-            remgroups = user_groups - act_groups
-            logger.info("Updating smf user %s groups - adding %s, removing %s" % (username, addgroups, remgroups))
-            act_group_id = set()
-            for g in addgroups:
+            for g in act_groups:
                 if g not in forum_groups:
-                    forum_groups[g] = cls.create_group(g)
-                act_group_id.add(str(cls.get_group_id(g)))
-            string_groups = ','.join(act_group_id)
-            cls.add_user_to_group(userid, string_groups)
+                    forum_groups[g] = cls.create_group(g, cursor)
+            act_group_id = sorted(set(str(forum_groups[g]) for g in act_groups), key=int)
+            user_group_id = sorted(
+                set(x.strip() for x in (additional_groups or '').split(',') if x.strip().isdigit()), key=int
+            )
+            if act_group_id != user_group_id:
+                logger.info("Updating smf user %s groups from %s to %s" % (username, user_group_id, act_group_id))
+                updates.append([','.join(act_group_id), userid])
+
+        if updates:
+            try:
+                cursor.executemany(cls.SQL_ADD_USER_GROUP, updates)
+                logger.info("Updated groups of %s smf users" % len(updates))
+            except Exception:
+                logger.warning("Unable to update groups of %s smf users in bulk, updating them one by one" % len(
+                    updates), exc_info=True)
+                for update in updates:
+                    try:
+                        cursor.execute(cls.SQL_ADD_USER_GROUP, update)
+                    except Exception:
+                        logger.exception("Unable to update groups of smf user id %s to %s" % (update[1], update[0]))
+
+        return len(updates)
 
     @classmethod
     def add_user_to_group(cls, userid, groupid):
@@ -243,8 +303,7 @@ class SmfManager:
         try:
             pwhash = cls.gen_hash(username, password)
             cursor.execute(cls.SQL_DIS_USER, [revoke_email, pwhash, username])
-            cls.get_user_id(username)
-            cls.update_groups(username, [])
+            cls.update_groups(username, [], cursor)
             logger.info("Disabled smf user %s" % username)
             return True
         except TypeError:
@@ -257,13 +316,13 @@ class SmfManager:
         cursor = connections['smf'].cursor()
         if not password:
             password = cls.generate_random_pass()
-        if cls.check_user(username):
+        if cls.check_user(username, cursor):
             username_clean = cls.santatize_username(username)
             pwhash = cls.gen_hash(username_clean, password)
             logger.debug(
                 "Proceeding to update smf user %s password with pwhash starting with %s" % (username, pwhash[0:5]))
             cursor.execute(cls.SQL_UPDATE_USER_PASSWORD, [pwhash, username])
-            cls.add_avatar(username, characterid)
+            cls.add_avatar(username, characterid, cursor)
             logger.info("Updated smf user %s password." % username)
             return password
         logger.error("Unable to update smf user %s password - user not found on smf." % username)
@@ -44,9 +44,7 @@ class SmfTasks:
         user = User.objects.get(pk=pk)
         logger.debug("Updating smf groups for user %s" % user)
         if SmfTasks.has_account(user):
-            groups = [user.profile.state.name]
-            for group in user.groups.all():
-                groups.append(str(group.name))
+            groups = SmfTasks.get_groups(user)
             logger.debug("Updating user %s smf groups to %s" % (user, groups))
             try:
                 SmfManager.update_groups(user.smf.username, groups)
@@ -61,8 +59,22 @@ class SmfTasks:
     @shared_task(name="smf.update_all_groups")
     def update_all_groups():
         logger.debug("Updating ALL smf groups")
-        for user in SmfUser.objects.exclude(username__exact=''):
-            SmfTasks.update_groups.delay(user.user_id)
+        users_groups = {
+            smf_user.username: SmfTasks.get_groups(smf_user.user)
+            for smf_user in SmfUser.objects
+            .exclude(username__exact='')
+            .select_related('user__profile__state')
+            .prefetch_related('user__groups')
+        }
+        updated_count = SmfManager.update_groups_bulk(users_groups)
+        logger.info("Updated smf groups for %s of %s users" % (updated_count, len(users_groups)))
+
+    @staticmethod
+    def get_groups(user):
+        groups = [user.profile.state.name]
+        for group in user.groups.all():
+            groups.append(str(group.name))
+        return groups
 
     @staticmethod
     def get_username(user):
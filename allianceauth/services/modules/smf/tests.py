@@ -47,11 +47,14 @@ class SmfHooksTestCase(TestCase):
 
     @mock.patch(MODULE_PATH + '.tasks.SmfManager')
     def test_update_all_groups(self, manager):
+        manager.update_groups_bulk.return_value = 1
         service = self.service()
         service.update_all_groups()
-        # Check member and blue user have groups updated
-        self.assertTrue(manager.update_groups.called)
-        self.assertEqual(manager.update_groups.call_count, 1)
+        # Check member and blue user have groups updated in one batch
+        self.assertTrue(manager.update_groups_bulk.called)
+        self.assertEqual(manager.update_groups_bulk.call_count, 1)
+        args, kwargs = manager.update_groups_bulk.call_args
+        self.assertIn(DEFAULT_AUTH_GROUP, args[0][self.member])
 
     def test_update_groups(self):
         # Check member has Member group updated
@@ -201,3 +204,50 @@ class SmfManagerTestCase(TestCase):
         pwhash = self.manager.gen_hash('username', 'test')
 
         self.assertEqual(pwhash, 'b6d21d37de84db76746b1c45696a00f9ce4f86fd')
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk(self, connections):
+        cursor = connections['smf'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'alpha', '11'), (2, 'bravo', '10')],  # members
+            [(10, 'Member'), (11, 'Blue')],            # all groups
+        ]
+        result = self.manager.update_groups_bulk({
+            'alpha': ['Member'],
+            'bravo': ['Member'],
+            'charlie': ['Member'],
+        })
+        self.assertEqual(result, 1)
+        self.assertEqual(cursor.execute.call_count, 2)
+        self.assertIn('IN (%s, %s, %s)', cursor.execute.call_args_list[0][0][0])
+        cursor.executemany.assert_called_once_with(
+            self.manager.SQL_ADD_USER_GROUP, [['10', 1]]
+        )
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk_maps_usernames_case_insensitive(self, connections):
+        cursor = connections['smf'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'Alpha', ''), (3, 'unknown', '')],
+            [(10, 'Member')],
+        ]
+        result = self.manager.update_groups_bulk({'alpha': ['Member']})
+        self.assertEqual(result, 1)
+        cursor.executemany.assert_called_once_with(
+            self.manager.SQL_ADD_USER_GROUP, [['10', 1]]
+        )
+
+    @mock.patch(MODULE_PATH + '.manager.connections')
+    def test_update_groups_bulk_updates_one_by_one_on_error(self, connections):
+        cursor = connections['smf'].cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'alpha', ''), (2, 'bravo', '')],
+            [(10, 'Member')],
+        ]
+        cursor.executemany.side_effect = Exception
+        self.manager.update_groups_bulk({
+            'alpha': ['Member'],
+            'bravo': ['Member'],
+        })
+        cursor.execute.assert_any_call(self.manager.SQL_ADD_USER_GROUP, ['10', 1])
+        cursor.execute.assert_any_call(self.manager.SQL_ADD_USER_GROUP, ['10', 2])
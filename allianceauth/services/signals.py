@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 
 from django.contrib.auth.models import User, Group, Permission
 from django.core.exceptions import ObjectDoesNotExist
@@ -11,8 +12,9 @@ from .hooks import ServicesHook
 from .tasks import disable_user
 
 from allianceauth.authentication.models import State, UserProfile
-from allianceauth.authentication.signals import state_changed
+from allianceauth.authentication.signals import state_changed, run_once
 from allianceauth.eveonline.models import EveCharacter
+from allianceauth.fieldtracking import loaded_values
 
 logger = logging.getLogger(__name__)
 
@@ -144,13 +146,10 @@ def disable_services_on_inactive(sender, instance, *args, **kwargs):
     if not instance.pk:
         # new model being created
         return
-    try:
-        old_instance = User.objects.get(pk=instance.pk)
-        if old_instance.is_active and not instance.is_active:
-            logger.info("Disabling services for inactivation of user %s" % instance)
-            disable_user(instance)
-    except User.DoesNotExist:
-        pass
+    old_values = loaded_values(instance, 'is_active')
+    if old_values and old_values['is_active'] and not instance.is_active:
+        logger.info("Disabling services for inactivation of user %s" % instance)
+        disable_user(instance)
 
 
 @receiver(pre_save, sender=UserProfile)
@@ -158,58 +157,53 @@ def process_main_character_change(sender, instance, *args, **kwargs):
     if not instance.pk:
         # ignore new model being created
         return
-    try:
-        logger.debug(
-            "Received pre_save from %s for process_main_character_change", instance
+    logger.debug(
+        "Received pre_save from %s for process_main_character_change", instance
+    )
+    old_values = loaded_values(instance, 'main_character')
+    if not old_values:
+        return
+    old_main_character_id = old_values['main_character_id']
+    if old_main_character_id and not instance.main_character_id:
+        logger.info(
+            "Disabling services due to loss of main character for user %s",
+            instance.user
+        )
+        disable_user(instance.user)
+    elif old_main_character_id != instance.main_character_id:
+        logger.info(
+            "Updating Names due to change of main character for user %s", 
+            instance.user
+        )
+        run_once(
+            ('sync_service_nicknames', instance.user_id),
+            partial(sync_service_nicknames, instance.user)
         )
-        old_instance = UserProfile.objects.get(pk=instance.pk)
-        if old_instance.main_character and not instance.main_character:
-            logger.info(
-                "Disabling services due to loss of main character for user %s",
-                instance.user
-            )
-            disable_user(instance.user)
-        elif old_instance.main_character != instance.main_character:              
-            logger.info(
-                "Updating Names due to change of main character for user %s", 
-                instance.user
-            )
-            for svc in ServicesHook.get_services():
-                try:
-                    svc.validate_user(instance.user)
-                    svc.sync_nickname(instance.user)
-                except:
-                    logger.exception(
-                        "Exception running sync_nickname for services module %s "
-                        "on user %s", 
-                        svc, 
-                        instance
-                    )
-
-    except UserProfile.DoesNotExist:
-        pass
 
 
 @receiver(pre_save, sender=EveCharacter)
 def process_main_character_update(sender, instance, *args, **kwargs):
+    if not instance.pk or not instance.has_changed('character_name', 'corporation_name', 'alliance_name'):
+        return
     try:        
         if instance.userprofile:
             logger.debug(
                 "Received pre_save from %s for process_main_character_update", 
                 instance
             )
-            old_instance = EveCharacter.objects.get(pk=instance.pk)
-            if not instance.character_name == old_instance.character_name or \
-               not instance.corporation_name == old_instance.corporation_name or \
-               not instance.alliance_name == old_instance.alliance_name:
-                logger.info("syncing service nickname for user {0}".format(instance.userprofile.user))
-
-                for svc in ServicesHook.get_services():
-                    try:
-                        svc.validate_user(instance.userprofile.user)
-                        svc.sync_nickname(instance.userprofile.user)
-                    except:
-                        logger.exception('Exception running sync_nickname for services module %s on user %s' % (svc, instance))
+            user = instance.userprofile.user
+            run_once(('sync_service_nicknames', user.pk), partial(sync_service_nicknames, user))
 
     except ObjectDoesNotExist:  # not a main char ignore
         pass
+
+
+def sync_service_nicknames(user):
+    logger.info("syncing service nickname for user {0}".format(user))
+
+    for svc in ServicesHook.get_services():
+        try:
+            svc.validate_user(user)
+            svc.sync_nickname(user)
+        except:
+            logger.exception('Exception running sync_nickname for services module %s on user %s' % (svc, user))
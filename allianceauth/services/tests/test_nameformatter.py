@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.contrib.auth.models import User
 from allianceauth.tests.auth_utils import AuthUtils
 from allianceauth.eveonline.models import EveAllianceInfo, EveCorporationInfo, EveCharacter
 from ..models import NameFormatConfig
@@ -106,3 +107,63 @@ class NameFormatterTestCase(TestCase):
         result = formatter.format_name()
 
         self.assertEqual('1234 test auth_member', result)
+
+    def test_format_name_with_format_spec(self):
+        config = NameFormatConfig.objects.create(
+            service_name='example',
+            default_to_username=False,
+            format='{corp_ticker!s:>6}|{character_name:.4}',
+        )
+        config.states.add(self.member.profile.state)
+        formatter = NameFormatter(ExampleService(), self.member)
+
+        result = formatter.format_name()
+
+        self.assertEqual('  TIKK|test', result)
+
+    def test_get_format_configs(self):
+        config = NameFormatConfig.objects.create(
+            service_name='example',
+            default_to_username=False,
+            format='{character_name}',
+        )
+        config.states.add(self.member.profile.state)
+
+        result = NameFormatter.get_format_configs()
+
+        self.assertDictEqual(
+            result, {('example', self.member.profile.state.pk): config}
+        )
+
+    def test_formatter_config_from_format_configs(self):
+        config = NameFormatConfig.objects.create(
+            service_name='example',
+            default_to_username=False,
+            format='{character_name}',
+        )
+        config.states.add(self.member.profile.state)
+        format_configs = NameFormatter.get_format_configs()
+        formatter = NameFormatter(ExampleService(), self.member, format_configs)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(config, formatter.formatter_config)
+            self.assertEqual('test character', formatter.format_name())
+
+    def test_format_names(self):
+        config = NameFormatConfig.objects.create(
+            service_name='example',
+            default_to_username=True,
+            format='{character_name} test',
+        )
+        config.states.add(self.member.profile.state)
+        other_user = AuthUtils.create_user('other_user', disconnect_signals=True)
+        users = User.objects.filter(pk__in=[self.member.pk, other_user.pk])
+
+        # configs, config states and users
+        with self.assertNumQueries(3):
+            result = NameFormatter.format_names(ExampleService(), users)
+
+        self.assertDictEqual(result, {
+            self.member.pk: 'test character test',
+            other_user.pk: 'other_user test',
+        })
@@ -5,6 +5,7 @@ from django.test import TestCase
 from django.contrib.auth.models import Group, Permission
 
 from allianceauth.authentication.models import State
+from allianceauth.authentication.signals import batched_signals
 from allianceauth.eveonline.models import EveCharacter
 from allianceauth.tests.auth_utils import AuthUtils
 
@@ -84,6 +85,36 @@ class ServicesSignalsTestCase(TestCase):
         args, kwargs = disable_user.call_args
         self.assertEqual(self.member, args[0])
 
+    @mock.patch('allianceauth.services.signals.ServicesHook')
+    def test_sync_nicknames_on_main_character_name_change(self, services_hook):
+        svc = mock.Mock()
+        services_hook.get_services.return_value = [svc]
+        character = EveCharacter.objects.get(pk=self.member.profile.main_character.pk)
+
+        character.corporation_ticker = 'NEW'
+        character.save()
+        self.assertFalse(svc.sync_nickname.called)
+
+        character.character_name = 'Renamed'
+        character.save()
+        svc.validate_user.assert_called_once_with(self.member)
+        svc.sync_nickname.assert_called_once_with(self.member)
+
+    @mock.patch('allianceauth.authentication.signals.transaction.on_commit', new=lambda func: func())
+    @mock.patch('allianceauth.services.signals.ServicesHook')
+    def test_sync_nicknames_once_per_batch(self, services_hook):
+        svc = mock.Mock()
+        services_hook.get_services.return_value = [svc]
+        character = EveCharacter.objects.get(pk=self.member.profile.main_character.pk)
+
+        with batched_signals():
+            character.character_name = 'Renamed'
+            character.save()
+            character.corporation_name = 'Renamed Corp'
+            character.save()
+            self.assertFalse(svc.sync_nickname.called)
+        svc.sync_nickname.assert_called_once_with(self.member)
+
     @mock.patch('allianceauth.services.signals.transaction')
     @mock.patch('allianceauth.services.signals.ServicesHook')
     def test_m2m_changed_group_permissions(self, services_hook, transaction):
@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+
+from allianceauth.services.hooks import ServicesHook
+from allianceauth.services.modules.openfire.auth_hooks import OpenfireService
+from allianceauth.services.modules.openfire.models import OpenfireUser
+from allianceauth.services.modules.openfire.tasks import OpenfireTasks
+from allianceauth.tests.auth_utils import AuthUtils
+
+from .. import views
+
+MODULE_PATH = 'allianceauth.services.views'
+
+
+class TestServicesView(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = AuthUtils.create_member('auth_member')
+        AuthUtils.add_main_character_2(
+            self.user, 'Test', 1, 2, 'Test Corp', 'TEST'
+        )
+        self.factory = RequestFactory()
+
+    def test_service_account_relations(self):
+        relations = views._service_account_relations(OpenfireService())
+
+        self.assertEqual(
+            [rel.related_model for rel in relations], [OpenfireUser]
+        )
+
+    def test_prefetch_service_accounts(self):
+        OpenfireUser.objects.create(user=self.user, username='auth_member')
+        relations = views._service_account_relations(OpenfireService())
+
+        with self.assertNumQueries(1):
+            views._prefetch_service_accounts(self.user, relations)
+        with self.assertNumQueries(0):
+            self.assertTrue(OpenfireTasks.has_account(self.user))
+
+    def test_prefetch_service_accounts_without_account(self):
+        relations = views._service_account_relations(OpenfireService())
+
+        views._prefetch_service_accounts(self.user, relations)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(OpenfireTasks.has_account(self.user))
+
+    def test_cache_key_changes_with_account(self):
+        svc = OpenfireService()
+        relations = views._service_account_relations(svc)
+        views._prefetch_service_accounts(self.user, relations)
+        key_without_account = views._services_ctrl_cache_key(svc, self.user, relations)
+
+        OpenfireUser.objects.create(user=self.user, username='auth_member')
+        views._prefetch_service_accounts(self.user, relations)
+        key_with_account = views._services_ctrl_cache_key(svc, self.user, relations)
+
+        self.assertNotEqual(key_without_account, key_with_account)
+
+    @mock.patch(MODULE_PATH + '.get_hooks')
+    def test_renders_cached_service_ctrl(self, get_hooks):
+        svc = mock.MagicMock()
+        svc.name = 'dummy'
+        svc.show_service_ctrl.return_value = True
+        svc.cache_services_ctrl = True
+        svc.render_services_ctrl.return_value = '<tr><td>dummy service</td></tr>'
+        get_hooks.return_value = [lambda: svc]
+        self.client.force_login(self.user)
+
+        response_1 = self.client.get(reverse('services:services'))
+        response_2 = self.client.get(reverse('services:services'))
+
+        self.assertContains(response_1, 'dummy service')
+        self.assertContains(response_2, 'dummy service')
+        self.assertEqual(svc.render_services_ctrl.call_count, 1)
+
+    @mock.patch(MODULE_PATH + '.get_hooks')
+    def test_renders_service_ctrl_without_cache_by_default(self, get_hooks):
+        svc = ServicesHook()
+        svc.name = 'dummy'
+        svc.show_service_ctrl = lambda user: True
+        svc.render_services_ctrl = mock.MagicMock(return_value='<tr><td>dummy service</td></tr>')
+        get_hooks.return_value = [lambda: svc]
+        self.client.force_login(self.user)
+
+        self.client.get(reverse('services:services'))
+        response = self.client.get(reverse('services:services'))
+
+        self.assertContains(response, 'dummy service')
+        self.assertEqual(svc.render_services_ctrl.call_count, 2)
+
+    @mock.patch(MODULE_PATH + '.get_hooks')
+    def test_hides_service_ctrl(self, get_hooks):
+        svc = mock.MagicMock()
+        svc.name = 'dummy'
+        svc.show_service_ctrl.return_value = False
+        get_hooks.return_value = [lambda: svc]
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('services:services'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(svc.render_services_ctrl.called)
@@ -1,13 +1,21 @@
+import hashlib
 import logging
+from time import perf_counter
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.shortcuts import render
+from django.utils.translation import get_language
 
 from allianceauth.hooks import get_hooks
 from .forms import FleetFormatterForm
 
 logger = logging.getLogger(__name__)
 
+SERVICES_CTRL_CACHE_TIMEOUT = getattr(settings, 'SERVICES_CTRL_CACHE_TIMEOUT', 300)
+
 
 @login_required
 def fleet_formatter_view(request):
@@ -39,16 +47,93 @@ def fleet_formatter_view(request):
     return render(request, 'services/fleetformattertool.html', context=context)
 
 
+def _service_account_relations(svc):
+    """
+    Reverse one-to-one relations from User to the account models of the app
+    providing the given services hook
+    :param svc: ServicesHook
+    :return: list of OneToOneRel
+    """
+    module = type(svc).__module__
+    return [
+        rel for rel in User._meta.related_objects
+        if rel.one_to_one and module.startswith(rel.related_model._meta.app_config.name + '.')
+    ]
+
+
+def _prefetch_service_accounts(user, relations):
+    """
+    Load all service accounts of a user in a single query and populate
+    the related object caches on the given user instance with them
+    :param user: django.contrib.auth.models.User
+    :param relations: list of OneToOneRel to load
+    """
+    if not relations:
+        return
+    fetched = User.objects.select_related(
+        *[rel.get_accessor_name() for rel in relations]
+    ).get(pk=user.pk)
+    for rel in relations:
+        rel.set_cached_value(user, rel.get_cached_value(fetched))
+
+
+def _services_ctrl_cache_key(svc, user, relations):
+    """
+    Cache key for the rendered control of a service,
+    which changes whenever the users service account changes
+    """
+    account_state = [
+        user.is_superuser,
+        user.profile.state_id,
+        user.profile.main_character_id,
+        get_language(),
+    ]
+    for rel in relations:
+        account = rel.get_cached_value(user, None)
+        if account is not None:
+            account_state.append([
+                (field.attname, getattr(account, field.attname))
+                for field in account._meta.concrete_fields
+            ])
+        else:
+            account_state.append(None)
+    digest = hashlib.md5(repr(account_state).encode('utf-8')).hexdigest()
+    return 'services_ctrl_{}_{}_{}'.format(svc.name, user.pk, digest)
+
+
 @login_required
 def services_view(request):
     logger.debug("services_view called by user %s" % request.user)
-    char = request.user.profile.main_character
     context = {'service_ctrls': []}
+    services = []
     for fn in get_hooks('services_hook'):
-        # Render hooked services controls
         svc = fn()
+        services.append((svc, _service_account_relations(svc)))
+    _prefetch_service_accounts(
+        request.user, [rel for _, relations in services for rel in relations]
+    )
+    for svc, relations in services:
+        # Render hooked services controls
         if svc.show_service_ctrl(request.user):
-            context['service_ctrls'].append(svc.render_services_ctrl(request))
+            start = perf_counter()
+            if getattr(svc, 'cache_services_ctrl', False):
+                cache_key = _services_ctrl_cache_key(svc, request.user, relations)
+                ctrl = cache.get(cache_key)
+                cached = ctrl is not None
+                if not cached:
+                    ctrl = svc.render_services_ctrl(request)
+                    cache.set(cache_key, ctrl, SERVICES_CTRL_CACHE_TIMEOUT)
+            else:
+                ctrl = svc.render_services_ctrl(request)
+                cached = False
+            logger.debug(
+                "Rendered %s service control for user %s in %.1f ms (cached: %s)",
+                svc.name,
+                request.user,
+                (perf_counter() - start) * 1000,
+                cached
+            )
+            context['service_ctrls'].append(ctrl)
 
     return render(request, 'services/services.html', context=context)
 
@@ -2,15 +2,18 @@ import logging
 
 import requests
 
+from django.conf import settings
 from django.contrib.auth.models import User
 
 from allianceauth import NAME
 from allianceauth.eveonline.providers import provider
 
-from .models import SrpUserRequest
+from .models import SrpKillmail, SrpUserRequest
 
 logger = logging.getLogger(__name__)
 
+KILLMAIL_REQUEST_TIMEOUT = getattr(settings, 'SRP_KILLMAIL_REQUEST_TIMEOUT', 10)
+
 
 class SRPManager:
     
@@ -22,12 +25,19 @@ class SRPManager:
 
     @staticmethod
     def get_kill_data(kill_id):
+        try:
+            killmail = SrpKillmail.objects.get(kill_id=kill_id)
+            logger.debug("Using stored killmail for kill ID %s" % kill_id)
+            return killmail.ship_type_id, killmail.ship_value, killmail.victim_id
+        except SrpKillmail.DoesNotExist:
+            pass
+
         url = ("https://zkillboard.com/api/killID/%s/" % kill_id)
         headers = {
             'User-Agent': NAME,
             'Content-Type': 'application/json',
         }
-        r = requests.get(url, headers=headers)
+        r = requests.get(url, headers=headers, timeout=KILLMAIL_REQUEST_TIMEOUT)
         result = r.json()[0]
         if result:
             killmail_id = result['killmail_id']
@@ -36,7 +46,7 @@ class SRPManager:
             km = c.Killmails.get_killmails_killmail_id_killmail_hash(
                 killmail_id=killmail_id,
                 killmail_hash=killmail_hash
-            ).result()
+            ).result(timeout=KILLMAIL_REQUEST_TIMEOUT)
         else:
             raise ValueError("Invalid Kill ID")
         if km:
@@ -49,6 +59,14 @@ class SRPManager:
                 "Total loss value for kill id %s is %s" % (kill_id, ship_value)
             )
             victim_id = km['victim']['character_id']
+            SrpKillmail.objects.get_or_create(
+                kill_id=kill_id,
+                defaults={
+                    'ship_type_id': ship_type,
+                    'ship_value': ship_value,
+                    'victim_id': victim_id,
+                }
+            )
             return ship_type, ship_value, victim_id
         else:
             raise ValueError("Invalid Kill ID or Hash.")
@@ -58,6 +76,6 @@ class SRPManager:
         """returns the number of open SRP requests for given user 
         or None if user has no permission"""
         if user.has_perm("auth.srp_management"):
-            return SrpUserRequest.objects.filter(srp_status="pending").count()
+            return SrpUserRequest.objects.filter(srp_status="Pending").count()
         else:
             return None
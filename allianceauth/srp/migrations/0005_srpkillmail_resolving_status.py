@@ -0,0 +1,27 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srp', '0004_on_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SrpKillmail',
+            fields=[
+                ('kill_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('ship_type_id', models.IntegerField()),
+                ('ship_value', models.FloatField()),
+                ('victim_id', models.IntegerField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='srpuserrequest',
+            name='srp_status',
+            field=models.CharField(choices=[('Resolving', 'Resolving'), ('Pending', 'Pending'), ('Approved', 'Approved'), ('Rejected', 'Rejected')], default='Pending', max_length=9),
+        ),
+    ]
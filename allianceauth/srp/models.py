@@ -1,9 +1,22 @@
 from django.db import models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from allianceauth.eveonline.models import EveCharacter
 
 
+class SrpFleetMainQuerySet(models.QuerySet):
+    def with_totals(self):
+        """Annotate total cost and pending requests of each fleet"""
+        return self.annotate(
+            srp_total_cost=Coalesce(Sum('srpuserrequest__srp_total_amount'), 0),
+            srp_pending_requests=Count(
+                'srpuserrequest', filter=Q(srpuserrequest__srp_status='Pending')
+            ),
+        )
+
+
 class SrpFleetMain(models.Model):
     fleet_name = models.CharField(max_length=254, default="")
     fleet_doctrine = models.CharField(max_length=254, default="")
@@ -13,15 +26,23 @@ class SrpFleetMain(models.Model):
     fleet_commander = models.ForeignKey(EveCharacter, null=True, on_delete=models.SET_NULL)
     fleet_srp_aar_link = models.CharField(max_length=254, default="")
 
+    objects = SrpFleetMainQuerySet.as_manager()
+
     def __str__(self):
         return self.fleet_name
 
     @property
     def total_cost(self):
-        return sum([int(r.srp_total_amount) for r in self.srpuserrequest_set.all()])
+        if hasattr(self, 'srp_total_cost'):
+            return self.srp_total_cost
+        return self.srpuserrequest_set.aggregate(
+            total_cost=Coalesce(Sum('srp_total_amount'), 0)
+        )['total_cost']
 
     @property
     def pending_requests(self):
+        if hasattr(self, 'srp_pending_requests'):
+            return self.srp_pending_requests
         return self.srpuserrequest_set.filter(srp_status='Pending').count()
 
     class Meta:
@@ -30,6 +51,7 @@ class SrpFleetMain(models.Model):
 
 class SrpUserRequest(models.Model):
     SRP_STATUS_CHOICES = (
+        ('Resolving', 'Resolving'),
         ('Pending', 'Pending'),
         ('Approved', 'Approved'),
         ('Rejected', 'Rejected'),
@@ -38,7 +60,7 @@ class SrpUserRequest(models.Model):
     killboard_link = models.CharField(max_length=254, default="")
     after_action_report_link = models.CharField(max_length=254, default="")
     additional_info = models.CharField(max_length=254, default="")
-    srp_status = models.CharField(max_length=8, default="Pending", choices=SRP_STATUS_CHOICES)
+    srp_status = models.CharField(max_length=9, default="Pending", choices=SRP_STATUS_CHOICES)
     srp_total_amount = models.BigIntegerField(default=0)
     character = models.ForeignKey(EveCharacter, null=True, on_delete=models.SET_NULL)
     srp_fleet_main = models.ForeignKey(SrpFleetMain, on_delete=models.CASCADE)
@@ -48,3 +70,14 @@ class SrpUserRequest(models.Model):
 
     def __str__(self):
         return self.character.character_name + ' SRP request for ' + self.srp_ship_name
+
+
+class SrpKillmail(models.Model):
+    """Killmail data resolved from zKillboard and ESI, stored as killmails never change"""
+    kill_id = models.BigIntegerField(primary_key=True)
+    ship_type_id = models.IntegerField()
+    ship_value = models.FloatField()
+    victim_id = models.IntegerField()
+
+    def __str__(self):
+        return str(self.kill_id)
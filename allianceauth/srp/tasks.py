@@ -0,0 +1,100 @@
+import logging
+
+import requests
+from bravado.exception import (
+    BravadoConnectionError, BravadoTimeoutError, HTTPServerError
+)
+from celery import shared_task
+
+from django.contrib.auth.models import User
+
+from allianceauth.eveonline.models import EveType
+from allianceauth.notifications import notify
+
+from .managers import SRPManager
+from .models import SrpUserRequest
+
+logger = logging.getLogger(__name__)
+
+RETRY_COUNTDOWN = 60
+
+
+@shared_task(bind=True, max_retries=5)
+def resolve_srp_request(self, srp_request_id, user_id):
+    """Resolve the killmail of a new SRP request and mark it as pending"""
+    try:
+        srp_request = SrpUserRequest.objects.select_related('srp_fleet_main').get(
+            pk=srp_request_id, srp_status='Resolving'
+        )
+    except SrpUserRequest.DoesNotExist:
+        logger.debug("SRP request id %s is not waiting to be resolved" % srp_request_id)
+        return
+    user = User.objects.get(pk=user_id)
+
+    try:
+        kill_id = SRPManager.get_kill_id(srp_request.killboard_link)
+        (ship_type_id, ship_value, victim_id) = SRPManager.get_kill_data(kill_id)
+    except (
+        requests.RequestException,
+        BravadoConnectionError,
+        BravadoTimeoutError,
+        HTTPServerError
+    ) as ex:
+        if self.request.retries < self.max_retries:
+            logger.info(
+                "Failed to resolve killmail for SRP request id %s, retrying: %s"
+                % (srp_request_id, ex)
+            )
+            raise self.retry(countdown=RETRY_COUNTDOWN * 2 ** self.request.retries)
+        logger.warning("Giving up resolving killmail for SRP request id %s" % srp_request_id)
+        _reject_srp_request(
+            srp_request,
+            user,
+            'Your SRP request killmail %s could not be retrieved from zKillboard. '
+            'Please try again later.' % srp_request.killboard_link
+        )
+        return
+    except (ValueError, IndexError, KeyError):
+        logger.debug("User %s Submitted Invalid Killmail Link %s" % (user, srp_request.killboard_link))
+        _reject_srp_request(
+            srp_request,
+            user,
+            'Your SRP request killmail link %s is invalid. '
+            'Please make sure you are using zKillboard.' % srp_request.killboard_link
+        )
+        return
+    except Exception:
+        # e.g. ESI rejecting the killmail hash, a request must never stay resolving
+        logger.exception("Failed to resolve killmail for SRP request id %s" % srp_request_id)
+        _reject_srp_request(
+            srp_request,
+            user,
+            'Your SRP request killmail %s could not be processed. '
+            'Please check the link and try again later.' % srp_request.killboard_link
+        )
+        return
+
+    if not user.character_ownerships.filter(character__character_id=str(victim_id)).exists():
+        _reject_srp_request(
+            srp_request,
+            user,
+            'Character %s does not belong to your Auth account. '
+            'Please add the API key for this character and try again' % victim_id
+        )
+        return
+
+    try:
+        srp_request.srp_ship_name = EveType.objects.get_type_name(ship_type_id)
+    except Exception:
+        logger.exception("Failed to resolve ship type %s for SRP request id %s" % (ship_type_id, srp_request_id))
+        srp_request.srp_ship_name = 'Unknown'
+    srp_request.kb_total_loss = ship_value
+    srp_request.srp_status = 'Pending'
+    srp_request.save()
+    logger.info("Resolved SRP Request on behalf of user %s for fleet name %s" % (
+        user, srp_request.srp_fleet_main.fleet_name))
+
+
+def _reject_srp_request(srp_request, user, message):
+    srp_request.delete()
+    notify(user, 'SRP Request Failed', level='danger', message=message)
@@ -10,7 +10,7 @@ from django.test import TestCase
 from allianceauth.tests.auth_utils import AuthUtils
 
 from ..managers import SRPManager
-from ..models import SrpUserRequest, SrpFleetMain
+from ..models import SrpKillmail, SrpUserRequest, SrpFleetMain
 
 MODULE_PATH = 'allianceauth.srp.managers'
 
@@ -53,6 +53,25 @@ class TestSrpManager(TestCase):
         self.assertEqual(ship_value, 3177859026.86)
         self.assertEqual(victim_id, 93330670)
     
+    @patch(MODULE_PATH + '.provider')
+    @patch(MODULE_PATH + '.requests.get')
+    def test_kill_data_is_stored(self, mock_get, mock_provider):
+        mock_get.return_value.json.return_value = load_data(
+            'zkillboard_killmail_api_81973979'
+        )
+        mock_provider.client.Killmails.\
+            get_killmails_killmail_id_killmail_hash.return_value.\
+            result.return_value = load_data(
+                'get_killmails_killmail_id_killmail_hash_81973979'
+            )
+
+        SRPManager.get_kill_data(81973979)
+        result = SRPManager.get_kill_data(81973979)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue(SrpKillmail.objects.filter(kill_id=81973979).exists())
+        self.assertEqual(result, (19720, 3177859026.86, 93330670))
+
     @patch(MODULE_PATH + '.requests.get')
     def test_invalid_id_for_zkb_raises_exception(self, mock_get):
         mock_get.return_value.json.return_value = ['']
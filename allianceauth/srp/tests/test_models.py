@@ -0,0 +1,44 @@
+from django.test import TestCase
+from django.utils.timezone import now
+
+from ..models import SrpFleetMain, SrpUserRequest
+
+
+class TestSrpFleetMainTotals(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fleet_1 = SrpFleetMain.objects.create(fleet_name='Fleet 1', fleet_time=now())
+        cls.fleet_2 = SrpFleetMain.objects.create(fleet_name='Fleet 2', fleet_time=now())
+        SrpUserRequest.objects.create(
+            killboard_link='https://zkillboard.com/kill/1/',
+            srp_status='Pending',
+            srp_total_amount=1000,
+            srp_fleet_main=cls.fleet_1,
+        )
+        SrpUserRequest.objects.create(
+            killboard_link='https://zkillboard.com/kill/2/',
+            srp_status='Approved',
+            srp_total_amount=2500,
+            srp_fleet_main=cls.fleet_1,
+        )
+        SrpUserRequest.objects.create(
+            killboard_link='https://zkillboard.com/kill/3/',
+            srp_status='Pending',
+            srp_fleet_main=cls.fleet_1,
+        )
+
+    def test_with_totals(self):
+        with self.assertNumQueries(1):
+            fleets = {
+                fleet.fleet_name: (fleet.total_cost, fleet.pending_requests)
+                for fleet in SrpFleetMain.objects.with_totals()
+            }
+
+        self.assertDictEqual(fleets, {'Fleet 1': (3500, 2), 'Fleet 2': (0, 0)})
+
+    def test_totals_without_annotation(self):
+        self.assertEqual(self.fleet_1.total_cost, 3500)
+        self.assertEqual(self.fleet_1.pending_requests, 2)
+        self.assertEqual(self.fleet_2.total_cost, 0)
+        self.assertEqual(self.fleet_2.pending_requests, 0)
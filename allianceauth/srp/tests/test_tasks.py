@@ -0,0 +1,102 @@
+from unittest.mock import Mock, patch
+
+import requests
+from bravado.exception import HTTPNotFound
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from allianceauth.authentication.models import CharacterOwnership
+from allianceauth.tests.auth_utils import AuthUtils
+
+from ..models import SrpFleetMain, SrpUserRequest
+from ..tasks import resolve_srp_request
+
+MODULE_PATH = 'allianceauth.srp.tasks'
+
+
+@patch(MODULE_PATH + '.notify')
+@patch(MODULE_PATH + '.EveType')
+@patch(MODULE_PATH + '.SRPManager.get_kill_data')
+class TestResolveSrpRequest(TestCase):
+
+    def setUp(self):
+        self.user = AuthUtils.create_member('Bruce Wayne')
+        self.character = AuthUtils.add_main_character_2(
+            self.user, 'Bruce Wayne', 1001, 2001, 'Wayne Technologies', 'WYN'
+        )
+        CharacterOwnership.objects.create(
+            user=self.user, character=self.character, owner_hash='x1'
+        )
+        fleet = SrpFleetMain.objects.create(fleet_time=now())
+        self.srp_request = SrpUserRequest.objects.create(
+            killboard_link='https://zkillboard.com/kill/81973979/',
+            srp_status='Resolving',
+            character=self.character,
+            srp_fleet_main=fleet,
+        )
+
+    def test_resolves_request(self, get_kill_data, eve_type, notify):
+        get_kill_data.return_value = (19720, 3177859026.86, 1001)
+        eve_type.objects.get_type_name.return_value = 'Revelation'
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.srp_request.refresh_from_db()
+        self.assertEqual(self.srp_request.srp_status, 'Pending')
+        self.assertEqual(self.srp_request.srp_ship_name, 'Revelation')
+        self.assertEqual(self.srp_request.kb_total_loss, 3177859026)
+        get_kill_data.assert_called_once_with('81973979')
+        self.assertFalse(notify.called)
+
+    def test_removes_invalid_killmail(self, get_kill_data, eve_type, notify):
+        get_kill_data.side_effect = ValueError()
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.assertFalse(SrpUserRequest.objects.filter(pk=self.srp_request.pk).exists())
+        self.assertTrue(notify.called)
+
+    def test_removes_killmail_of_foreign_character(self, get_kill_data, eve_type, notify):
+        get_kill_data.return_value = (19720, 3177859026.86, 1002)
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.assertFalse(SrpUserRequest.objects.filter(pk=self.srp_request.pk).exists())
+        self.assertTrue(notify.called)
+
+    def test_removes_killmail_rejected_by_esi(self, get_kill_data, eve_type, notify):
+        get_kill_data.side_effect = HTTPNotFound(response=Mock(status_code=404))
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.assertFalse(SrpUserRequest.objects.filter(pk=self.srp_request.pk).exists())
+        self.assertTrue(notify.called)
+
+    def test_resolves_request_with_unknown_ship_type(self, get_kill_data, eve_type, notify):
+        get_kill_data.return_value = (19720, 3177859026.86, 1001)
+        eve_type.objects.get_type_name.side_effect = HTTPNotFound(response=Mock(status_code=404))
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.srp_request.refresh_from_db()
+        self.assertEqual(self.srp_request.srp_status, 'Pending')
+        self.assertEqual(self.srp_request.srp_ship_name, 'Unknown')
+
+    def test_retries_when_zkillboard_is_unavailable(self, get_kill_data, eve_type, notify):
+        get_kill_data.side_effect = requests.Timeout()
+
+        with patch.object(resolve_srp_request, 'retry', side_effect=RuntimeError) as retry:
+            with self.assertRaises(RuntimeError):
+                resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.assertTrue(retry.called)
+        self.srp_request.refresh_from_db()
+        self.assertEqual(self.srp_request.srp_status, 'Resolving')
+
+    def test_ignores_resolved_request(self, get_kill_data, eve_type, notify):
+        SrpUserRequest.objects.filter(pk=self.srp_request.pk).update(srp_status='Pending')
+
+        resolve_srp_request(self.srp_request.pk, self.user.pk)
+
+        self.assertFalse(get_kill_data.called)
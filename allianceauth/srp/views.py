@@ -9,16 +9,15 @@ from django.http import JsonResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Sum
+from django.db import transaction
 from allianceauth.authentication.decorators import permissions_required
-from allianceauth.eveonline.providers import provider
 from allianceauth.notifications import notify
 from .form import SrpFleetMainForm
 from .form import SrpFleetMainUpdateForm
 from .form import SrpFleetUserRequestForm
 from .models import SrpFleetMain
 from .models import SrpUserRequest
-from .managers import SRPManager
+from .tasks import resolve_srp_request
 
 logger = logging.getLogger(__name__)
 
@@ -35,12 +34,12 @@ def random_string(string_length=10):
 @permission_required('srp.access_srp')
 def srp_management(request, all=False):
     logger.debug("srp_management called by user %s" % request.user)
-    fleets = SrpFleetMain.objects.select_related('fleet_commander').prefetch_related('srpuserrequest_set').all()
+    fleets = SrpFleetMain.objects.select_related('fleet_commander').with_totals()
     if not all:
         fleets = fleets.filter(fleet_srp_status="")
     else:
         logger.debug("Returning all SRP requests")
-    totalcost = fleets.aggregate(total_cost=Sum('srpuserrequest__srp_total_amount')).get('total_cost', 0)
+    totalcost = sum(fleet.total_cost for fleet in fleets)
     context = {"srpfleets": fleets, "totalcost": totalcost}
     return render(request, 'srp/management.html', context=context)
 
@@ -52,8 +51,10 @@ def srp_fleet_view(request, fleet_id):
         fleet_main = SrpFleetMain.objects.get(id=fleet_id)
     except SrpFleetMain.DoesNotExist:
         raise Http404
+    srpfleetrequests = fleet_main.srpuserrequest_set.select_related('character')
     context = {"fleet_id": fleet_id, "fleet_status": fleet_main.fleet_srp_status,
-               "srpfleetrequests": fleet_main.srpuserrequest_set.select_related('character'),
+               "srpfleetrequests": srpfleetrequests,
+               "srpfleetrequests_resolving": srpfleetrequests.filter(srp_status='Resolving').exists(),
                "totalcost": fleet_main.total_cost}
 
     return render(request, 'srp/data.html', context=context)
@@ -184,34 +185,17 @@ def srp_request_view(request, fleet_srp):
             srp_request.additional_info = form.cleaned_data['additional_info']
             srp_request.character = character
             srp_request.srp_fleet_main = srp_fleet_main
-
-            try:
-                srp_kill_link = SRPManager.get_kill_id(srp_request.killboard_link)
-                (ship_type_id, ship_value, victim_id) = SRPManager.get_kill_data(srp_kill_link)
-            except ValueError:
-                logger.debug("User %s Submitted Invalid Killmail Link %s or server could not be reached" % (
-                    request.user, srp_request.killboard_link))
-                # THIS SHOULD BE IN FORM VALIDATION
-                messages.error(request,
-                               _(
-                                   "Your SRP request Killmail link is invalid. Please make sure you are using zKillboard."))
-                return redirect("srp:management")
-
-            if request.user.character_ownerships.filter(character__character_id=str(victim_id)).exists():
-                srp_request.srp_ship_name = provider.get_itemtype(ship_type_id).name
-                srp_request.kb_total_loss = ship_value
-                srp_request.post_time = post_time
-                srp_request.save()
-                logger.info("Created SRP Request on behalf of user %s for fleet name %s" % (
-                    request.user, srp_fleet_main.fleet_name))
-                messages.success(request,
-                                 _('Submitted SRP request for your %(ship)s.') % {"ship": srp_request.srp_ship_name})
-                return redirect("srp:management")
-            else:
-                messages.error(request,
-                               _(
-                                   "Character %(charid)s does not belong to your Auth account. Please add the API key for this character and try again")
-                               % {"charid": victim_id})
+            srp_request.srp_status = 'Resolving'
+            srp_request.post_time = post_time
+            srp_request.save()
+            transaction.on_commit(
+                lambda: resolve_srp_request.delay(srp_request.pk, request.user.pk)
+            )
+            logger.info("Created SRP Request on behalf of user %s for fleet name %s" % (
+                request.user, srp_fleet_main.fleet_name))
+            messages.success(request,
+                             _('Submitted SRP request. Your killmail is being verified '
+                               'and you will be notified if there is a problem with it.'))
             return redirect("srp:management")
     else:
         logger.debug("Returning blank SrpFleetUserRequestForm")
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from allianceauth.templatetags.admin_status import update_status_cache
+
+
+@shared_task
+def update_admin_status():
+    """Refresh the data shown by the admin status widget"""
+    update_status_cache()
@@ -2,21 +2,31 @@ import logging
 
 import requests
 import amqp.exceptions
+import kombu.exceptions
 from packaging.version import Version as Pep440Version, InvalidVersion
 from celery.app import app_or_default
 
 from django import template
 from django.conf import settings
 from django.core.cache import cache
+from django.utils import timezone
 
 from allianceauth import __version__
 
 
 register = template.Library()
 
-# cache timers
+# refresh intervals of the values cached by the update_admin_status task
 TAG_CACHE_TIME = 3600  # 1 hours
 NOTIFICATION_CACHE_TIME = 300  # 5 minutes
+# cache keys of the values refreshed by the update_admin_status task
+NOTIFICATIONS_CACHE_KEY = 'admin_status_notifications'
+TAGS_CACHE_KEY = 'admin_status_tags'
+TASK_QUEUES_CACHE_KEY = 'admin_status_task_queues'
+TASK_QUEUE_HISTORY_CACHE_KEY = 'admin_status_task_queue_history'
+REFRESH_QUEUED_CACHE_KEY = 'admin_status_refresh_queued'
+# number of task queue samples kept in the history
+TASK_QUEUE_HISTORY_LENGTH = 24
 # timeout for all requests
 REQUESTS_TIMEOUT = 5    # 5 seconds
 # max pages to be fetched from gitlab
@@ -42,16 +52,124 @@ def status_overview() -> dict:
     }
     response.update(_current_notifications())
     response.update(_current_version_summary())
-    response.update({'task_queue_length': _fetch_celery_queue_length()})
+    response.update(_current_task_queues())
     return response
 
 
-def _fetch_celery_queue_length() -> int:
+def _get_cached_status(key: str, refresh_time: int) -> tuple:
+    """returns the cached data of a status entry and when it was fetched
+
+    Never fetches anything itself. Missing entries and entries older than
+    refresh_time seconds queue a refresh instead, while stale data is still returned.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        _queue_status_refresh()
+        return None, None
+    if (timezone.now() - entry['updated']).total_seconds() >= refresh_time:
+        _queue_status_refresh()
+    return entry['data'], entry['updated']
+
+
+def _set_cached_status(key: str, data) -> None:
+    """stores data of a status entry. Entries never expire, so stale data can still be shown"""
+    cache.set(key, {'data': data, 'updated': timezone.now()}, timeout=None)
+
+
+def _cached_status_age(key: str):
+    """returns the age of a status entry in seconds or None if it does not exist"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    return (timezone.now() - entry['updated']).total_seconds()
+
+
+def _queue_status_refresh() -> None:
+    if cache.add(REFRESH_QUEUED_CACHE_KEY, True, NOTIFICATION_CACHE_TIME):
+        from allianceauth.tasks import update_admin_status
+        try:
+            update_admin_status.delay()
+        except kombu.exceptions.OperationalError:
+            # the stale entries stay in place until the broker is back
+            logger.warning('Failed to queue admin status refresh', exc_info=True)
+
+
+def update_status_cache() -> None:
+    """refreshes all cached status entries which are due
+
+    Failing fetches are logged and leave the previous entry in place.
+    """
+    queues = _fetch_celery_queue_lengths()
+    _set_cached_status(TASK_QUEUES_CACHE_KEY, queues)
+    history = cache.get(TASK_QUEUE_HISTORY_CACHE_KEY, [])
+    history.append({'time': timezone.now(), 'queues': queues})
+    cache.set(
+        TASK_QUEUE_HISTORY_CACHE_KEY,
+        history[-TASK_QUEUE_HISTORY_LENGTH:],
+        timeout=None
+    )
+
+    for key, fetch, refresh_time in (
+        (NOTIFICATIONS_CACHE_KEY, _fetch_notification_issues_from_gitlab, NOTIFICATION_CACHE_TIME),
+        (TAGS_CACHE_KEY, _fetch_tags_from_gitlab, TAG_CACHE_TIME),
+    ):
+        age = _cached_status_age(key)
+        if age is not None and age < refresh_time:
+            continue
+        try:
+            _set_cached_status(key, fetch())
+        except requests.RequestException:
+            logger.warning('Error while refreshing %s', key, exc_info=True)
+
+    cache.delete(REFRESH_QUEUED_CACHE_KEY)
+
+
+def _current_task_queues() -> dict:
+    """returns the cached task queue lengths and their history"""
+    queues, updated = _get_cached_status(TASK_QUEUES_CACHE_KEY, NOTIFICATION_CACHE_TIME)
+    if queues is None:
+        return {}
+
+    if any(length < 0 for length in queues.values()):
+        total = -1
+    else:
+        total = sum(queues.values())
+    history = [
+        {
+            'time': sample['time'],
+            'length': sum(max(length, 0) for length in sample['queues'].values())
+        }
+        for sample in cache.get(TASK_QUEUE_HISTORY_CACHE_KEY, [])
+    ]
+    return {
+        'task_queue_length': total,
+        'task_queues': sorted(queues.items()),
+        'task_queue_history': history,
+        'task_queue_history_max': max([s['length'] for s in history] + [1]),
+        'task_queues_updated': updated,
+    }
+
+
+def _task_queue_names() -> list:
+    default_queue = getattr(settings, 'CELERY_DEFAULT_QUEUE', 'celery')
+    return getattr(settings, 'ADMIN_STATUS_TASK_QUEUES', [default_queue])
+
+
+def _fetch_celery_queue_lengths() -> dict:
+    """returns the number of waiting tasks for every monitored queue"""
+    return {
+        queue: _fetch_celery_queue_length(queue) for queue in _task_queue_names()
+    }
+
+
+def _fetch_celery_queue_length(queue: str = None) -> int:
+    if queue is None:
+        queue = getattr(settings, 'CELERY_DEFAULT_QUEUE', 'celery')
     try:
         app = app_or_default(None)
         with app.connection_or_acquire() as conn:
             return conn.default_channel.queue_declare(
-                queue=getattr(settings, 'CELERY_DEFAULT_QUEUE', 'celery'),
+                queue=queue,
                 passive=True
             ).message_count
     except amqp.exceptions.ChannelError:
@@ -63,24 +181,16 @@ def _fetch_celery_queue_length() -> int:
 
 
 def _current_notifications() -> dict:
-    """returns the newest 5 announcement issues"""
-    try:
-        notifications = cache.get_or_set(
-            'gitlab_notification_issues',
-            _fetch_notification_issues_from_gitlab,
-            NOTIFICATION_CACHE_TIME
-        )
-    except requests.HTTPError:
-        logger.warning('Error while getting gitlab notifications', exc_info=True)
-        top_notifications = []
+    """returns the newest 5 cached announcement issues"""
+    notifications, updated = _get_cached_status(NOTIFICATIONS_CACHE_KEY, NOTIFICATION_CACHE_TIME)
+    if notifications:
+        top_notifications = notifications[:5]
     else:
-        if notifications:
-            top_notifications = notifications[:5]
-        else:
-            top_notifications = []
+        top_notifications = []
 
     response = {
         'notifications': top_notifications,
+        'notifications_updated': updated,
     }
     return response
 
@@ -90,15 +200,8 @@ def _fetch_notification_issues_from_gitlab() -> list:
 
 
 def _current_version_summary() -> dict:
-    """returns the current version info"""
-    try:
-        tags = cache.get_or_set(
-            'git_release_tags', _fetch_tags_from_gitlab, TAG_CACHE_TIME
-        )
-    except requests.HTTPError:
-        logger.warning('Error while getting gitlab release tags', exc_info=True)
-        return {}
-
+    """returns the current version info based on the cached release tags"""
+    tags, updated = _get_cached_status(TAGS_CACHE_KEY, TAG_CACHE_TIME)
     if not tags:
         return {}
 
@@ -130,7 +233,8 @@ def _current_version_summary() -> dict:
         'latest_major_version': str(latest_major_version),
         'latest_minor_version': str(latest_minor_version),
         'latest_patch_version': str(latest_patch_version),
-        'latest_beta_version': str(latest_beta_version)
+        'latest_beta_version': str(latest_beta_version),
+        'version_updated': updated,
     }
     return response
 
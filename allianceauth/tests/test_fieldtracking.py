@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from allianceauth.authentication.models import UserProfile
+from allianceauth.eveonline.models import EveCharacter
+
+from ..fieldtracking import loaded_values
+from .auth_utils import AuthUtils
+
+
+class TestFieldTrackerMixin(TestCase):
+
+    def setUp(self):
+        self.character = EveCharacter.objects.create(
+            character_id=1001,
+            character_name='Bruce Wayne',
+            corporation_id=2001,
+            corporation_name='Wayne Technologies',
+            corporation_ticker='WT',
+        )
+
+    def test_loaded_instance_has_not_changed(self):
+        character = EveCharacter.objects.get(pk=self.character.pk)
+        self.assertFalse(character.has_changed('character_name', 'corporation_id'))
+
+    def test_detects_changes(self):
+        character = EveCharacter.objects.get(pk=self.character.pk)
+        character.corporation_id = 2002
+        self.assertTrue(character.has_changed('character_name', 'corporation_id'))
+        self.assertFalse(character.has_changed('character_name'))
+
+    def test_save_refreshes_snapshot(self):
+        character = EveCharacter.objects.get(pk=self.character.pk)
+        character.corporation_id = 2002
+        character.save()
+        self.assertFalse(character.has_changed('corporation_id'))
+
+    def test_save_with_update_fields_only_refreshes_those(self):
+        character = EveCharacter.objects.get(pk=self.character.pk)
+        character.corporation_id = 2002
+        character.character_name = 'Batman'
+        character.save(update_fields=['character_name'])
+        self.assertFalse(character.has_changed('character_name'))
+        self.assertTrue(character.has_changed('corporation_id'))
+
+    def test_unsaved_instance_has_changed(self):
+        character = EveCharacter(character_id=1002, character_name='Alfred')
+        self.assertTrue(character.has_changed('character_name'))
+
+    def test_deferred_field_has_changed(self):
+        character = EveCharacter.objects.only('pk').get(pk=self.character.pk)
+        self.assertTrue(character.has_changed('character_name'))
+
+
+class TestLoadedValues(TestCase):
+
+    def setUp(self):
+        self.user = AuthUtils.create_user('bruce_wayne')
+
+    def test_registered_model_needs_no_query(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        with self.assertNumQueries(0):
+            self.assertEqual(loaded_values(user, 'is_active'), {'is_active': True})
+
+    def test_registered_model_refreshed_after_save(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(loaded_values(user, 'is_active'), {'is_active': False})
+
+    def test_mixin_model_needs_no_query(self):
+        profile = UserProfile.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(loaded_values(profile, 'main_character'), {'main_character_id': None})
+
+    def test_falls_back_to_database(self):
+        profile = UserProfile.objects.only('pk').get(user=self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(loaded_values(profile, 'main_character'), {'main_character_id': None})
+
+    def test_unsaved_instance(self):
+        self.assertIsNone(loaded_values(User(username='new_user'), 'is_active'))
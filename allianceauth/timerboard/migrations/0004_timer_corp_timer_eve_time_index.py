@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-19 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timerboard', '0003_on_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timer',
+            index=models.Index(fields=['corp_timer', 'eve_time'], name='timerboard__corp_ti_886f28_idx'),
+        ),
+    ]
@@ -1,13 +1,30 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import Q
 
 from allianceauth.eveonline.models import EveCharacter
 from allianceauth.eveonline.models import EveCorporationInfo
 
 
+class TimerQuerySet(models.QuerySet):
+    def before(self, eve_time, timer_id=None):
+        """
+        Timers older than the given cursor, newest first.
+        Ties on eve_time are broken by id so pages never overlap.
+        """
+        if timer_id is None:
+            query = Q(eve_time__lt=eve_time)
+        else:
+            query = Q(eve_time__lt=eve_time) | Q(eve_time=eve_time, id__lt=timer_id)
+        return self.filter(query).order_by('-eve_time', '-id')
+
+
 class Timer(models.Model):
     class Meta:
         ordering = ['eve_time']
+        indexes = [
+            models.Index(fields=['corp_timer', 'eve_time']),
+        ]
 
     details = models.CharField(max_length=254, default="")
     system = models.CharField(max_length=254, default="")
@@ -21,5 +38,7 @@ class Timer(models.Model):
     corp_timer = models.BooleanField(default=False)
     user = models.ForeignKey(User, null=True, on_delete=models.SET_NULL)
 
+    objects = TimerQuerySet.as_manager()
+
     def __str__(self):
         return str(self.system) + ' ' + str(self.details)
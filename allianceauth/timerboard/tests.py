@@ -5,6 +5,7 @@ from django.contrib.auth.models import Permission, User
 from django.conf import settings
 
 from datetime import timedelta
+from unittest import mock
 
 from allianceauth.tests.auth_utils import AuthUtils
 from allianceauth.eveonline.models import EveCorporationInfo
@@ -75,18 +76,32 @@ class TimerboardViewsTestCase(WebTest):
             planet_moon='planet_moon',
             structure='structure',
             objective='objective',
-            eve_time=timezone.now() - timedelta(days=30),
+            eve_time=timezone.now() - timedelta(days=3),
             important=True,
             corp_timer=False,
             eve_character=character,
             eve_corp=character.corporation,
             user=self.user,
         )
+        self.old_timer = Timer.objects.create(
+            details='details',
+            system='system',
+            planet_moon='planet_moon',
+            structure='structure',
+            objective='objective',
+            eve_time=timezone.now() - timedelta(days=30),
+            important=False,
+            corp_timer=False,
+            eve_character=character,
+            eve_corp=character.corporation,
+            user=self.user,
+        )
 
         self.view_permission = Permission.objects.get(codename='timer_view')
         self.edit_permission = Permission.objects.get(codename='timer_management')
 
         self.view_url = reverse('timerboard:view')
+        self.data_url = reverse('timerboard:data')
         self.add_url = reverse('timerboard:add')
         self.edit_url_name = 'timerboard:edit'
         self.delete_url_name = 'timerboard:delete'
@@ -127,6 +142,69 @@ class TimerboardViewsTestCase(WebTest):
         self.assertNotIn(self.corp_timer, past_timers)
         self.assertNotIn(self.other_corp_timer, past_timers)
 
+    def test_timer_view_window(self):
+        self.user.user_permissions.add(self.view_permission)
+        self.app.set_user(self.user)
+
+        response = self.app.get(self.view_url)
+        context = response.context[-1]
+
+        self.assertNotIn(self.old_timer, context['timers'])
+        self.assertNotIn(self.old_timer, context['past_timers'])
+        self.assertTrue(context['older_timers_url'].startswith(self.data_url))
+        self.assertIsNone(context['older_corp_timers_url'])
+
+    def test_timer_data(self):
+        self.user.user_permissions.add(self.view_permission)
+        self.app.set_user(self.user)
+
+        response = self.app.get(self.app.get(self.view_url).context[-1]['older_timers_url'])
+
+        self.assertEqual([t['id'] for t in response.json['timers']], [self.old_timer.id])
+        self.assertIn('countdown{}'.format(self.old_timer.id), response.json['html'])
+        self.assertIsNone(response.json['next'])
+
+    def test_timer_data_pages(self):
+        eve_time = self.old_timer.eve_time
+        same_time_timer = Timer.objects.create(
+            system='system', eve_time=eve_time, eve_corp=self.old_timer.eve_corp
+        )
+        older_timer = Timer.objects.create(
+            system='system', eve_time=eve_time - timedelta(days=1), eve_corp=self.old_timer.eve_corp
+        )
+        self.user.user_permissions.add(self.view_permission)
+        self.app.set_user(self.user)
+
+        url = self.app.get(self.view_url).context[-1]['older_timers_url']
+        pages = []
+        with mock.patch('allianceauth.timerboard.views.PAGE_SIZE', 1):
+            while url:
+                data = self.app.get(url).json
+                pages.append([t['id'] for t in data['timers']])
+                url = data['next']
+
+        self.assertEqual(pages, [[same_time_timer.id], [self.old_timer.id], [older_timer.id]])
+
+    def test_timer_data_corp(self):
+        for timer in (self.corp_timer, self.other_corp_timer):
+            timer.eve_time = timezone.now() - timedelta(days=30)
+            timer.save()
+        self.user.user_permissions.add(self.view_permission)
+        self.app.set_user(self.user)
+
+        url = self.app.get(self.view_url).context[-1]['older_corp_timers_url']
+        response = self.app.get(url)
+
+        self.assertEqual([t['id'] for t in response.json['timers']], [self.corp_timer.id])
+
+    def test_timer_data_invalid_cursor(self):
+        self.user.user_permissions.add(self.view_permission)
+        self.app.set_user(self.user)
+
+        response = self.app.get(self.data_url + '?before=yesterday', expect_errors=True)
+
+        self.assertEqual(response.status_code, 400)
+
     def test_timer_view_permission(self):
         self.client.force_login(self.user)
         response = self.app.get(self.view_url)
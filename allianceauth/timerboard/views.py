@@ -1,14 +1,19 @@
 import datetime
 import logging
+from urllib.parse import urlencode
 
+from django.conf import settings
 from django.contrib import messages
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.shortcuts import render, redirect
 from django.views import View
-from django.urls import reverse_lazy
+from django.template.loader import render_to_string
+from django.urls import reverse, reverse_lazy
 from django.views.generic import CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext_lazy as _
 
 from .form import TimerForm
@@ -16,6 +21,9 @@ from .models import Timer
 
 logger = logging.getLogger(__name__)
 
+PAST_DAYS = getattr(settings, 'TIMERBOARD_PAST_DAYS', 7)
+PAGE_SIZE = getattr(settings, 'TIMERBOARD_PAGE_SIZE', 50)
+
 
 class BaseTimerView(LoginRequiredMixin, PermissionRequiredMixin, View):
     pass
@@ -32,17 +40,71 @@ class TimerView(BaseTimerView):
             corp = char.corporation
         else:
             corp = None
+        now = timezone.now()
+        window_start = now - datetime.timedelta(days=PAST_DAYS)
         base_query = Timer.objects.select_related('eve_character')
         render_items = {
-            'timers': base_query.filter(corp_timer=False),
-            'corp_timers': base_query.filter(corp_timer=True, eve_corp=corp),
-            'future_timers': base_query.filter(corp_timer=False, eve_time__gte=timezone.now()),
-            'past_timers': base_query.filter(corp_timer=False, eve_time__lt=timezone.now()),
+            'timers': base_query.filter(corp_timer=False, eve_time__gte=window_start),
+            'corp_timers': base_query.filter(corp_timer=True, eve_corp=corp, eve_time__gte=window_start),
+            'future_timers': base_query.filter(corp_timer=False, eve_time__gte=now),
+            'past_timers': base_query.filter(corp_timer=False, eve_time__gte=window_start).before(now),
+            'past_days': PAST_DAYS,
+            'older_timers_url': None,
+            'older_corp_timers_url': None,
         }
+        if Timer.objects.filter(corp_timer=False, eve_time__lt=window_start).exists():
+            render_items['older_timers_url'] = get_timer_data_url(window_start)
+        if corp and Timer.objects.filter(corp_timer=True, eve_corp=corp, eve_time__lt=window_start).exists():
+            render_items['older_corp_timers_url'] = get_timer_data_url(window_start, corp=True)
 
         return render(request, self.template_name, context=render_items)
 
 
+def get_timer_data_url(eve_time, timer_id=None, corp=False):
+    params = {'before': eve_time.isoformat()}
+    if timer_id is not None:
+        params['before_id'] = timer_id
+    if corp:
+        params['corp'] = 1
+    return reverse('timerboard:data') + '?' + urlencode(params)
+
+
+class TimerDataView(BaseTimerView):
+    """
+    Pages of timers older than the cursor given in the query string,
+    so the timerboard can lazily load history beyond its window.
+    """
+    permission_required = 'auth.timer_view'
+
+    def get(self, request):
+        before = parse_datetime(request.GET.get('before', ''))
+        before_id = request.GET.get('before_id')
+        corp = request.GET.get('corp') == '1'
+        if before is None or (before_id is not None and not before_id.isdigit()):
+            return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+        if before_id is not None:
+            before_id = int(before_id)
+
+        timers = Timer.objects.select_related('eve_character').filter(corp_timer=corp)
+        if corp:
+            char = request.user.profile.main_character
+            timers = timers.filter(eve_corp=char.corporation if char else None)
+        timers = list(timers.before(before, before_id)[:PAGE_SIZE + 1])
+
+        next_url = None
+        if len(timers) > PAGE_SIZE:
+            timers = timers[:PAGE_SIZE]
+            next_url = get_timer_data_url(timers[-1].eve_time, timers[-1].id, corp=corp)
+
+        # corp timers are listed oldest first, so their older pages get prepended
+        rows = list(reversed(timers)) if corp else timers
+        return JsonResponse({
+            'html': render_to_string('timerboard/timer_rows.html', {'timers': rows}, request=request),
+            'timers': [{'id': timer.id, 'eve_time': timer.eve_time.isoformat()} for timer in timers],
+            'next': next_url,
+        })
+
+
 class TimerManagementView(BaseTimerView):
     permission_required = 'auth.timer_management'
     index_redirect = 'timerboard:view'
@@ -29,7 +29,7 @@ install_requires = [
     'django-redis-cache>=3.0.0',
     'django-celery-beat>=2.0.0,<2.2.1',
 
-    'openfire-restapi',
+    'openfire-restapi>=0.2.0,<0.3.0',  # openfire manager hooks into its request handling
     'sleekxmpp',
     'pydiscourse',
 